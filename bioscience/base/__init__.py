@@ -2,11 +2,28 @@ from .files import (
     load,
     loadNetwork,
     saveResultsIndex,
+    saveResultsIndexStream,
     saveResults,
     saveGenes,
     saveBinaryDatasets
 )
 
+from .parallel import (
+    processLevels,
+    processContext,
+    sortLevels
+)
+
+from .pairs import (
+    pairCount,
+    pairToRows,
+    pairToRowsGpu,
+    rowsToPair,
+    rowPairRange,
+    pairsToRows,
+    pairsToRowsIndex
+)
+
 from .models import (
     NCBIClient,
     Dataset,
@@ -14,6 +31,7 @@ from .models import (
     Validation,
     Bicluster,
     BiclusteringModel,
+    BiclusteringStatsModel,
     CorrelationModel,
     Network,
     NetworkModel,
@@ -51,6 +69,7 @@ __all__ = [
     "Validation",
     "Bicluster",
     "BiclusteringModel",
+    "BiclusteringStatsModel",
     "CorrelationModel",
     "Network",
     "NetworkModel",
@@ -60,9 +79,20 @@ __all__ = [
     "load",
     "loadNetwork",
     "saveResultsIndex",
+    "saveResultsIndexStream",
     "saveResults",
     "saveGenes",
     "saveBinaryDatasets",
+    "processLevels",
+    "processContext",
+    "sortLevels",
+    "pairCount",
+    "pairToRows",
+    "pairToRowsGpu",
+    "rowsToPair",
+    "rowPairRange",
+    "pairsToRows",
+    "pairsToRowsIndex",
     # Constants
     "ARI",
     "CC",
@@ -7,6 +7,7 @@ import ftplib
 from urllib.parse import urlparse
 
 from .models import *
+from .parallel import sortLevels
 
 def load(db, apiKey = None, separator = "\t", skipr = 0, naFilter = False, index_gene = -1, index_lengths = -1, head = None) -> pd.DataFrame:
     """
@@ -345,6 +346,36 @@ def saveResultsIndex(path, models):
     
         print("Results index saved in: " + path)
 
+def saveResultsIndexStream(path, biclusters, level = 1):
+    """
+    Save the results index (rows and columns index of the dataset) of a data mining technique while the biclusters are being generated (for example, by :func:`bioscience.dataMining.biclustering.Biclustering.bibitIter`). Each bicluster is written as soon as it is received, so the memory does not grow with the number of results. The file has the same format as :func:`saveResultsIndex`.
+    
+    :param path: The path where the file will be stored.
+    :type path: str
+        
+    :param biclusters: Iterable with the biclusters to be saved.
+    :type biclusters: Iterable[:class:`bioscience.base.models.Bicluster`]
+    
+    :param level: Number of the index file (`index<level>.csv`), defaults to 1.
+    :type level: int, optional
+    
+    :return: Number of biclusters saved.
+    :rtype: int
+    """
+    total = 0
+    with open(path + "index" + str(level) + ".csv", "w") as fIndex:
+        for oBicluster in biclusters:
+            rows = ','.join(str(int(row)) for row in oBicluster.rows) if oBicluster.rows is not None else ""
+            cols = ','.join(str(int(col)) for col in oBicluster.cols) if oBicluster.cols is not None else ""
+            line = rows + ';' + cols
+            if ',' in line: # Quoted as in saveResultsIndex (CSV field with commas)
+                line = '"' + line + '"'
+            fIndex.write(line + "\n")
+            total += 1
+    
+    print("Results index saved in: " + path)
+    return total
+
 def saveResults(path, models, data):
     """
     Save the results of applying a data mining technique.
@@ -360,16 +391,15 @@ def saveResults(path, models, data):
          
     """
     if models is not None:
-        iLevel = 1
+        # The models of a set of datasets are in level order (see sortLevels)
+        listDatasets = sortLevels(data) if isinstance(data, set) else None
         for i, model in enumerate(models, start=1):
+            oDataset = listDatasets[i - 1] if listDatasets is not None else data
+            geneNames = oDataset.geneNames
+            colNames = oDataset.columnsNames
+            dataset = oDataset.original
             infoModel = ""
             for j, oBicluster in enumerate(model.results, start=1):
-                if isinstance(data, set):
-                    geneNames = list(data)[iLevel-1].geneNames
-                    colNames = list(data)[iLevel-1].columnsNames
-                else:
-                    geneNames = data.geneNames
-                    colNames = data.columnsNames
                 
                 if oBicluster.rows is not None:
                     if geneNames is not None:
@@ -389,10 +419,6 @@ def saveResults(path, models, data):
                 
                 infoBicluster = f"\nRESULT #{j} (ROWS: {rows}) - (COLS: {cols})\n"
                    
-                if isinstance(data, set):
-                    dataset = list(data)[i - 1].original
-                else:
-                    dataset = data.original
                 for oRow in oBicluster.rows:
                     if oBicluster.cols is not None:
                         infoBicluster += ",".join(str(dataset[int(oRow)][int(oCol)]) for oCol in oBicluster.cols)
@@ -403,7 +429,6 @@ def saveResults(path, models, data):
             df = pd.DataFrame([infoModel], columns=['Data'])
             df['Data'] = df['Data'].str.replace('"', '')
             df.to_csv(f"{path}results{i}.csv", index=False, header=False)
-            iLevel += 1
 
         print("Results saved in: " + path)
         
@@ -422,10 +447,12 @@ def saveGenes(path, models, data):
          
     """
     if models is not None:
+        # The models of a set of datasets are in level order (see sortLevels)
+        listDatasets = sortLevels(data) if isinstance(data, set) else None
         iLevel = 1
         for model in models:
-            if isinstance(data, set):
-                geneNames = list(data)[iLevel-1].geneNames
+            if listDatasets is not None:
+                geneNames = listDatasets[iLevel-1].geneNames
             else:
                 geneNames = data.geneNames
             
@@ -458,7 +485,7 @@ def saveBinaryDatasets(path, datasets):
     if datasets is not None:
         if isinstance(datasets, set):
             iLevel = 1
-            for dataset in datasets:
+            for dataset in sortLevels(datasets): # Same numbering as the results of the levels
                 df = pd.DataFrame(dataset.data)
                 df.to_csv(path+"dataset"+str(iLevel)+".csv", index=False, header=False)
                 iLevel += 1
@@ -2,6 +2,8 @@ import numpy as np
 import requests
 from xml.etree import ElementTree
 
+from .pairs import pairCount, pairsToRowsIndex
+
 class Dataset:
     """
     This is a concept class representing a dataset.
@@ -34,7 +36,7 @@ class Dataset:
         Constructor method
         """
         self._original = data
-        self._data = np.copy(self.original)
+        self._data = data.copy() if hasattr(data, "tocsr") else np.copy(self.original) # scipy.sparse matrices are kept sparse
         self._geneNames = geneNames
         self._lengths = lengths
         self._annotations = annotations
@@ -660,15 +662,18 @@ class Bicluster:
     :param cols: Columns of the bicluster.
     :type cols: np.array, optional
     
-    :param data: Bicluster values according to the original dataset.
+    :param data: Bicluster values according to the original dataset. If it is not set, it is computed on demand from `source`.
     :type data: np.array, optional
     
     :param validations: A set of instances from :class:`bioscience.base.models.Validation`.
     :type validations: np.array, optional
     
+    :param source: Original dataset (not copied) from which the bicluster values are gathered on demand.
+    :type source: np.array, optional
+    
     """
     
-    def __init__(self, rows, cols = None, data=None, validations=None):
+    def __init__(self, rows, cols = None, data=None, validations=None, source=None):
         """
         Constructor method
         """
@@ -676,6 +681,7 @@ class Bicluster:
         self._cols = cols
         self._data = data        
         self._validations = validations
+        self._source = source
     
     @property
     def rows(self):
@@ -702,13 +708,29 @@ class Bicluster:
     @property
     def data(self):
         """
-        Getter and setter methods of the data property.
+        Getter and setter methods of the data property. If no values have been stored, they are gathered from `source` with a single `np.ix_` indexing (not cached). A `scipy.sparse` source is indexed in sparse form and only the values of the bicluster are expanded.
         """
+        if self._data is None and self._source is not None and self.cols is not None:
+            rows, cols = np.asarray(self.rows, dtype=np.int64), np.asarray(self.cols, dtype=np.int64)
+            if hasattr(self._source, "tocsr"):
+                return self._source.tocsr()[rows][:, cols].toarray()
+            return np.asarray(self._source)[np.ix_(rows, cols)]
         return self._data
     
     @data.setter
     def data(self, data):
         self._data = data
+    
+    @property
+    def source(self):
+        """
+        Getter and setter methods of the source property.
+        """
+        return self._source
+    
+    @source.setter
+    def source(self, source):
+        self._source = source
         
     @property
     def validations(self):
@@ -783,9 +805,122 @@ class BiclusteringModel:
     def results(self, results):
         self._results = results
     
+    def materialize(self, biclusters = None):
+        """
+        Store the values of many biclusters at once with a single vectorized gather over their source dataset. A `scipy.sparse` source is gathered in CSR form and only the values of the biclusters are expanded.
+        
+        :param biclusters: Biclusters to materialize, defaults to None (all biclusters of the model).
+        :type biclusters: list(:class:`bioscience.base.models.Bicluster`), optional
+        """
+        if biclusters is None:
+            biclusters = self.results
+        
+        # Group the biclusters by source (usually only one)
+        dSources = {}
+        for oBicluster in biclusters:
+            if oBicluster.source is not None and oBicluster.cols is not None:
+                dSources.setdefault(id(oBicluster.source), []).append(oBicluster)
+        
+        for aBiclusters in dSources.values():
+            source = aBiclusters[0].source
+            bSparse = hasattr(source, "tocsr")
+            source = source.tocsr() if bSparse else np.asarray(source)
+            sizes = np.array([len(oBic.rows) * len(oBic.cols) for oBic in aBiclusters], dtype=np.int64)
+            if sizes.sum() == 0:
+                flatIndex = np.zeros(0, dtype=np.int64)
+            else:
+                flatIndex = np.concatenate([(np.asarray(oBic.rows, dtype=np.int64)[:, None] * source.shape[1] + np.asarray(oBic.cols, dtype=np.int64)).ravel() for oBic in aBiclusters])
+            if bSparse:
+                values = np.asarray(source[flatIndex // source.shape[1], flatIndex % source.shape[1]]).ravel() if len(flatIndex) > 0 else np.zeros(0, dtype=source.dtype)
+            else:
+                values = np.take(source, flatIndex)
+            for oBicluster, start, size in zip(aBiclusters, np.cumsum(sizes) - sizes, sizes):
+                oBicluster.data = values[start:start + size].reshape(len(oBicluster.rows), len(oBicluster.cols))
+    
     def __str__(self):
         return '\n'.join(str(bic) for bic in self.results)
 
+class BiclusteringStatsModel:
+    
+    """
+    This is a conceptual class representing the statistics of the biclusters generated by a Biclustering technique (without the biclusters themselves).
+    
+    :param histogram: Joint histogram of the bicluster sizes: number of biclusters for each pair (rows, columns).
+    :type histogram: dict, optional
+    
+    :param executionTime: Time taken to execute the Biclustering method.
+    :type executionTime: float, optional
+    
+    """
+    
+    def __init__(self, histogram = None):
+        """
+        Constructor method
+        """
+        if histogram is not None:
+            self._histogram = dict(histogram)
+        else:
+            self._histogram = {}
+        
+        self._executionTime = 0
+    
+    @property
+    def executionTime(self):
+        """
+        Getter and setter methods of the executionTime property.
+        """
+        return self._executionTime
+    
+    @executionTime.setter
+    def executionTime(self, executionTime):
+        self._executionTime = executionTime
+    
+    @property
+    def histogram(self):
+        """
+        Getter method of the histogram property: a dictionary {(rows, columns): number of biclusters}.
+        """
+        return self._histogram
+    
+    @property
+    def totalBiclusters(self):
+        """
+        Number of biclusters.
+        """
+        return sum(self._histogram.values())
+    
+    def add(self, rows, cols):
+        """
+        Add a block of biclusters to the histogram.
+        
+        :param rows: Number of rows of each bicluster.
+        :type rows: np.array
+        
+        :param cols: Number of columns of each bicluster.
+        :type cols: np.array
+        """
+        if len(rows) > 0:
+            sizes, counts = np.unique(np.column_stack((rows, cols)).astype(np.int64), axis=0, return_counts=True)
+            for (iRows, iCols), count in zip(sizes.tolist(), counts.tolist()):
+                self._histogram[(iRows, iCols)] = self._histogram.get((iRows, iCols), 0) + count
+    
+    def toArray(self):
+        """
+        Joint histogram as a dense matrix, where the position [rows, columns] stores the number of biclusters of that size.
+        
+        :return: Histogram with shape (max rows + 1, max columns + 1).
+        :rtype: np.array
+        """
+        if len(self._histogram) == 0:
+            return np.zeros((0, 0), dtype=np.int64)
+        sizes = np.array(list(self._histogram.keys()), dtype=np.int64)
+        aHistogram = np.zeros((sizes[:, 0].max() + 1, sizes[:, 1].max() + 1), dtype=np.int64)
+        aHistogram[sizes[:, 0], sizes[:, 1]] = list(self._histogram.values())
+        return aHistogram
+    
+    def __str__(self):
+        return '\n'.join('Biclusters (rows={0}, cols={1}): {2}'.format(iRows, iCols, count) for (iRows, iCols), count in sorted(self._histogram.items()))
+
 class CorrelationModel:
     
     """
@@ -804,36 +939,9 @@ class CorrelationModel:
         self._results = results        
         self._executionTime = executionTime
         
-        maxPairs = 0        
-        for i in range(rows):
-            for j in range(i + 1, rows):
-                maxPairs += 1
-        
-        self._geneInteractionsIndex = np.zeros((maxPairs,2))
-                
-        pattern = 0
-        while pattern < maxPairs:
-            
-            r1 = 0
-            r2 = -1
-            auxPat = pattern - rows + 1
-            
-            if auxPat < 0:
-                r2 = auxPat + rows
-
-            j = rows - 2
-            while r2 == -1:
-                auxPat -= j
-                r1 += 1
-                if auxPat < 0:
-                    r2 = (j + auxPat) + (r1 + 1)
-                j -= 1
-            
-            if(r1 < rows and r2 < rows):
-                self._geneInteractionsIndex[pattern][0] = r1
-                self._geneInteractionsIndex[pattern][1] = r2
-            
-            pattern += 1
+        # Rows of every pair of genes (pair index order of bioscience.base.pairs), written in place
+        self._geneInteractionsIndex = np.zeros((pairCount(rows), 2))
+        pairsToRowsIndex(0, rows, self._geneInteractionsIndex)
     
     @property
     def name(self):
@@ -0,0 +1,149 @@
+import math
+import numpy as np
+from numba import cuda, njit
+
+def pairCount(rows):
+    """
+    Number of pairs of distinct rows (r1, r2) with r1 < r2 (plain Python, it is not compiled by NUMBA).
+
+    :param rows: Number of rows.
+    :type rows: int
+
+    :return: rows * (rows - 1) / 2.
+    :rtype: int
+    """
+    return rows * (rows - 1) // 2
+
+@njit
+def rowsToPair(r1, r2, rows):
+    """
+    Index of the pair of rows (r1, r2), r1 < r2, in the row-major order of the upper triangle: (0, 1), (0, 2), ..., (0, rows - 1), (1, 2), ...
+
+    :param r1: First row of the pair.
+    :type r1: int
+
+    :param r2: Second row of the pair.
+    :type r2: int
+
+    :param rows: Number of rows.
+    :type rows: int
+
+    :return: Index of the pair.
+    :rtype: int
+    """
+    return r1 * (2 * rows - r1 - 1) // 2 + (r2 - r1 - 1)
+
+@njit
+def pairToRows(pattern, rows):
+    """
+    Rows (r1, r2) of a pair index (closed-form inverse of :func:`rowsToPair`, O(1)).
+
+    :param pattern: Index of the pair.
+    :type pattern: int
+
+    :param rows: Number of rows.
+    :type rows: int
+
+    :return: First and second row of the pair.
+    :rtype: tuple(int, int)
+    """
+    pairsAfter = rows * (rows - 1) // 2 - 1 - pattern
+    r1 = rows - 2 - int((np.sqrt(8.0 * pairsAfter + 1.0) - 1.0) // 2.0)
+
+    # Integer correction of floating point rounding
+    while r1 > 0 and r1 * (2 * rows - r1 - 1) // 2 > pattern:
+        r1 -= 1
+    while (r1 + 1) * (2 * rows - r1 - 2) // 2 <= pattern:
+        r1 += 1
+
+    r2 = pattern - r1 * (2 * rows - r1 - 1) // 2 + r1 + 1
+    return r1, r2
+
+@cuda.jit(device=True)
+def pairToRowsGpu(pattern, rows):
+    """
+    Rows (r1, r2) of a pair index, with the same closed form as :func:`pairToRows`. It can only be called from NUMBA CUDA kernels.
+    """
+    pairsAfter = rows * (rows - 1) // 2 - 1 - pattern
+    r1 = rows - 2 - int((math.sqrt(8.0 * pairsAfter + 1.0) - 1.0) // 2.0)
+
+    # Integer correction of floating point rounding
+    while r1 > 0 and r1 * (2 * rows - r1 - 1) // 2 > pattern:
+        r1 -= 1
+    while (r1 + 1) * (2 * rows - r1 - 2) // 2 <= pattern:
+        r1 += 1
+
+    r2 = pattern - r1 * (2 * rows - r1 - 1) // 2 + r1 + 1
+    return r1, r2
+
+@njit
+def rowPairRange(r1, rows):
+    """
+    Block of pair indexes whose first row is r1: the pairs (r1, r1 + 1), ..., (r1, rows - 1).
+
+    :param r1: First row of the pairs.
+    :type r1: int
+
+    :param rows: Number of rows.
+    :type rows: int
+
+    :return: First pair index of the block and the index after its last pair.
+    :rtype: tuple(int, int)
+    """
+    start = r1 * (2 * rows - r1 - 1) // 2
+    return start, start + rows - r1 - 1
+
+@njit
+def pairsToRows(pairStart, pairEnd, rows):
+    """
+    Rows of every pair index of the block [pairStart, pairEnd). Only the first pair is decoded, the others are walked in O(1) each.
+
+    :param pairStart: First pair index of the block.
+    :type pairStart: int
+
+    :param pairEnd: Index after the last pair of the block.
+    :type pairEnd: int
+
+    :param rows: Number of rows.
+    :type rows: int
+
+    :return: First and second row of every pair of the block.
+    :rtype: tuple(np.array, np.array)
+    """
+    size = max(0, pairEnd - pairStart)
+    aR1 = np.empty(size, dtype=np.int64)
+    aR2 = np.empty(size, dtype=np.int64)
+    if size > 0:
+        r1, r2 = pairToRows(pairStart, rows)
+        for p in range(size):
+            aR1[p] = r1
+            aR2[p] = r2
+            r2 += 1
+            if r2 == rows:
+                r1 += 1
+                r2 = r1 + 1
+    return aR1, aR2
+
+@njit
+def pairsToRowsIndex(pairStart, rows, index):
+    """
+    Write the rows of the pairs pairStart, pairStart + 1, ... into the first two columns of `index` (one pair per row of `index`), without temporary arrays. Only the first pair is decoded, the others are walked in O(1) each.
+
+    :param pairStart: First pair index of the block.
+    :type pairStart: int
+
+    :param rows: Number of rows.
+    :type rows: int
+
+    :param index: Output matrix with one row per pair and at least two columns (any numeric type).
+    :type index: np.array
+    """
+    if index.shape[0] > 0:
+        r1, r2 = pairToRows(pairStart, rows)
+        for p in range(index.shape[0]):
+            index[p, 0] = r1
+            index[p, 1] = r2
+            r2 += 1
+            if r2 == rows:
+                r1 += 1
+                r2 = r1 + 1
@@ -0,0 +1,123 @@
+import io
+import os
+import copy
+import contextlib
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+def sortLevels(datasets):
+    """
+    Deterministic order of a set of datasets (for example, the levels generated by :func:`bioscience.preprocess.Binarization.binarizeLevels`): from the highest cut to the lowest one (the order in which the levels are generated) and, for the datasets without cut or with the same cut, from the sparsest to the densest one.
+
+    :param datasets: The dataset objects of every level.
+    :type datasets: set(:class:`bioscience.base.models.Dataset`)
+
+    :return: The dataset objects in level order.
+    :rtype: list(:class:`bioscience.base.models.Dataset`)
+    """
+    return sorted(datasets, key=lambda oDataset: (oDataset.cut is None, -(oDataset.cut or 0), int(np.count_nonzero(oDataset.data))))
+
+def processLevels(function, datasets, args = (), processes = None):
+    """
+    Run `function(dataset, *args)` for every level of a set of datasets on a pool of processes. The `original` matrix shared by the levels is copied once into shared memory (only the binary `data` of each level is sent to the workers) and the output of each level is printed in level order once it has finished.
+
+    :param function: Top-level function that processes one dataset (for example, :func:`bioscience.dataMining.biclustering.BiBit.processBiBit`).
+    :type function: callable
+
+    :param datasets: The dataset objects of every level.
+    :type datasets: set(:class:`bioscience.base.models.Dataset`)
+
+    :param args: Arguments of `function` after the dataset, defaults to ().
+    :type args: tuple, optional
+
+    :param processes: Number of worker processes, defaults to None (number of CPUs).
+    :type processes: int, optional
+
+    :return: The result of `function` for every level, in the order of :func:`sortLevels`.
+    :rtype: list
+    """
+    listDatasets = sortLevels(datasets)
+    if len(listDatasets) == 0:
+        return []
+    if processes is None:
+        processes = os.cpu_count()
+    processes = max(1, min(processes, len(listDatasets)))
+
+    # The original matrix of the first level is shared with the workers (never pickled per level)
+    original = listDatasets[0].original
+    sharedOriginal = None
+    initargs = (None, None, None, original)
+    if isinstance(original, np.ndarray) and original.dtype != object and original.nbytes > 0:
+        sharedOriginal = shared_memory.SharedMemory(create=True, size=original.nbytes)
+        np.ndarray(original.shape, dtype=original.dtype, buffer=sharedOriginal.buf)[:] = original
+        initargs = (sharedOriginal.name, original.shape, original.dtype.str, None)
+
+    try:
+        tasks = []
+        for oDataset in listDatasets:
+            oLevel = copy.copy(oDataset)
+            if oDataset.original is original:
+                oLevel.original = None
+            tasks.append((function, oLevel, args))
+
+        results = []
+        with processContext().Pool(processes, initializer=__initLevels, initargs=initargs) as pool:
+            for iLevel, oDataset, (result, bSource, output) in zip(range(1, len(tasks) + 1), listDatasets, pool.imap(__processLevel, tasks)):
+                print("\nLEVEL: ", str(iLevel))
+                print(output, end="")
+                if bSource:
+                    for oBicluster in result.results:
+                        oBicluster.source = oDataset.original
+                results.append(result)
+    finally:
+        if sharedOriginal is not None:
+            sharedOriginal.close()
+            sharedOriginal.unlink()
+
+    return results
+
+def processContext(preload = ()):
+    """
+    Multiprocessing context of the process pools: "forkserver" where it is available and "spawn" otherwise. The workers are never forked from the calling process, whose NUMBA threading layer (TBB, OpenMP) is not fork-safe.
+
+    :param preload: Modules that the fork server imports once before starting the workers (this module is always included), defaults to ().
+    :type preload: list(str), optional
+
+    :return: The multiprocessing context.
+    :rtype: multiprocessing.context.BaseContext
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__, *preload])
+        return context
+    return multiprocessing.get_context("spawn")
+
+def __initLevels(name, shape, dtype, original):
+    # Worker: attach to the shared original matrix
+    global levelsOriginal, levelsMemory
+    if name is not None:
+        levelsMemory = shared_memory.SharedMemory(name=name)
+        levelsOriginal = np.ndarray(shape, dtype=np.dtype(dtype), buffer=levelsMemory.buf)
+    else:
+        levelsOriginal = original
+
+def __processLevel(task):
+    # Worker: process one level and return its result and its output
+    function, oDataset, args = task
+    if oDataset.original is None:
+        oDataset.original = levelsOriginal
+
+    with io.StringIO() as output:
+        with contextlib.redirect_stdout(output):
+            result = function(oDataset, *args)
+
+        # The biclusters are returned without their source matrix (it is attached again by the parent process)
+        bSource = False
+        if result is not None and hasattr(result, "results"):
+            for oBicluster in result.results:
+                if getattr(oBicluster, "source", None) is oDataset.original and oDataset.original is not None:
+                    oBicluster.source = None
+                    bSource = True
+        return result, bSource, output.getvalue()
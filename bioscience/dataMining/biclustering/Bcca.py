@@ -2,25 +2,35 @@ from bioscience.base import *
 
 import sys
 import os
+import time
 import threading
 import warnings
 import numpy as np
-from numba import cuda, njit, NumbaWarning, set_num_threads, prange
+from numba import cuda, njit, NumbaWarning, set_num_threads, get_num_threads, prange
 
-def processBcca(dataset, correlationThreshold, minCols, deviceCount, mode, debug):
+# Scores of two candidate removals closer than this are a tie (rounding of the running sums)
+TIE_TOLERANCE = 1e-12
+
+# Memory (in bytes) of the column and row masks of each block of seed pairs in mode=2
+SEED_BLOCK_MEMORY = 1 << 26
+
+# Minimum number of seconds between two progress messages
+PROGRESS_INTERVAL = 10.0
+
+def processBcca(dataset, correlationThreshold, minCols, deviceCount, mode, debug, skipSeeds = False):
     
     oModel = None
     if (0.0 <= correlationThreshold <= 1.0 and minCols >= 2):
         
         sMode = ""
         if mode == 2: # NUMBA: CPU Parallel mode
-            # To be developed
-            sMode = "NUMBA - CPU Parallel mode (to be developed)"
+            oModel = __bccaNumbaCpu(dataset, correlationThreshold, minCols, debug, skipSeeds)
+            sMode = "NUMBA - CPU Parallel mode"
         elif mode == 3: # NUMBA: GPU Parallel mode
             # To be developed
             sMode = "NUMBA - GPU Parallel mode (to be developed)"
         else: # Sequential mode
-            oModel = __bccaSequential(dataset, correlationThreshold, minCols, debug)
+            oModel = __bccaSequential(dataset, correlationThreshold, minCols, debug, skipSeeds)
             deviceCount = 0
             sMode = "CPU Sequential"
     
@@ -29,32 +39,310 @@ def processBcca(dataset, correlationThreshold, minCols, deviceCount, mode, debug
 #############################
 # BCCA sequential algorithm #
 #############################
-def __bccaSequential(dataset, correlationThreshold, minCols, debug):
+def __bccaSequential(dataset, correlationThreshold, minCols, debug, skipSeeds):
     
     oBCCA = BiclusteringModel()  
+    data = np.asarray(dataset.data, dtype=np.float64)
     
-    rows, cols = dataset.data.shape   
+    rows, cols = data.shape   
+    oProgress = BccaProgress(pairCount(rows))
+    oIndex = BccaIndex(skipSeeds)
     for i in range(rows):
+        # Seeds (i, j) already covered by an accepted bicluster (fast mode)
+        bCovered = __coveredSeeds(oIndex, data, i, correlationThreshold) if skipSeeds else None
+        
         for j in range(i + 1, rows):
-            print(i," - ",j)
-            cols = np.arange(cols, dtype=np.int64)
-            corr = _corr(dataset.data[i], dataset.data[j])
+            if skipSeeds and bCovered[j]:
+                continue
             
-            while corr < correlationThreshold and len(cols) >= minCols:
-                cols = np.delete(cols, _find_max_decrease(dataset.data[i], dataset.data[j], cols))
-                corr = _corr(dataset.data[i, cols], dataset.data[j, cols])
+            # Greedy column elimination (running sums of the seed pair)
+            aCols = np.flatnonzero(__reduceCols(data[i], data[j], correlationThreshold, minCols))
             
-            if len(cols) >= minCols:
-                rows = [i, j] + [k for k in range(rows-1) if k not in (i, j) and all(_corr(r, dataset.data[k, cols-1]) >= correlationThreshold for r in dataset.data[rows-1, cols-1])]
-                b = Bicluster(rows, cols)
-                if not any(np.array_equal(b.rows, bi.rows) and np.array_equal(b.cols, bi.cols) for bi in oBCCA.results):
-                    oBCCA.results.add(b)
+            if len(aCols) >= minCols:
+                aRows = __expandRowsNumpy(data, i, j, aCols, correlationThreshold)
+                if oIndex.add(aRows, aCols):
+                    oBCCA.results.add(Bicluster(aRows, aCols))
+                    if skipSeeds:
+                        __coverSeeds(data, i, aRows, aCols, correlationThreshold, bCovered)
+        
+        oProgress.update(rows - i - 1)
+    
+    oProgress.finish()
+    return oBCCA
+
+def __expandRowsNumpy(data, i, j, aCols, correlationThreshold):
+    # Rows correlated with every member of the bicluster on the columns left, added in index order: each candidate keeps the minimum of its correlations with the members so far (first the seed rows, one matrix product)
+    z = __standardizeRows(data[:, aCols])
+    
+    # Constant rows (norm 0) are NaN and never pass the threshold; the seed rows are always members
+    minCorr = np.abs(z @ z[[i, j]].T).min(axis=1)
+    minCorr[[i, j]] = np.nan
+    aCandidates = np.flatnonzero(minCorr >= correlationThreshold)
+    zCandidates, minCorr = z[aCandidates], minCorr[aCandidates]
+    bRows = np.zeros(data.shape[0], dtype=np.bool_)
+    bRows[[i, j]] = True
+    for idx, k in enumerate(aCandidates):
+        if minCorr[idx] >= correlationThreshold:
+            bRows[k] = True
+            np.minimum(minCorr[idx + 1:], np.abs(zCandidates[idx + 1:] @ zCandidates[idx]), out=minCorr[idx + 1:])
+    return np.flatnonzero(bRows)
+
+def __standardizeRows(x):
+    # Rows centred on their mean and scaled to unit norm (NaN if they are constant)
+    z = x - x.mean(axis=1, keepdims=True)
+    norm = np.sqrt(np.einsum("ij,ij->i", z, z))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z /= norm[:, None]
+    return z
+
+class BccaIndex:
+    """
+    Index of the biclusters accepted by BCCA. The biclusters are keyed by their sorted rows and columns, so a duplicate is found in O(1) instead of comparing it with every bicluster accepted before. With `coverage`, the biclusters of every row are also kept for the seed skipping of the fast mode.
+    
+    :param coverage: Keep the biclusters of every row, defaults to False.
+    :type coverage: boolean, optional
+    """
+    
+    def __init__(self, coverage = False):
+        self.keys = set()
+        self.coverage = coverage
+        self.rowBiclusters = {}
+    
+    def add(self, aRows, aCols):
+        """
+        Add a bicluster to the index.
+        
+        :param aRows: Sorted rows of the bicluster.
+        :type aRows: np.array
+        
+        :param aCols: Sorted columns of the bicluster.
+        :type aCols: np.array
+        
+        :return: False if the bicluster was already in the index.
+        :rtype: boolean
+        """
+        key = (np.asarray(aRows, dtype=np.int64).tobytes(), np.asarray(aCols, dtype=np.int64).tobytes())
+        if key in self.keys:
+            return False
+        
+        self.keys.add(key)
+        if self.coverage:
+            for row in aRows:
+                self.rowBiclusters.setdefault(int(row), []).append((aRows, aCols))
+        return True
+
+def __coveredSeeds(oIndex, data, i, correlationThreshold):
+    # Rows j such that the seed (i, j) is covered: i and j are members of an accepted bicluster whose columns keep them correlated
+    bCovered = np.zeros(data.shape[0], dtype=np.bool_)
+    for aRows, aCols in oIndex.rowBiclusters.get(i, []):
+        __coverSeeds(data, i, aRows, aCols, correlationThreshold, bCovered)
+    return bCovered
+
+def __coverSeeds(data, i, aRows, aCols, correlationThreshold, bCovered):
+    # Mark the members j > i of a bicluster correlated with row i on its columns
+    members = aRows[aRows > i]
+    if len(members) > 0:
+        z = __standardizeRows(data[np.concatenate(([i], members))][:, aCols])
+        bCovered[members[np.abs(z[1:] @ z[0]) >= correlationThreshold]] = True
+
+class BccaProgress:
+    """
+    Progress report of the seed pairs processed by BCCA (at most one message every `PROGRESS_INTERVAL` seconds).
+    
+    :param total: Number of seed pairs.
+    :type total: int
+    """
+    
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.start = time.perf_counter()
+        self.last = self.start
+    
+    def update(self, pairs):
+        self.done += pairs
+        now = time.perf_counter()
+        if now - self.last >= PROGRESS_INTERVAL:
+            self.last = now
+            print(f"Seed pairs: {self.done}/{self.total} ({100.0 * self.done / max(1, self.total):.1f}%) - {now - self.start:.1f}s")
+    
+    def finish(self):
+        print(f"Seed pairs: {self.done}/{self.total} (100.0%) - {time.perf_counter() - self.start:.1f}s")
+
+#################################
+# BCCA NUMBA parallel algorithm #
+#################################
+def __bccaNumbaCpu(dataset, correlationThreshold, minCols, debug, skipSeeds):
+    
+    oBCCA = BiclusteringModel()
+    data = np.ascontiguousarray(dataset.data, dtype=np.float64)
+    rows, cols = data.shape
+    maxPairs = pairCount(rows)
+    blockPairs = max(1, SEED_BLOCK_MEMORY // (rows + cols))
+    if skipSeeds:
+        # Smaller blocks (about the seeds of one first row per thread), so that the skipped seeds are updated often
+        blockPairs = min(blockPairs, max(1, rows - 1) * get_num_threads())
+    
+    oProgress = BccaProgress(maxPairs)
+    oIndex = BccaIndex(skipSeeds)
+    for pairStart in range(0, maxPairs, blockPairs):
+        pairs = min(blockPairs, maxPairs - pairStart)
+        
+        # 1) Candidate biclusters of every seed pair of the block (one seed pair per thread), skipping the seeds covered by the biclusters of the previous blocks (fast mode)
+        bValid = np.zeros(pairs, dtype=np.bool_)
+        bCols = np.zeros((pairs, cols), dtype=np.bool_)
+        bRows = np.zeros((pairs, rows), dtype=np.bool_)
+        bSkip = __skippedSeeds(oIndex, data, pairStart, pairs, correlationThreshold) if skipSeeds else np.zeros(pairs, dtype=np.bool_)
+        __bccaSeedsKernel(data, pairStart, correlationThreshold, minCols, bSkip, bValid, bCols, bRows)
+        
+        # 2) Remove the duplicate candidates of the block and merge them with the biclusters found before
+        if bValid.any():
+            candidates = np.unique(np.concatenate((np.packbits(bRows[bValid], axis=1), np.packbits(bCols[bValid], axis=1)), axis=1), axis=0)
+            rowBytes = (rows + 7) // 8
+            for candidate in candidates:
+                aRows = np.flatnonzero(np.unpackbits(candidate[:rowBytes], count=rows))
+                aCols = np.flatnonzero(np.unpackbits(candidate[rowBytes:], count=cols))
+                if oIndex.add(aRows, aCols):
+                    oBCCA.results.add(Bicluster(aRows, aCols))
+        
+        oProgress.update(pairs)
     
+    oProgress.finish()
     return oBCCA
+
+def __skippedSeeds(oIndex, data, pairStart, pairs, correlationThreshold):
+    # Seeds of the block [pairStart, pairStart + pairs) covered by the accepted biclusters, first row by first row
+    rows = data.shape[0]
+    bSkip = np.zeros(pairs, dtype=np.bool_)
+    r1, _ = pairToRows(pairStart, rows)
+    pattern = pairStart
+    while pattern < pairStart + pairs:
+        first, last = rowPairRange(r1, rows)
+        last = min(last, pairStart + pairs)
+        if r1 in oIndex.rowBiclusters:
+            bCovered = __coveredSeeds(oIndex, data, r1, correlationThreshold)
+            bSkip[pattern - pairStart:last - pairStart] = bCovered[pattern - first + r1 + 1:last - first + r1 + 1]
+        pattern = last
+        r1 += 1
+    return bSkip
+
+@njit(parallel=True)
+def __bccaSeedsKernel(data, pairStart, correlationThreshold, minCols, bSkip, bValid, bCols, bRows):
+    rows = data.shape[0]
+    for p in prange(bValid.shape[0]):
+        if bSkip[p]:
+            continue
+        i, j = pairToRows(pairStart + p, rows)
+        bCols[p] = __reduceCols(data[i], data[j], correlationThreshold, minCols)
+        if np.sum(bCols[p]) >= minCols:
+            bValid[p] = True
+            __expandRows(data, i, j, bCols[p], correlationThreshold, bRows[p])
+
+@njit
+def __expandRows(data, i, j, bCols, correlationThreshold, bRows):
+    # Rows correlated with every member of the bicluster on the columns left, added in index order (the seed rows are always members)
+    aCols = np.flatnonzero(bCols)
+    zi = __standardize(data[i, aCols])
+    zj = __standardize(data[j, aCols])
+    bRows[i] = True
+    bRows[j] = True
+    if zi is None or zj is None:
+        return
+    
+    # Minimum correlation of every candidate with the members so far (-1 if it is not a candidate)
+    rows = data.shape[0]
+    minCorr = np.full(rows, -1.0)
+    for k in range(rows):
+        if k != i and k != j:
+            minCorr[k] = min(__absCorr(data, k, aCols, zi), __absCorr(data, k, aCols, zj))
+    for k in range(rows):
+        if minCorr[k] >= correlationThreshold:
+            bRows[k] = True
+            zk = __standardize(data[k, aCols])
+            if zk is not None:
+                for q in range(k + 1, rows):
+                    if minCorr[q] >= correlationThreshold:
+                        minCorr[q] = min(minCorr[q], __absCorr(data, q, aCols, zk))
+
+@njit
+def __absCorr(data, k, aCols, z):
+    # Absolute correlation of the centred row k with a standardized row on the columns aCols, without copying the row (-1 if the row is constant)
+    mean = 0.0
+    for c in aCols:
+        mean += data[k, c]
+    mean /= len(aCols)
+    sumSq = 0.0
+    dot = 0.0
+    for idx in range(len(aCols)):
+        value = data[k, aCols[idx]] - mean
+        sumSq += value * value
+        dot += value * z[idx]
+    if sumSq > 0.0:
+        return abs(dot) / np.sqrt(sumSq)
+    return -1.0
+
+@njit
+def __standardize(x):
+    # Values centred on their mean and scaled to unit norm (None if they are constant)
+    xc = x - np.mean(x)
+    norm = np.sqrt(np.sum(xc * xc))
+    if norm == 0.0:
+        return None
+    return xc / norm
+
+@njit
+def __reduceCols(x, y, correlationThreshold, minCols):
+    # Greedy column elimination of a seed pair: while the correlation is below the threshold, remove the column whose removal gives the highest correlation (the first one in a tie).
+    # The sums (Σx, Σy, Σxy, Σx², Σy²) of the columns left are kept, so each candidate removal is scored in O(1) and each seed pair costs O(cols²)
+    cols = x.shape[0]
+    bCols = np.ones(cols, dtype=np.bool_)
+    
+    # Values centred on the mean of the row (the correlation does not change and the sums do not lose precision)
+    xc = x - np.mean(x)
+    yc = y - np.mean(y)
+    sumX = 0.0
+    sumY = 0.0
+    sumXY = 0.0
+    sumXX = 0.0
+    sumYY = 0.0
+    for c in range(cols):
+        sumX += xc[c]
+        sumY += yc[c]
+        sumXY += xc[c] * yc[c]
+        sumXX += xc[c] * xc[c]
+        sumYY += yc[c] * yc[c]
+    
+    n = cols
+    corr = __corrSums(n, sumX, sumY, sumXY, sumXX, sumYY)
+    while corr < correlationThreshold and n >= minCols:
+        bestCol = -1
+        bestCorr = -1.0
+        for c in range(cols):
+            if bCols[c]:
+                corrCol = __corrSums(n - 1, sumX - xc[c], sumY - yc[c], sumXY - xc[c] * yc[c], sumXX - xc[c] * xc[c], sumYY - yc[c] * yc[c])
+                if corrCol > bestCorr + TIE_TOLERANCE:
+                    bestCorr = corrCol
+                    bestCol = c
         
-def _find_max_decrease(ri, rj, indices):
-        return max(range(len(indices)), key=lambda k: _corr(np.delete(ri, indices[k]), np.delete(rj, indices[k])))
+        bCols[bestCol] = False
+        sumX -= xc[bestCol]
+        sumY -= yc[bestCol]
+        sumXY -= xc[bestCol] * yc[bestCol]
+        sumXX -= xc[bestCol] * xc[bestCol]
+        sumYY -= yc[bestCol] * yc[bestCol]
+        n -= 1
+        corr = bestCorr
     
-def _corr(v, w):
-        vc, wc = v - np.mean(v), w - np.mean(w)
-        return np.abs(np.sum(vc * wc) / np.sqrt(np.sum(vc * vc) * np.sum(wc * wc)))
\ No newline at end of file
+    return bCols
+
+@njit
+def __corrSums(n, sumX, sumY, sumXY, sumXX, sumYY):
+    # Absolute Pearson correlation from the sums of n columns (0 if one of the rows is constant)
+    if n < 2:
+        return 0.0
+    cov = n * sumXY - sumX * sumY
+    varX = n * sumXX - sumX * sumX
+    varY = n * sumYY - sumY * sumY
+    if varX <= 0.0 or varY <= 0.0:
+        return 0.0
+    return abs(cov) / np.sqrt(varX * varY)
@@ -1,4 +1,5 @@
 from bioscience.base import *
+from .Bitset import *
 from numba.core.errors import NumbaDeprecationWarning, NumbaPendingDeprecationWarning
 
 import warnings
@@ -10,10 +11,43 @@ import queue
 import sys
 import os
 import threading
+import multiprocessing
+from multiprocessing import shared_memory
 import warnings
-from numba import cuda, njit, NumbaWarning, set_num_threads, prange
+from numba import cuda, njit, NumbaWarning, set_num_threads, get_num_threads, prange
 
-def processBiBit(dataset, cMnr, cMnc, deviceCount, mode, debug):
+PARALLEL_PACK_SIZE = 1 << 24 # Matrix cells from which the NUMBA packing kernel is used
+SHARD_SIZE = 1 << 22 # Row pairs per shard of the process pool (mode=4)
+CHECKPOINT_FILE = "bibit_checkpoint.npz"
+CHECKPOINT_INTERVAL = 300 # Seconds between checkpoints
+STREAM_MEMORY_LIMIT = 1 << 30 # Default memory budget (bytes) of processBiBitStats and processBiBitIter
+MEMORY_FRACTION = 0.8 # Fraction of the available RAM that the CPU modes plan to use
+SPARSE_DENSITY = 0.05 # Density (fraction of ones) up to which the sparse path is used
+MIN_TILE_PAIRS = 64 # Row pairs of the smallest tile that a memory budget must hold
+
+class BiBitContext:
+    """
+    State of one BiBit run. Every run builds its own context instead of using module variables and the dataset of the caller is not modified, so several runs can be executed at the same time in one process (for example, in threads).
+    
+    :param original: Values of the dataset (the columns of the biclusters refer to them).
+    :type original: np.array
+    
+    :param data: Packed binary matrix that is mined (one row of 64-bit words per row of the dataset).
+    :type data: np.array
+    """
+    
+    def __init__(self, original, data):
+        """
+        Constructor method
+        """
+        self.original = original
+        self.data = data
+        self.maxPatterns = pairCount(data.shape[0]) # Row pairs to evaluate
+        self.selfPatterns = np.zeros((0, data.shape[1]), dtype=np.uint64) # Patterns of the pairs of identical rows (collapse)
+        self.setPatterns64 = PatternSet(data.shape[1]) # Distinct patterns of all chunks and devices (mode=3)
+        self.candidatePairs = None # Row pairs sharing at least cMnc columns (sparse path)
+
+def processBiBit(dataset, cMnr, cMnc, deviceCount, mode, debug, memoryLimit = None, extension = "auto", engine = "pairs", processes = None, checkpoint = None, prune = False, collapse = False, sparse = False):
     
     """
     Sub-function processing the BiBit Biclustering algorithm.
@@ -30,43 +64,149 @@ def processBiBit(dataset, cMnr, cMnc, deviceCount, mode, debug):
     :param deviceCount: Number of GPU devices to execute
     :type deviceCount: int
     
-    :param mode: Type of execution of the algorithm: `mode=1` for sequential execution, `mode=2` for parallel execution on CPUs and `mode=3` for execution on a multi-GPU architecture.
+    :param mode: Type of execution of the algorithm: `mode=1` for sequential execution, `mode=2` for parallel execution on CPUs, `mode=3` for execution on a multi-GPU architecture, `mode=4` for parallel execution on a pool of processes and `mode=5` for batched execution with NumPy only (no NUMBA compilation).
     :type mode: int
     
     :param mode: Attribute used to run the algorithm in debug mode.
     :type mode: boolean
     
+    :param memoryLimit: Memory budget (in bytes) for the CPU modes. If it is set, `mode=1` and `mode=2` walk the row pairs in tiles sized to this budget and only keep the patterns that pass `cMnc`, `mode=4` sizes the shards of each process to its share of the budget and `mode=5` sizes its blocks of row pairs to it (STREAM_MEMORY_LIMIT if it is not set), defaults to None (`mode=1` and `mode=2` process all row pairs at once if their planned peak memory fits in the available RAM, otherwise they are tiled to MEMORY_FRACTION of it). A ValueError is raised if the budget of a tiled run cannot hold the packed matrix and a tile of MIN_TILE_PAIRS row pairs.
+    :type memoryLimit: int, optional
+    
+    :param extension: How the CPU modes find the rows of each pattern: `"horizontal"` tests every row, `"vertical"` intersects the row-bitsets of the pattern columns (transposed index) and `"auto"` chooses per pattern the cheaper of both. The transposed index is only built if at least one pattern uses it, defaults to "auto".
+    :type extension: str, optional
+    
+    :param engine: Pattern generation engine: `"pairs"` for the BiBit enumeration of row pairs (it uses `mode`) and `"closed"` to mine closed column patterns directly with LCM-style prefix-preserving closure extension. The closed engine returns every maximal bicluster with at least `cMnr` (and 2) rows and `cMnc` columns, a superset of the pair-generated ones, defaults to "pairs".
+    :type engine: str, optional
+    
+    :param processes: Number of worker processes of `mode=4`, defaults to None (number of CPUs).
+    :type processes: int, optional
+    
+    :param checkpoint: Directory where `mode=1`, `mode=2` (always tiled when a checkpoint is used) and `mode=4` periodically save the row pairs already processed and the unique patterns found. If it contains a checkpoint of the same dataset and parameters, the run continues from it with any tile size, defaults to None (no checkpoint).
+    :type checkpoint: str, optional
+    
+    :param prune: Remove, before the pair enumeration and until a fixed point is reached, the rows with fewer than `cMnc` ones and the columns with fewer than 2 ones. The biclusters are reported in the coordinates of the original dataset and are the same as without pruning, defaults to False.
+    :type prune: boolean, optional
+    
+    :param collapse: Group the identical rows of the dataset and enumerate only the pairs of distinct rows (plus the pair of a row with itself when it appears two or more times). The rows of each bicluster are expanded back to every member of their groups, so the result is the same. It is used by `mode=1`, `mode=2`, `mode=4` and `mode=5` with the `"pairs"` engine and ignored, with a warning, otherwise, defaults to False.
+    :type collapse: boolean, optional
+    
+    :param sparse: Generate the candidate row pairs from the inverted lists of the columns (the rows of every column): only the pairs that share a column are counted, and the patterns are only extracted for those that share at least `cMnc` columns. It is used if the density of the binary matrix is at most SPARSE_DENSITY by `mode=1` and `mode=2` with the `"pairs"` engine, without `memoryLimit`, `checkpoint`, `prune` or `collapse`; otherwise the dense path is used and a warning tells why. `mode=1` counts the pairs in a single thread and `mode=2` in parallel. A `scipy.sparse` matrix in `dataset.data` (for example, `Dataset(csr)`) always enables it, defaults to False.
+    :type sparse: boolean, optional
+    
     :return: A BiclusteringModel object that stores all biclusters generated by the BiBit algorithm.
     :rtype: :class:`bioscience.base.models.BiclusteringModel`       
     """
     
-    # Matrix reduce
-    dataset.data = __matrixReduce(dataset.data)
-    global maxPatterns
-    maxPatterns = 0
-    for i in range(dataset.data.shape[0]):
-        for j in range(i + 1, dataset.data.shape[0]):
-            maxPatterns += 1
+    # Sparse path (inverted lists of the columns) or hand-off of a sparse matrix to the dense path
+    original, data = dataset.original, dataset.data
+    bSparseInput = hasattr(data, "tocsr")
+    bSparse = False
+    if sparse or bSparseInput:
+        indptr, indices, density = __sparseRows(data)
+        bSparse = density <= SPARSE_DENSITY and engine == "pairs" and mode in (1, 2) and memoryLimit is None and checkpoint is None and not prune and not collapse and cMnc >= 1
+        if not bSparse and density > SPARSE_DENSITY:
+            warnings.warn("BiBit: the density of the dataset (" + str(round(density, 6)) + ") is above SPARSE_DENSITY, the dense path is used.")
+        elif not bSparse:
+            warnings.warn("BiBit: the sparse path is only used by the pairs engine with mode=1 and mode=2, without memoryLimit, checkpoint, prune or collapse and with cMnc >= 1, the dense path is used.")
+        if bSparseInput and not bSparse:
+            data = data.toarray()
+    
+    # Row and column pruning (the mining runs on the pruned dataset)
+    if prune:
+        rowsMap, colsMap = __pruneMatrix(data, cMnc)
+        original, data = original[np.ix_(rowsMap, colsMap)], data[np.ix_(rowsMap, colsMap)]
+    
+    # Matrix reduce (state of this run)
+    cols = data.shape[1]
+    oContext = BiBitContext(original, packSparseRows(indptr, indices, cols) if bSparse else __matrixReduce(data, mode != 5))
+    
+    # Identical rows collapse (the mining runs on the distinct rows and keeps every bicluster until the groups are expanded)
+    bCollapse = collapse and engine == "pairs" and mode in (1, 2, 4, 5)
+    if collapse and not bCollapse:
+        warnings.warn("BiBit: collapse is only used by the pairs engine with mode=1, mode=2, mode=4 and mode=5, it is ignored.")
+    cMnrMining = cMnr
+    if bCollapse:
+        groupsPtr, groupsRows = __collapseRows(oContext, cMnc)
+        cMnrMining = 1
+    
+    rows = oContext.data.shape[0]
+    
+    # Memory plan of the CPU modes (chunking and peak memory)
+    bPlan = engine == "pairs" and mode in (1, 2) and cols > 0 and not bSparse
+    if bPlan:
+        memoryLimit, plannedMemory = __planMemory(oContext, mode, debug, memoryLimit, checkpoint is not None)
+        print("Planned peak memory (bytes): ", plannedMemory, "(tiles of row pairs)" if memoryLimit is not None else "(all row pairs at once)")
+    
+    if checkpoint is not None and (engine != "pairs" or mode not in (1, 2, 4)):
+        warnings.warn("BiBit: checkpoint is only used by the pairs engine with mode=1, mode=2 and mode=4, it is ignored.")
+    
+    # Vertical (column-bitset) index for the row extension of the CPU modes (built when the first pattern needs it)
+    vertical = None
+    if extension != "horizontal" and mode in (1, 2):
+        vertical = VerticalIndex(oContext.data, cols)
     
     sMode = ""
-    if mode == 2: # NUMBA: CPU Parallel mode
-        oModel = __bibitNumbaCpu(dataset, cMnr, cMnc, debug)     
+    if cols == 0 or rows + len(oContext.selfPatterns) < 2: # Nothing to mine (for example, everything has been pruned)
+        oModel = BiclusteringModel()
+        sMode = "None (no pairs of rows)"
+    elif engine == "closed": # Closed patterns (LCM-style)
+        oModel = __bibitClosed(oContext, cMnr, cMnc, debug, transposeRows(oContext.data, cols))
+        sMode = "Closed patterns (LCM)"
+    elif bSparse: # Sparse path (candidate pairs from the inverted lists of the columns)
+        oModel = __bibitSparse(oContext, indptr, indices, cols, cMnr, cMnc, mode, debug, vertical, extension)
+        sMode = "NUMBA - CPU Parallel mode (sparse)" if mode == 2 else "CPU Sequential (sparse)"
+    elif memoryLimit is not None and mode in (1, 2): # Tiled CPU mode (bounded memory)
+        oModel = __bibitTiled(oContext, cMnrMining, cMnc, mode, memoryLimit, debug, vertical, extension, checkpoint)
+        sMode = "NUMBA - CPU Parallel mode (tiled)" if mode == 2 else "CPU Sequential (tiled)"
+    elif mode == 2: # NUMBA: CPU Parallel mode
+        oModel = __bibitNumbaCpu(oContext, cMnrMining, cMnc, debug, vertical, extension)     
         sMode = "NUMBA - CPU Parallel mode"
     elif mode == 3: # NUMBA: GPU Parallel mode
-        oModel = __bibitNumbaGpu(dataset, cMnr, cMnc, deviceCount, debug)  
+        oModel = __bibitNumbaGpu(oContext, cMnr, cMnc, deviceCount, debug)  
         sMode = "NUMBA - GPU Parallel mode"
+    elif mode == 4: # Process pool
+        if processes is None:
+            processes = os.cpu_count()
+        oModel = __bibitProcesses(oContext, cMnrMining, cMnc, debug, processes, memoryLimit, checkpoint)
+        sMode = "Multiprocessing - CPU Parallel mode"
+    elif mode == 5: # NumPy batched mode
+        if memoryLimit is None:
+            memoryLimit = STREAM_MEMORY_LIMIT
+        oModel = __bibitNumpy(oContext, cMnrMining, cMnc, debug, memoryLimit)
+        sMode = "NumPy - CPU batched mode"
     else: # Sequential mode
-        oModel = __bibitSequential(dataset, cMnr, cMnc, debug)
+        oModel = __bibitSequential(oContext, cMnrMining, cMnc, debug, vertical, extension)
         deviceCount = 0  
         sMode = "CPU Sequential"        
+    if bCollapse:
+        __expandBiclusters(oModel, groupsPtr, groupsRows, cMnr)
+    if prune:
+        __remapBiclusters(oModel, rowsMap, colsMap)
     if debug == False:
         __fillDataBiclusters(dataset, oModel)
     
     print("Resume:\n========================")
     print("Dataset size (rows,columns): ",dataset.original.shape[0],",",dataset.original.shape[1])
     print("Execution mode: ",sMode)
-    if mode == 3:
+    if bCollapse:
+        print("Distinct rows: ", rows, "(" + str(groupsRows.shape[0]) + " rows)")
+    if prune:
+        originalPairs = pairCount(dataset.data.shape[0])
+        print("Pruned dataset size (rows,columns): ", rows, ",", cols)
+        print("Row pairs eliminated: ", originalPairs - oContext.maxPatterns, "(" + str(round(100 * (originalPairs - oContext.maxPatterns) / max(originalPairs, 1), 2)) + "%)")
+    if sparse or bSparseInput:
+        print("Density: ", round(density, 6), "(sparse path)" if bSparse else "(dense path)")
+    if bSparse:
+        print("Candidate row pairs: ", oContext.candidatePairs)
+    if mode == 3 and engine != "closed":
         print("GPUs devices:", deviceCount)
+    if mode == 4 and engine != "closed":
+        print("Processes: ", processes)
+    if memoryLimit is not None and mode in (1, 2, 4, 5) and engine != "closed":
+        print("Memory limit (bytes): ", memoryLimit)
+    if checkpoint is not None and engine == "pairs" and mode in (1, 2, 4):
+        print("Checkpoint: ", checkpoint)
     print("MNC value: ", cMnc)
     print("MNR value: ", cMnr)        
     print("Results:\n========================")
@@ -74,122 +214,375 @@ def processBiBit(dataset, cMnr, cMnc, deviceCount, mode, debug):
     
     return oModel 
 
-def __matrixReduce(data):
-    patternSize = 64 # 64 bits
-    rows, cols = data.shape
+def processBiBitLevels(listDatasets, cMnr, cMnc, debug, extension = "auto"):
+    
+    """
+    Sub-function processing the BiBit Biclustering algorithm over a family of nested binary datasets (for example, the levels generated by :func:`bioscience.preprocess.Binarization.binarizeLevels`), where the ones of a level with a higher cut are a subset of the ones of a level with a lower cut. The row pairs are evaluated from the densest level to the sparsest one: a pair discarded (fewer than `cMnc` columns) in one level is discarded in all sparser levels, so each level only evaluates the pairs that survived the previous one. It runs on CPU with NUMBA. If the datasets do not have the same shape or are not nested, each level is processed independently.
+    
+    :param listDatasets: The dataset objects of every level.
+    :type listDatasets: set(:class:`bioscience.base.models.Dataset`)
+    
+    :param cMnr: Minimum number of rows to build a valid bicluster.
+    :type cMnr: int
+    
+    :param cMnc: Minimum number of columns to build a valid bicluster.
+    :type cMnc: int
+    
+    :param debug: Attribute used to run the algorithm in debug mode.
+    :type debug: boolean
+    
+    :param extension: How the rows of each pattern are found: `"horizontal"`, `"vertical"` or `"auto"` (see :func:`processBiBit`), defaults to "auto".
+    :type extension: str, optional
+    
+    :return: One BiclusteringModel object per level, in the order of :func:`bioscience.base.parallel.sortLevels` (the same order as the other multi-dataset runs), with the same biclusters as running :func:`processBiBit` on each level.
+    :rtype: list(:class:`bioscience.base.models.BiclusteringModel`)
+    """
+    
+    warnings.filterwarnings("ignore", category=NumbaWarning)     
+    set_num_threads(os.cpu_count())
+    
+    # Densest level first (the models are returned in level order)
+    listLevels = sortLevels(listDatasets)
+    listDatasets = sorted(listLevels, key=lambda oDataset: int(np.count_nonzero(oDataset.data)), reverse=True)
+    if len(set(oDataset.data.shape for oDataset in listDatasets)) > 1 or not __nestedLevels(listDatasets):
+        warnings.warn("BiBit: the levels are not nested datasets of the same shape, each level is processed independently.")
+        return [processBiBit(oDataset, cMnr, cMnc, 0, 2, debug, extension=extension) for oDataset in listLevels]
+    
+    dictModels = {}
+    pairsR1 = pairsR2 = None
+    for iLevel, oDataset in enumerate(listDatasets, start=1):
+        cols = oDataset.data.shape[1]
+        oContext = BiBitContext(oDataset.original, __matrixReduce(oDataset.data))
+        data = oContext.data
+        rows = data.shape[0]
+        
+        # 1) Row pairs with at least cMnc columns (only those that passed the previous, denser, level)
+        if pairsR1 is None:
+            pairsR1, pairsR2 = __getPairsLevel(data, cMnc)
+        else:
+            bValid = __filterPairsLevel(data, cMnc, pairsR1, pairsR2)
+            pairsR1, pairsR2 = pairsR1[bValid], pairsR2[bValid]
+        
+        # 2) Unique patterns and biclusters of the level
+        aResultCols = data[pairsR1] & data[pairsR2]
+        patFiltered = uniqueRows(aResultCols) + 1
+        vertical = VerticalIndex(data, cols) if extension != "horizontal" else None
+        biclusters = __generateBiclustersNumbaCpu(data, aResultCols, patFiltered, vertical, extension)
+        oModel = __storeResults(oContext, biclusters, aResultCols, patFiltered, cMnr, debug)
+        if debug == False:
+            __fillDataBiclusters(oDataset, oModel)
+        dictModels[id(oDataset)] = oModel
+        
+        print("\nLEVEL: ", str(listLevels.index(oDataset) + 1))
+        print("Resume:\n========================")
+        print("Dataset size (rows,columns): ", oDataset.original.shape[0], ",", oDataset.original.shape[1])
+        print("Execution mode: ", "NUMBA - CPU Parallel mode (multi-level)")
+        print("Cut: ", oDataset.cut)
+        print("Row pairs evaluated: ", pairCount(rows) if iLevel == 1 else len(bValid))
+        print("MNC value: ", cMnc)
+        print("MNR value: ", cMnr)        
+        print("Results:\n========================")
+        print("Biclusters found: ", len(oModel.results))
+    
+    return [dictModels[id(oDataset)] for oDataset in listLevels]
+
+def processBiBitStats(dataset, cMnr, cMnc, memoryLimit = None, extension = "auto"):
+    
+    """
+    Sub-function computing only the statistics of the BiBit Biclustering algorithm: the number of biclusters and the joint histogram of their sizes (rows, columns), without building the biclusters. The row pairs are processed in tiles sized to `memoryLimit` and in parallel on CPU with NUMBA. It is intended for the exploration of `cMnr` and `cMnc`.
+    
+    :param dataset: The dataset object store the data of input file.
+    :type dataset: :class:`bioscience.base.models.Dataset`
+    
+    :param cMnr: Minimum number of rows to build a valid bicluster.
+    :type cMnr: int
+    
+    :param cMnc: Minimum number of columns to build a valid bicluster.
+    :type cMnc: int
+    
+    :param memoryLimit: Memory budget (in bytes) of the tiles of row pairs and patterns, defaults to None (STREAM_MEMORY_LIMIT).
+    :type memoryLimit: int, optional
+    
+    :param extension: How the rows of each pattern are counted: `"horizontal"`, `"vertical"` or `"auto"` (see :func:`processBiBit`), defaults to "auto".
+    :type extension: str, optional
+    
+    :return: A BiclusteringStatsModel object with the number of biclusters and the histogram of their sizes.
+    :rtype: :class:`bioscience.base.models.BiclusteringStatsModel`
+    """
     
-    if(cols % patternSize == 0):
-        cols = int(cols / patternSize)
+    warnings.filterwarnings("ignore", category=NumbaWarning)     
+    set_num_threads(os.cpu_count())
+    start = time.perf_counter()
+    
+    # Matrix reduce (the dataset of the caller is not modified, a scipy.sparse matrix is packed from its CSR form)
+    cols = dataset.data.shape[1]
+    data = __matrixReduce(dataset.data)
+    if memoryLimit is None:
+        memoryLimit = STREAM_MEMORY_LIMIT
+    vertical = VerticalIndex(data, cols) if extension != "horizontal" else None
+    
+    oStats = BiclusteringStatsModel()
+    for chunkPatterns, support in __streamBiclusters(data, cMnc, memoryLimit, vertical, extension):
+        # The row-bitsets are discarded chunk by chunk
+        rowsPatterns = popcountRows(support)
+        bValid = rowsPatterns >= cMnr
+        oStats.add(rowsPatterns[bValid], popcountRows(chunkPatterns)[bValid])
+    
+    oStats.executionTime = time.perf_counter() - start
+    
+    print("Resume:\n========================")
+    print("Dataset size (rows,columns): ",dataset.original.shape[0],",",dataset.original.shape[1])
+    print("Execution mode: ", "NUMBA - CPU Parallel mode (statistics)")
+    print("Memory limit (bytes): ", memoryLimit)
+    print("MNC value: ", cMnc)
+    print("MNR value: ", cMnr)        
+    print("Results:\n========================")
+    print("Biclusters found: ", oStats.totalBiclusters)
+    
+    return oStats
+
+def processBiBitIter(dataset, cMnr, cMnc, memoryLimit = None, extension = "auto"):
+    
+    """
+    Generator version of the BiBit Biclustering algorithm: the biclusters are yielded as soon as each tile of row pairs has been processed, so they do not need to fit in memory at the same time (only the unique patterns found are kept to discard duplicates). It runs in parallel on CPU with NUMBA and the values of each bicluster are gathered on demand from `dataset.original`.
+    
+    :param dataset: The dataset object store the data of input file.
+    :type dataset: :class:`bioscience.base.models.Dataset`
+    
+    :param cMnr: Minimum number of rows to build a valid bicluster.
+    :type cMnr: int
+    
+    :param cMnc: Minimum number of columns to build a valid bicluster.
+    :type cMnc: int
+    
+    :param memoryLimit: Memory budget (in bytes) of the tiles of row pairs and patterns, defaults to None (STREAM_MEMORY_LIMIT).
+    :type memoryLimit: int, optional
+    
+    :param extension: How the rows of each pattern are found: `"horizontal"`, `"vertical"` or `"auto"` (see :func:`processBiBit`), defaults to "auto".
+    :type extension: str, optional
+    
+    :return: The biclusters found by the BiBit algorithm, one by one.
+    :rtype: Iterator[:class:`bioscience.base.models.Bicluster`]
+    """
+    
+    warnings.filterwarnings("ignore", category=NumbaWarning)     
+    set_num_threads(os.cpu_count())
+    
+    # Matrix reduce (the dataset of the caller is not modified, a scipy.sparse matrix is packed from its CSR form)
+    cols = dataset.data.shape[1]
+    data = __matrixReduce(dataset.data)
+    rows = data.shape[0]
+    if memoryLimit is None:
+        memoryLimit = STREAM_MEMORY_LIMIT
+    vertical = VerticalIndex(data, cols) if extension != "horizontal" else None
+    
+    for chunkPatterns, support in __streamBiclusters(data, cMnc, memoryLimit, vertical, extension):
+        rowsPtr, rowsIndices = patternsToCols(support, rows)
+        colsPtr, colsIndices = patternsToCols(chunkPatterns, cols)
+        for i in np.flatnonzero(np.diff(rowsPtr) >= cMnr):
+            yield Bicluster(rowsIndices[rowsPtr[i]:rowsPtr[i + 1]], cols=colsIndices[colsPtr[i]:colsPtr[i + 1]], source=dataset.original)
+
+def __matrixReduce(data, bNumba = True):
+    # A scipy.sparse matrix is packed from its CSR form (without building the dense matrix)
+    if hasattr(data, "tocsr"):
+        indptr, indices, density = __sparseRows(data)
+        return packSparseRows(indptr, indices, data.shape[1])
+    return packRows(data, parallel = bNumba and data.shape[0] * data.shape[1] >= PARALLEL_PACK_SIZE)
+
+def __useVertical(aResultCols, index, rows, extension):
+    # Row extension cost in word operations: vertical = pattern columns x row words; horizontal = rows x pattern words
+    onesPatterns = popcountRows(aResultCols[index])
+    if extension == "vertical":
+        return onesPatterns > 0
+    elif extension == "auto":
+        return (onesPatterns > 0) & (onesPatterns * wordsPerRow(rows) < rows * aResultCols.shape[1])
     else:
-        cols = int(cols / patternSize) + 1
+        return np.zeros(len(index), dtype=np.bool_)
+
+def __verticalMatrix(vertical, useVertical):
+    # Vertical index only if at least one pattern is evaluated with it (the index is built at that moment)
+    if vertical is None or useVertical is None or not useVertical.any():
+        return None
+    return vertical.matrix
+
+def __availableMemory():
+    # Memory available without swapping, including the reclaimable page cache (None if the platform does not report it)
+    try:
+        with open("/proc/meminfo") as fMeminfo:
+            for line in fMeminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def __planMemory(oContext, mode, debug, memoryLimit, bCheckpoint = False):
+    # Memory budget of the tiles (None: all row pairs at once) and planned peak memory of the run
+    rows, words = oContext.data.shape
+    if memoryLimit is not None:
+        return memoryLimit, memoryLimit
     
+    availableMemory = __availableMemory()
+    if bCheckpoint:
+        # The checkpoints are saved between tiles: the run is always tiled
+        memoryLimit = int(availableMemory * MEMORY_FRACTION) if availableMemory is not None else STREAM_MEMORY_LIMIT
+        return memoryLimit, memoryLimit
     
-    for j in range(rows):
-        cstr_rows_str_padded = ''.join(map(lambda x: str(int(x)), data[j])).zfill(cols * patternSize)       
-        iPos = 0
-        data[j] = 0
-        for cWord in np.array(list(cstr_rows_str_padded), dtype=np.uint64).reshape(cols, patternSize):  
-            data[j][iPos] = int(''.join(map(str, np.unpackbits(np.packbits(cWord)))), 2)
-            iPos += 1
-            
-    return data[:, :cols]   
+    # All row pairs at once: packed matrix, patterns and their ids, hash deduplication and, in mode=2, the row-bitset of every pattern
+    totalPatterns = oContext.maxPatterns + len(oContext.selfPatterns)
+    bytesPerPattern = words * 8 + 8 + 16
+    if mode == 2:
+        bytesPerPattern += wordsPerRow(rows) * 8
+    if debug == False:
+        bytesPerPattern += 8 # Columns of the biclusters (CSR pointers)
+    plannedMemory = rows * words * 8 + totalPatterns * bytesPerPattern
+    
+    if availableMemory is not None and plannedMemory > availableMemory * MEMORY_FRACTION:
+        memoryLimit = int(availableMemory * MEMORY_FRACTION)
+        return memoryLimit, memoryLimit
+    return None, plannedMemory
 
-def __fillDataBiclusters(dataset, oModel):
+def __sparseRows(data):
+    # CSR (row pointers and columns of the ones) and density of a dense or scipy.sparse binary matrix
+    rows, cols = data.shape
+    if hasattr(data, "tocsr"):
+        csr = data.tocsr(copy=True)
+        csr.sum_duplicates()
+        csr.eliminate_zeros()
+        indptr, indices = csr.indptr, csr.indices
+    else:
+        bData = np.asarray(data) != 0
+        indptr = np.zeros(rows + 1, dtype=np.int64)
+        np.cumsum(np.count_nonzero(bData, axis=1), out=indptr[1:])
+        indices = np.nonzero(bData)[1]
+    
+    return indptr.astype(np.int64), indices.astype(np.int64), len(indices) / max(1, rows * cols)
+
+def __pruneMatrix(data, cMnc):
+    # Fixed point: a row needs cMnc ones to be part of a pattern and a column needs 2 ones to be part of the AND of a pair of rows.
+    # The columns with fewer than cMnr ones are kept: they can still be in the pattern of a pair and removing them would change the biclusters found
+    bData = data != 0
+    bRows = np.ones(bData.shape[0], dtype=np.bool_)
+    bCols = np.ones(bData.shape[1], dtype=np.bool_)
+    while True:
+        bNewRows = bRows & (np.count_nonzero(bData[:, bCols], axis=1) >= cMnc)
+        bNewCols = bCols & (np.count_nonzero(bData[bNewRows], axis=0) >= 2)
+        if np.array_equal(bNewRows, bRows) and np.array_equal(bNewCols, bCols):
+            break
+        bRows, bCols = bNewRows, bNewCols
+    
+    return np.flatnonzero(bRows), np.flatnonzero(bCols)
+
+def __collapseRows(oContext, cMnc):
+    # Distinct packed rows, their groups (CSR of the original rows) and the patterns of the pairs of identical rows
+    distinctRows, groups, counts = np.unique(oContext.data, axis=0, return_inverse=True, return_counts=True)
+    groupsPtr = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=groupsPtr[1:])
+    groupsRows = np.argsort(groups.ravel(), kind="stable")
     
+    oContext.data = np.ascontiguousarray(distinctRows)
+    oContext.maxPatterns = pairCount(len(counts))
+    oContext.selfPatterns = distinctRows[(counts >= 2) & (popcountRows(distinctRows) >= cMnc)]
+    return groupsPtr, groupsRows
+
+def __addSelfPatterns(oContext, aResultCols, patFiltered):
+    # Patterns of the pairs of identical rows (after the maxPatterns pair patterns)
+    maxPatterns = oContext.maxPatterns
+    aResultCols[maxPatterns:] = oContext.selfPatterns
+    patFiltered[maxPatterns:] = np.arange(maxPatterns + 1, maxPatterns + len(oContext.selfPatterns) + 1)
+
+def __expandBiclusters(oModel, groupsPtr, groupsRows, cMnr):
+    # Distinct rows -> every row of their groups (the cMnr filter is applied on the expanded rows)
+    results = set()
     for oBicluster in oModel.results:
-        dataBic = np.array([[0] * oBicluster.cols.shape[0]] * oBicluster.rows.shape[0])
-        for i in range(oBicluster.rows.shape[0]):
-            for j in range(oBicluster.cols.shape[0]):
-                dataBic[i][j] = dataset.original[int(oBicluster.rows[i])][int(oBicluster.cols[j])]
-        
-        oBicluster.data = dataBic
+        aDistinct = np.asarray(oBicluster.rows, dtype=np.int64)
+        aRows = np.sort(np.concatenate([groupsRows[groupsPtr[d]:groupsPtr[d + 1]] for d in aDistinct])) if len(aDistinct) > 0 else aDistinct
+        if len(aRows) >= cMnr:
+            oBicluster.rows = aRows
+            results.add(oBicluster)
+    oModel.results = results
+
+def __remapBiclusters(oModel, rowsMap, colsMap):
+    # Pruned dataset coordinates -> original dataset coordinates
+    for oBicluster in oModel.results:
+        oBicluster.rows = rowsMap[np.asarray(oBicluster.rows, dtype=np.int64)]
+        if oBicluster.cols is not None:
+            oBicluster.cols = colsMap[np.asarray(oBicluster.cols, dtype=np.int64)]
+
+def __fillDataBiclusters(dataset, oModel):
+    # Bicluster values are gathered on demand from the original dataset (no copy)
+    for oBicluster in oModel.results:
+        oBicluster.source = dataset.original
 
 ##############################
 # BiBit sequential algorithm #
 ##############################
-def __bibitSequential(dataset, cMnr, cMnc, debug):
+def __bibitSequential(oContext, cMnr, cMnc, debug, vertical, extension):
     
-    aResultCols = np.zeros((maxPatterns, dataset.data.shape[1]), dtype=np.uint64)
-    patFiltered = np.zeros(maxPatterns, dtype=np.longlong)
+    totalPatterns = oContext.maxPatterns + len(oContext.selfPatterns)
+    aResultCols = np.zeros((totalPatterns, oContext.data.shape[1]), dtype=np.uint64)
+    patFiltered = np.zeros(totalPatterns, dtype=np.longlong)
     
     # 1) Get patterns
-    __getPatternsSequential(dataset, cMnc, aResultCols, patFiltered)
+    __getPatternsSequential(oContext, cMnc, aResultCols, patFiltered)
+    __addSelfPatterns(oContext, aResultCols, patFiltered)
 
     # 2) Remove duplicate patterns
     patFiltered, aResultCols = __removeDuplicatePatterns(aResultCols, patFiltered)
 
     # 3) Generate biclusters
-    oModel = __getBiclusters(dataset, cMnr, aResultCols, patFiltered, debug)        
+    oModel = __getBiclusters(oContext, cMnr, aResultCols, patFiltered, debug, vertical, extension)
     
     return oModel
 
-def __getPatternsSequential(dataset, cMnc, aResultCols, patFiltered):
+def __getPatternsSequential(oContext, cMnc, aResultCols, patFiltered):
+    rows = oContext.data.shape[0]
     idPattern = 0
     idValidPattern = 0
-    for r1 in range(dataset.data.shape[0]):        
-        for r2 in range(r1 + 1, dataset.data.shape[0]):
-            
-            totalOnes = 0
-            rAnd = dataset.data[r1] & dataset.data[r2]
-            
-            for iDigit in rAnd:
-                totalOnes += bin(iDigit)[2:].count('1')
-            
-            if(totalOnes >= cMnc):
-                aResultCols[idPattern] = rAnd                    
-                patFiltered[idValidPattern] = idPattern+1                 
-                idValidPattern += 1                
-            
-            idPattern += 1
-
-def __removeDuplicatePatterns(aResultCols, patFiltered):
-    aResultColsWithout0 = aResultCols[~np.all(aResultCols == 0, axis=1)]
-    uniqueValues, counts = np.unique(aResultColsWithout0, return_counts=True, axis = 0)
-    duplicatedRows = uniqueValues[counts > 1]
-    
-    if duplicatedRows.size > 0:        
-        duplicatePositions = []
-        for value in duplicatedRows:
-            positions = np.where(aResultCols == value)[0][1:]
-            duplicatePositions.extend(positions)
+    for r1 in range(rows):
+        # AND of r1 with every following row and vectorized popcount (lookup table)
+        rAnd = oContext.data[r1] & oContext.data[r1 + 1:]
+        validPairs = np.flatnonzero(popcountRows(rAnd) >= cMnc)
         
-        duplicatePositions = np.array(duplicatePositions)
-        if duplicatePositions.size > 0:
-            aResultCols[duplicatePositions] = 0
-            duplicatePositions += 1
-            for num in duplicatePositions:
-                patFiltered[patFiltered == num] = 0
+        aResultCols[idPattern + validPairs] = rAnd[validPairs]
+        patFiltered[idValidPattern:idValidPattern + validPairs.size] = idPattern + validPairs + 1
+        idValidPattern += validPairs.size
         
-    posZeros = np.where(patFiltered == 0)[0]    
-    if len(posZeros) > 0:
-        patFiltered = np.delete(patFiltered,posZeros)
-        
-    posMinus1 = np.where(patFiltered == -1)[0]
-    if len(posMinus1) > 0:
-        patFiltered = np.delete(patFiltered,posMinus1)
+        idPattern += rows - r1 - 1
+
+def __removeDuplicatePatterns(aResultCols, patFiltered):
+    # Hash-based deduplication (O(P log P)): keep the first occurrence of every distinct pattern
+    patFiltered = patFiltered[patFiltered > 0]
+    patFiltered = patFiltered[uniqueRows(aResultCols, patFiltered - 1)]
     
     return patFiltered, aResultCols
 
-def __getBiclusters(dataset, cMnr, aResultCols, patFiltered, debug):
+def __getBiclusters(oContext, cMnr, aResultCols, patFiltered, debug, vertical, extension):
     
-    oBiBit = BiclusteringModel()        
-    for pat in patFiltered: 
+    oBiBit = BiclusteringModel()
+    rows = oContext.data.shape[0]
+    useVertical = np.zeros(len(patFiltered), dtype=np.bool_)
+    if vertical is not None:
+        useVertical = __useVertical(aResultCols, patFiltered - 1, rows, extension)
+    
+    # Columns of every pattern (CSR)
+    colsPtr, colsIndices = patternsToCols(aResultCols[patFiltered - 1], oContext.original.shape[1])
+    
+    for i, pat in enumerate(patFiltered): 
         rPattern = aResultCols[pat-1]
-        aRows = np.where(((dataset.data & rPattern) == rPattern).all(axis=1))[0]
+        positionsCols = colsIndices[colsPtr[i]:colsPtr[i + 1]]
+        if useVertical[i]: # AND of the row-bitsets of the pattern columns
+            aRows = patternToCols(np.bitwise_and.reduce(vertical.matrix[positionsCols], axis=0), rows)
+        else: # Test every row
+            aRows = np.where(((oContext.data & rPattern) == rPattern).all(axis=1))[0]
         
         if(aRows.size >= cMnr):
             
             if debug == False:
-                                
-                # Get columns
-                binaryReprArray = np.array(list(np.binary_repr(rPattern[0])), dtype=int)
-                zerosDifference = dataset.original.shape[1] - binaryReprArray.size # Conseguir el número de 0s que faltan por completar a la izquierda
-                positionsCols = np.where(binaryReprArray == 1)[0]
-                positionsCols += zerosDifference
-                
-                # Add bicluster to model
                 oBiBit.results.add(Bicluster(aRows, cols=positionsCols))
-            
             else:
                 oBiBit.results.add(Bicluster(aRows))
     
@@ -198,21 +591,23 @@ def __getBiclusters(dataset, cMnr, aResultCols, patFiltered, debug):
 #############################
 # BiBit NUMBA CPU algorithm #
 #############################
-def __bibitNumbaCpu(dataset, cMnr, cMnc, debug):   
+def __bibitNumbaCpu(oContext, cMnr, cMnc, debug, vertical, extension):   
     
     warnings.filterwarnings("ignore", category=NumbaWarning)     
     set_num_threads(os.cpu_count())
     
-    aResultCols = np.zeros((maxPatterns, dataset.data.shape[1]), dtype=np.uint64)
-    patFiltered = np.zeros(maxPatterns, dtype=np.longlong)
+    totalPatterns = oContext.maxPatterns + len(oContext.selfPatterns)
+    aResultCols = np.zeros((totalPatterns, oContext.data.shape[1]), dtype=np.uint64)
+    patFiltered = np.zeros(totalPatterns, dtype=np.longlong)
     
-    __getPatternsNumbaCpu(dataset.data, cMnc, aResultCols, patFiltered)
+    __getPatternsNumbaCpu(oContext.data, cMnc, aResultCols, patFiltered)
+    __addSelfPatterns(oContext, aResultCols, patFiltered)
     patFiltered = patFiltered[patFiltered != 0]
     patFiltered, aResultCols = __removeDuplicatePatterns(aResultCols, patFiltered)
     
-    biclusters = __generateBiclustersNumbaCpu(dataset.data, aResultCols, patFiltered)
+    biclusters = __generateBiclustersNumbaCpu(oContext.data, aResultCols, patFiltered, vertical, extension)
     
-    oBiBit = __storeResults(dataset, biclusters, aResultCols, patFiltered, cMnr, debug)
+    oBiBit = __storeResults(oContext, biclusters, aResultCols, patFiltered, cMnr, debug)
 
     return oBiBit
 
@@ -223,95 +618,572 @@ def __getPatternsNumbaCpu(data, cMnc, aResultCols, patFiltered):
     idValidPattern = 0
     for r1 in prange(rows):        
         for r2 in prange(r1 + 1, rows):
-            idPattern = (rows - 1) * r1 - (r1 * (r1 - 1) // 2) + (r2 - r1 - 1)
-            totalOnes = 0
-            rAnd = data[r1] & data[r2]
-                        
-            totalOnes = 0
-            for n in rAnd:
-                count = 0
-                while n:
-                    count += n & 1
-                    n >>= 1
-                totalOnes += count
+            idPattern = rowsToPair(r1, r2, rows)
+            totalOnes = popcountAnd(data[r1], data[r2])
 
             if(totalOnes >= cMnc):
-                aResultCols[idPattern] = rAnd                    
+                aResultCols[idPattern] = data[r1] & data[r2]
                 patFiltered[idPattern] = idPattern+1
                                     
-@njit(parallel=True)
-def __generateBiclustersNumbaCpu(data, aResultCols, patFiltered):
-    maxBiclusters = len(patFiltered)
-    biclusters = np.zeros((maxBiclusters, data.shape[0]), dtype=np.uint8)
-    for i in prange(maxBiclusters):
-        pat = patFiltered[i]-1
-        for j in prange(data.shape[0]):
-            if np.array_equal(data[j] & aResultCols[pat], aResultCols[pat]):
-                biclusters[i, j] = 1           
-                         
-    return biclusters
-
-def __storeResults(dataset, biclusters, aResultCols, patFiltered, cMnr, debug):
+def __generateBiclustersNumbaCpu(data, aResultCols, patFiltered, vertical, extension):
+    # Row-bitset of the rows of each pattern (horizontal or vertical evaluation per pattern)
+    useVertical = None
+    if vertical is not None:
+        useVertical = __useVertical(aResultCols, patFiltered - 1, data.shape[0], extension)
+    
+    return supportRows(data, aResultCols, patFiltered - 1, __verticalMatrix(vertical, useVertical), useVertical)
+
+def __storeResults(oContext, biclusters, aResultCols, patFiltered, cMnr, debug, bNumba = True):
     oBiBit = BiclusteringModel()
     
-    for i in range(len(patFiltered)):
-        pat = patFiltered[i]-1
-        rowsBiclusters = np.nonzero(biclusters[i])[0]        
-        if(len(rowsBiclusters) >= cMnr):
+    # Rows and columns of every bicluster (CSR)
+    rowsPtr, rowsIndices = patternsToCols(biclusters, oContext.data.shape[0], bNumba)
+    if debug == False:
+        colsPtr, colsIndices = patternsToCols(aResultCols[patFiltered - 1], oContext.original.shape[1], bNumba)
+    
+    for i in np.flatnonzero(np.diff(rowsPtr) >= cMnr):
+        rowsBiclusters = rowsIndices[rowsPtr[i]:rowsPtr[i + 1]]
+        if debug == False:
+            oBiBit.results.add(Bicluster(rowsBiclusters, cols=colsIndices[colsPtr[i]:colsPtr[i + 1]]))
+        else:
+            oBiBit.results.add(Bicluster(rowsBiclusters))
+
+    return oBiBit
+
+###################################################
+# BiBit sparse algorithm (column inverted lists) #
+###################################################
+def __bibitSparse(oContext, indptr, indices, cols, cMnr, cMnc, mode, debug, vertical, extension):
+    
+    if mode == 2:
+        warnings.filterwarnings("ignore", category=NumbaWarning)     
+        set_num_threads(os.cpu_count())
+    
+    # 1) Row pairs that share at least cMnc columns (only the pairs that share a column are counted)
+    pairsR1, pairsR2 = __getPairsSparse(indptr, indices, cols, cMnc, mode == 2)
+    oContext.candidatePairs = len(pairsR1)
+    
+    # 2) Unique patterns of the candidate pairs, in tiles sized to the available memory
+    rows, words = oContext.data.shape
+    availableMemory = __availableMemory()
+    memoryLimit = int(availableMemory * MEMORY_FRACTION) if availableMemory is not None else STREAM_MEMORY_LIMIT
+    tileSize, _ = __tilePlan(rows, words, memoryLimit - len(pairsR1) * 16)
+    oPatterns = PatternSet(words)
+    for tileStart in range(0, len(pairsR1), tileSize):
+        tileR1, tileR2 = pairsR1[tileStart:tileStart + tileSize], pairsR2[tileStart:tileStart + tileSize]
+        oPatterns.add(oContext.data[tileR1] & oContext.data[tileR2])
+    del pairsR1, pairsR2
+    
+    # 3) Generate biclusters
+    return __getBiclustersTiled(oContext, cMnr, oPatterns.patterns, mode, memoryLimit, debug, vertical, extension)
+
+def __getPairsSparse(indptr, indices, cols, cMnc, parallel = True):
+    rows = len(indptr) - 1
+    
+    # Inverted lists: rows (in ascending order) of every column
+    colPtr = np.zeros(cols + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=cols), out=colPtr[1:])
+    colRows = np.repeat(np.arange(rows, dtype=np.int64), np.diff(indptr))[np.argsort(indices, kind="stable")]
+    
+    # Blocks of first rows (each one reuses a co-occurrence accumulator), a single block without parallelism
+    blocks = np.linspace(0, rows, min(rows, 8 * get_num_threads() if parallel else 1) + 1).astype(np.int64)
+    countKernel, fillKernel = (__countPairsSparseKernel, __fillPairsSparseKernel) if parallel else (__countPairsSparseSequential, __fillPairsSparseSequential)
+    counts = np.zeros(rows, dtype=np.int64)
+    countKernel(indptr, indices, colPtr, colRows, cMnc, blocks, counts)
+    offsets = np.zeros(rows + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    pairsR1 = np.empty(offsets[-1], dtype=np.int64)
+    pairsR2 = np.empty(offsets[-1], dtype=np.int64)
+    fillKernel(indptr, indices, colPtr, colRows, cMnc, blocks, offsets, pairsR1, pairsR2)
+    return pairsR1, pairsR2
+
+@njit
+def __coOccurrences(r1, indptr, indices, colPtr, colRows, acc, touched):
+    # Shared columns (acc) of r1 with every following row that shares at least one, and those rows (touched)
+    nTouched = 0
+    for k in range(indptr[r1], indptr[r1 + 1]):
+        c = indices[k]
+        start = colPtr[c] + np.searchsorted(colRows[colPtr[c]:colPtr[c + 1]], r1, side="right")
+        for q in range(start, colPtr[c + 1]):
+            r2 = colRows[q]
+            if acc[r2] == 0:
+                touched[nTouched] = r2
+                nTouched += 1
+            acc[r2] += 1
+    return nTouched
+
+@njit(parallel=True)
+def __countPairsSparseKernel(indptr, indices, colPtr, colRows, cMnc, blocks, counts):
+    rows = len(indptr) - 1
+    for b in prange(len(blocks) - 1):
+        acc = np.zeros(rows, dtype=np.int64)
+        touched = np.empty(rows, dtype=np.int64)
+        for r1 in range(blocks[b], blocks[b + 1]):
+            nTouched = __coOccurrences(r1, indptr, indices, colPtr, colRows, acc, touched)
+            for t in range(nTouched):
+                if acc[touched[t]] >= cMnc:
+                    counts[r1] += 1
+                acc[touched[t]] = 0
+
+@njit(parallel=True)
+def __fillPairsSparseKernel(indptr, indices, colPtr, colRows, cMnc, blocks, offsets, pairsR1, pairsR2):
+    rows = len(indptr) - 1
+    for b in prange(len(blocks) - 1):
+        acc = np.zeros(rows, dtype=np.int64)
+        touched = np.empty(rows, dtype=np.int64)
+        for r1 in range(blocks[b], blocks[b + 1]):
+            nTouched = __coOccurrences(r1, indptr, indices, colPtr, colRows, acc, touched)
+            pos = offsets[r1]
+            for t in range(nTouched):
+                if acc[touched[t]] >= cMnc:
+                    pairsR1[pos] = r1
+                    pairsR2[pos] = touched[t]
+                    pos += 1
+                acc[touched[t]] = 0
+
+# Same kernels without parallelism (mode=1): prange runs as range
+__countPairsSparseSequential = njit(__countPairsSparseKernel.py_func)
+__fillPairsSparseSequential = njit(__fillPairsSparseKernel.py_func)
+
+##########################################
+# BiBit tiled algorithm (bounded memory) #
+##########################################
+def __bibitTiled(oContext, cMnr, cMnc, mode, memoryLimit, debug, vertical, extension, checkpoint):
+    
+    if mode == 2:
+        warnings.filterwarnings("ignore", category=NumbaWarning)     
+        set_num_threads(os.cpu_count())
+    
+    rows, words = oContext.data.shape
+    tileSize, patternsLimit = __tilePlan(rows, words, memoryLimit)
+    
+    # 1) Get patterns tile by tile, keeping only the unique patterns that pass cMnc
+    oPatterns = PatternSet(words)
+    oPatterns.add(oContext.selfPatterns)
+    fingerprint = __checkpointFingerprint(oContext, cMnc)
+    pairsDone = __loadCheckpoint(checkpoint, fingerprint, oPatterns)
+    lastSave = time.perf_counter()
+    bWarning = False
+    maxPatterns = oContext.maxPatterns
+    for tileStart in range(pairsDone, maxPatterns, tileSize):
+        tileEnd = min(tileStart + tileSize, maxPatterns)
+        if mode == 2:
+            tilePatterns = __getPatternsTileNumbaCpu(oContext.data, cMnc, tileStart, tileEnd)
+        else:
+            tilePatterns = __getPatternsTileSequential(oContext.data, cMnc, tileStart, tileEnd)
+        
+        oPatterns.add(tilePatterns)
+        if len(oPatterns) > patternsLimit and not bWarning:
+            warnings.warn("BiBit: the unique patterns found exceed the memory limit (" + str(memoryLimit) + " bytes).", ResourceWarning)
+            bWarning = True
+        
+        if checkpoint is not None and (tileEnd == maxPatterns or time.perf_counter() - lastSave >= CHECKPOINT_INTERVAL):
+            __saveCheckpoint(checkpoint, fingerprint, tileEnd, oPatterns)
+            lastSave = time.perf_counter()
+    
+    # 2) Generate biclusters pattern chunk by pattern chunk
+    return __getBiclustersTiled(oContext, cMnr, oPatterns.patterns, mode, memoryLimit, debug, vertical, extension)
+
+def __getBiclustersTiled(oContext, cMnr, aResultCols, mode, memoryLimit, debug, vertical, extension):
+    # Biclusters of unique patterns, with the row-bitsets of mode=2 built in chunks sized to memoryLimit
+    patFiltered = np.arange(1, aResultCols.shape[0] + 1, dtype=np.longlong)
+    if mode == 2:
+        oBiBit = BiclusteringModel()
+        chunkSize = max(1, (memoryLimit // 2) // (wordsPerRow(oContext.data.shape[0]) * 8))
+        for chunkStart in range(0, len(patFiltered), chunkSize):
+            patChunk = patFiltered[chunkStart:chunkStart + chunkSize]
+            biclusters = __generateBiclustersNumbaCpu(oContext.data, aResultCols, patChunk, vertical, extension)
+            oBiBit.results.update(__storeResults(oContext, biclusters, aResultCols, patChunk, cMnr, debug).results)
+    else:
+        oBiBit = __getBiclusters(oContext, cMnr, aResultCols, patFiltered, debug, vertical, extension)
+    
+    return oBiBit
+
+def __checkpointFingerprint(oContext, cMnc):
+    # Dataset (hash of the row hashes) and parameters that define the patterns kept (pairsDone is a pair index: any tile size continues from it)
+    data, selfPatterns = oContext.data, oContext.selfPatterns
+    dataHash = hashRows(hashRows(data)[None, :])[0] if data.shape[0] > 0 else 0
+    selfHash = hashRows(hashRows(selfPatterns)[None, :])[0] if selfPatterns.shape[0] > 0 else 0
+    return np.array([data.shape[0], data.shape[1], cMnc, dataHash, selfHash], dtype=np.uint64)
+
+def __loadCheckpoint(checkpoint, fingerprint, oPatterns):
+    # Row pairs already processed (the unique patterns found are added to oPatterns)
+    if checkpoint is None or not os.path.isfile(os.path.join(checkpoint, CHECKPOINT_FILE)):
+        return 0
+    
+    with np.load(os.path.join(checkpoint, CHECKPOINT_FILE)) as oCheckpoint:
+        if not np.array_equal(oCheckpoint["fingerprint"], fingerprint):
+            warnings.warn("BiBit: the checkpoint in " + str(checkpoint) + " belongs to another dataset or parameters, it is ignored.")
+            return 0
+        oPatterns.add(oCheckpoint["patterns"])
+        return int(oCheckpoint["pairsDone"])
+
+def __saveCheckpoint(checkpoint, fingerprint, pairsDone, oPatterns):
+    # Atomic replacement: an interrupted save keeps the previous checkpoint
+    os.makedirs(checkpoint, exist_ok=True)
+    pathTmp = os.path.join(checkpoint, CHECKPOINT_FILE + ".tmp")
+    with open(pathTmp, "wb") as fCheckpoint:
+        np.savez(fCheckpoint, fingerprint=fingerprint, pairsDone=np.int64(pairsDone), patterns=oPatterns.patterns)
+    os.replace(pathTmp, os.path.join(checkpoint, CHECKPOINT_FILE))
+
+def __tilePlan(rows, words, memoryLimit):
+    # Bytes per row pair of a tile: AND result, popcount intermediates and bookkeeping.
+    bytesPerPair = words * 12 + 16
+    availableMemory = memoryLimit - rows * words * 8 # The packed matrix is always in memory
+    if availableMemory // 2 < MIN_TILE_PAIRS * bytesPerPair:
+        raise ValueError("BiBit: the memory limit (" + str(memoryLimit) + " bytes) cannot hold the packed matrix (" + str(rows * words * 8) + " bytes) and a tile of " + str(MIN_TILE_PAIRS) + " row pairs (" + str(2 * MIN_TILE_PAIRS * bytesPerPair) + " bytes).")
+    
+    tileSize = (availableMemory // 2) // bytesPerPair # Half of the budget for the current tile
+    patternsLimit = max(1, (availableMemory // 2) // (words * 8)) # The other half for the unique patterns
+    return int(tileSize), int(patternsLimit)
+
+def __getPatternsTileSequential(data, cMnc, tileStart, tileEnd):
+    rows = data.shape[0]
+    r1, r2 = pairToRows(tileStart, rows)
+    pattern = tileStart
+    lPatterns = []
+    while pattern < tileEnd:
+        r2End = min(rows, r2 + tileEnd - pattern)
+        rAnd = data[r1] & data[r2:r2End]
+        lPatterns.append(rAnd[popcountRows(rAnd) >= cMnc])
+        pattern += r2End - r2
+        r1 += 1
+        r2 = r1 + 1
+    
+    return np.concatenate(lPatterns)
+
+def __getPatternsTileNumbaCpu(data, cMnc, tileStart, tileEnd):
+    tilePatterns = np.zeros((tileEnd - tileStart, data.shape[1]), dtype=np.uint64)
+    validPatterns = np.zeros(tileEnd - tileStart, dtype=np.bool_)
+    __getPatternsTileKernel(data, cMnc, tileStart, tilePatterns, validPatterns)
+    return tilePatterns[validPatterns]
+
+@njit(parallel=True)
+def __getPatternsTileKernel(data, cMnc, tileStart, tilePatterns, validPatterns):
+    rows = data.shape[0]
+    for t in prange(tilePatterns.shape[0]):
+        r1, r2 = pairToRows(tileStart + t, rows)
+        if popcountAnd(data[r1], data[r2]) >= cMnc:
+            tilePatterns[t] = data[r1] & data[r2]
+            validPatterns[t] = True
+
+###################################
+# BiBit streaming (tiles of pairs) #
+###################################
+def __streamBiclusters(data, cMnc, memoryLimit, vertical, extension):
+    # New unique patterns of each tile of row pairs and their row-bitsets, in chunks sized to memoryLimit
+    rows, words = data.shape
+    totalPairs = pairCount(rows)
+    tileSize, _ = __tilePlan(rows, words, memoryLimit)
+    chunkSize = max(1, (memoryLimit // 2) // (wordsPerRow(rows) * 8))
+    
+    oPatterns = PatternSet(words)
+    for tileStart in range(0, totalPairs, tileSize):
+        tileEnd = min(tileStart + tileSize, totalPairs)
+        newPatterns = oPatterns.add(__getPatternsTileNumbaCpu(data, cMnc, tileStart, tileEnd))
+        for chunkStart in range(0, len(newPatterns), chunkSize):
+            chunkPatterns = newPatterns[chunkStart:chunkStart + chunkSize]
+            index = np.arange(len(chunkPatterns))
+            useVertical = __useVertical(chunkPatterns, index, rows, extension) if vertical is not None else None
+            yield chunkPatterns, supportRows(data, chunkPatterns, index, __verticalMatrix(vertical, useVertical), useVertical)
+
+#################################################
+# BiBit process pool (shared-memory packed data) #
+#################################################
+def __bibitProcesses(oContext, cMnr, cMnc, debug, processes, memoryLimit, checkpoint):
+    
+    rows, words = oContext.data.shape
+    shardSize = SHARD_SIZE
+    if memoryLimit is not None:
+        shardSize = min(shardSize, __tilePlan(rows, words, memoryLimit // processes)[0])
+    
+    # The packed matrix is shared with the workers (never pickled)
+    sharedData = shared_memory.SharedMemory(create=True, size=max(1, oContext.data.nbytes))
+    try:
+        np.ndarray(oContext.data.shape, dtype=np.uint64, buffer=sharedData.buf)[:] = oContext.data
+        with processContext([__name__]).Pool(processes, initializer=__initProcess, initargs=(sharedData.name, oContext.data.shape)) as pool:
             
-            if debug == False:         
-                vectorized_bin = np.vectorize(bin)
-                binaryReprArray = vectorized_bin(aResultCols[pat])
-                binaryReprArray = np.array(list(map(lambda s: s[2:], binaryReprArray)))
-                totalBits = sum(len(s) for s in binaryReprArray)
-                
-                # Get columns
-                zerosDifference = dataset.original.shape[1] - totalBits # Conseguir el número de 0s que faltan por completar a la izquierda
-                binaryReprArray = np.array([list(binary_string) for binary_string in binaryReprArray])
-                positionsCols = np.where(binaryReprArray == '1')[1]
-                positionsCols += zerosDifference
-                
-                # Add bicluster to model
-                oBiBit.results.add(Bicluster(rowsBiclusters, cols=positionsCols))
+            # 1) Get patterns shard by shard and merge the unique ones
+            oPatterns = PatternSet(words)
+            oPatterns.add(oContext.selfPatterns)
+            fingerprint = __checkpointFingerprint(oContext, cMnc)
+            pairsDone = __loadCheckpoint(checkpoint, fingerprint, oPatterns)
+            lastSave = time.perf_counter()
+            maxPatterns = oContext.maxPatterns
+            aShards = [(shardStart, min(shardStart + shardSize, maxPatterns), cMnc) for shardStart in range(pairsDone, maxPatterns, shardSize)]
+            for (shardStart, shardEnd, _), shardPatterns in zip(aShards, pool.imap(__getPatternsShard, aShards)):
+                oPatterns.add(shardPatterns)
+                if checkpoint is not None and (shardEnd == maxPatterns or time.perf_counter() - lastSave >= CHECKPOINT_INTERVAL):
+                    __saveCheckpoint(checkpoint, fingerprint, shardEnd, oPatterns)
+                    lastSave = time.perf_counter()
             
-            else:
-                oBiBit.results.add(Bicluster(rowsBiclusters))
+            # 2) Generate biclusters pattern chunk by pattern chunk
+            aResultCols = oPatterns.patterns
+            patFiltered = np.arange(1, aResultCols.shape[0] + 1, dtype=np.longlong)
+            chunkSize = max(1, -(-len(patFiltered) // (processes * 4)))
+            aChunks = [aResultCols[chunkStart:chunkStart + chunkSize] for chunkStart in range(0, len(patFiltered), chunkSize)]
+            oBiBit = BiclusteringModel()
+            for chunkStart, biclusters in zip(range(0, len(patFiltered), chunkSize), pool.imap(__getBiclustersShard, aChunks)):
+                patChunk = patFiltered[chunkStart:chunkStart + chunkSize]
+                oBiBit.results.update(__storeResults(oContext, biclusters, aResultCols, patChunk, cMnr, debug).results)
+    finally:
+        sharedData.close()
+        sharedData.unlink()
+    
+    return oBiBit
+
+def __initProcess(name, shape):
+    # Worker: attach to the shared packed matrix
+    global sharedProcessData, sharedProcessMemory
+    sharedProcessMemory = shared_memory.SharedMemory(name=name)
+    sharedProcessData = np.ndarray(shape, dtype=np.uint64, buffer=sharedProcessMemory.buf)
+
+def __getPatternsShard(shard):
+    # Worker: unique patterns with at least cMnc columns of the row pairs [shardStart, shardEnd)
+    shardStart, shardEnd, cMnc = shard
+    shardPatterns = __getPatternsTileSequential(sharedProcessData, cMnc, shardStart, shardEnd)
+    return np.unique(shardPatterns, axis=0)
+
+def __getBiclustersShard(patterns):
+    # Worker: row-bitset of the rows that contain each pattern
+    return __supportRowsNumpy(sharedProcessData, patterns)
 
+def __supportRowsNumpy(data, patterns):
+    # Row-bitset of the rows that contain each pattern (NumPy broadcasting in steps of SHARD_SIZE cells)
+    support = np.zeros((len(patterns), wordsPerRow(data.shape[0])), dtype=np.uint64)
+    step = max(1, SHARD_SIZE // max(1, data.size))
+    for start in range(0, len(patterns), step):
+        chunk = patterns[start:start + step]
+        bRows = ((data[None, :, :] & chunk[:, None, :]) == chunk[:, None, :]).all(axis=2)
+        support[start:start + step] = packRows(bRows)
+    return support
+
+###################################
+# BiBit NumPy batched algorithm #
+###################################
+def __bibitNumpy(oContext, cMnr, cMnc, debug, memoryLimit):
+    
+    data = oContext.data
+    rows, words = data.shape
+    
+    # Blocks of consecutive first rows with at most blockPairs row pairs (AND result, popcount intermediates and indices)
+    blockPairs = max(1, (memoryLimit // 2) // (words * 24 + 32))
+    pairsEnd = np.cumsum(np.arange(rows - 1, 0, -1, dtype=np.int64))
+    
+    # 1) Get patterns block by block: AND broadcast, lookup table popcount and cMnc mask
+    lPatterns = [oContext.selfPatterns]
+    r1Start = 0
+    while r1Start < rows - 1:
+        pairsStart = pairsEnd[r1Start - 1] if r1Start > 0 else 0
+        r1End = max(r1Start + 1, int(np.searchsorted(pairsEnd, pairsStart + blockPairs, side="right")))
+        r1, r2 = __pairsBlock(rows, r1Start, r1End)
+        rAnd = data[r1] & data[r2]
+        lPatterns.append(np.unique(rAnd[popcountRows(rAnd) >= cMnc], axis=0))
+        r1Start = r1End
+    
+    # 2) Remove duplicate patterns
+    aResultCols = np.unique(np.concatenate(lPatterns), axis=0)
+    
+    # 3) Generate biclusters pattern chunk by pattern chunk
+    oBiBit = BiclusteringModel()
+    chunkSize = max(1, (memoryLimit // 2) // max(1, rows * words * 16))
+    for chunkStart in range(0, aResultCols.shape[0], chunkSize):
+        chunkPatterns = aResultCols[chunkStart:chunkStart + chunkSize]
+        support = __supportRowsNumpy(data, chunkPatterns)
+        patChunk = np.arange(1, chunkPatterns.shape[0] + 1, dtype=np.longlong)
+        oBiBit.results.update(__storeResults(oContext, support, chunkPatterns, patChunk, cMnr, debug, False).results)
+    
     return oBiBit
 
+def __pairsBlock(rows, r1Start, r1End):
+    # Row pairs (r1, r2) with r1Start <= r1 < r1End and r1 < r2, in pair index order
+    counts = rows - 1 - np.arange(r1Start, r1End, dtype=np.int64)
+    r1 = np.repeat(np.arange(r1Start, r1End, dtype=np.int64), counts)
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    r2 = np.arange(len(r1), dtype=np.int64) - offsets + r1 + 1
+    return r1, r2
+
+#####################################
+# BiBit multi-level (nested levels) #
+#####################################
+def __nestedLevels(listDatasets):
+    # Every level must be contained in the previous (denser) one
+    for oDense, oSparse in zip(listDatasets, listDatasets[1:]):
+        if np.any((oSparse.data != 0) & (oDense.data == 0)):
+            return False
+    return True
+
+def __getPairsLevel(data, cMnc):
+    rows = data.shape[0]
+    counts = np.zeros(rows, dtype=np.int64)
+    __countPairsLevelKernel(data, cMnc, counts)
+    offsets = np.zeros(rows + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    pairsR1 = np.empty(offsets[-1], dtype=np.int64)
+    pairsR2 = np.empty(offsets[-1], dtype=np.int64)
+    __fillPairsLevelKernel(data, cMnc, offsets, pairsR1, pairsR2)
+    return pairsR1, pairsR2
+
+@njit(parallel=True)
+def __countPairsLevelKernel(data, cMnc, counts):
+    rows = data.shape[0]
+    for r1 in prange(rows):
+        for r2 in range(r1 + 1, rows):
+            if popcountAnd(data[r1], data[r2]) >= cMnc:
+                counts[r1] += 1
+
+@njit(parallel=True)
+def __fillPairsLevelKernel(data, cMnc, offsets, pairsR1, pairsR2):
+    rows = data.shape[0]
+    for r1 in prange(rows):
+        pos = offsets[r1]
+        for r2 in range(r1 + 1, rows):
+            if popcountAnd(data[r1], data[r2]) >= cMnc:
+                pairsR1[pos] = r1
+                pairsR2[pos] = r2
+                pos += 1
+
+@njit(parallel=True)
+def __filterPairsLevel(data, cMnc, pairsR1, pairsR2):
+    bValid = np.zeros(pairsR1.shape[0], dtype=np.bool_)
+    for i in prange(pairsR1.shape[0]):
+        bValid[i] = popcountAnd(data[pairsR1[i]], data[pairsR2[i]]) >= cMnc
+    return bValid
+
+##########################################
+# BiBit closed pattern engine (LCM-style) #
+##########################################
+def __bibitClosed(oContext, cMnr, cMnc, debug, vertical):
+    
+    data = oContext.data
+    rows = data.shape[0]
+    cols, rowWords = vertical.shape
+    minSupport = max(cMnr, 2) # BiBit biclusters always come from a pair of rows
+    oBiBit = BiclusteringModel()
+    if rows < minSupport:
+        return oBiBit
+    
+    # Root: all rows and the columns shared by all of them
+    allRows = packRows(np.ones((1, rows), dtype=np.uint8))[0]
+    rootItems, _ = __rowsClosure(data, allRows)
+    __addClosedBicluster(oBiBit, rootItems, allRows, rows, cols, cMnc, debug)
+    
+    # Children of a node (buffers of the whole run, the children are copied before the next node)
+    childCores = np.empty(cols, dtype=np.int64)
+    childTids = np.empty((cols, rowWords), dtype=np.uint64)
+    childItems = np.empty((cols, data.shape[1]), dtype=np.uint64)
+    
+    # Depth-first prefix-preserving closure extension
+    stack = [(rootItems, allRows, -1)]
+    while stack:
+        items, tids, core = stack.pop()
+        numChildren = __closedChildren(data, vertical, tids, items, core, minSupport, cMnc, childCores, childTids, childItems)
+        for k in range(numChildren):
+            __addClosedBicluster(oBiBit, childItems[k], childTids[k], rows, cols, cMnc, debug)
+            stack.append((childItems[k].copy(), childTids[k].copy(), childCores[k]))
+    
+    return oBiBit
+
+def __addClosedBicluster(oBiBit, items, tids, rows, cols, cMnc, debug):
+    numItems = int(popcountRows(items[None, :])[0])
+    if numItems >= cMnc and numItems > 0:
+        aRows = patternToCols(tids, rows)
+        if debug == False:
+            oBiBit.results.add(Bicluster(aRows, cols=patternToCols(items, cols)))
+        else:
+            oBiBit.results.add(Bicluster(aRows))
+
+@njit
+def __closedChildren(data, vertical, tids, items, core, minSupport, cMnc, childCores, childTids, childItems):
+    cols, rowWords = vertical.shape
+    colPad = data.shape[1] * 64 - cols
+    
+    # Only the columns present in at least two rows of the node can extend it
+    _, candidates = __rowsClosure(data, tids)
+    
+    numChildren = 0
+    for e in range(core + 1, cols):
+        w = (colPad + e) >> 6
+        bit = np.uint64(1) << np.uint64(63 - ((colPad + e) & 63))
+        if (candidates[w] & bit) == 0 or (items[w] & bit) != 0:
+            continue
+        
+        # Rows of items + {e}
+        newTids = tids & vertical[e]
+        support = 0
+        for q in range(rowWords):
+            support += popcount64(newTids[q])
+        if support < minSupport:
+            continue
+        
+        # Closure (AND of the new rows) and columns present in at least two of them
+        closure, twice = __rowsClosure(data, newTids)
+        
+        # Prefix-preserving check: the closure adds no column before e (the higher bits of word w)
+        bPrefix = True
+        for q in range(w + 1):
+            diff = closure[q] ^ items[q]
+            if q == w:
+                diff &= ~((bit << np.uint64(1)) - np.uint64(1))
+            if diff != 0:
+                bPrefix = False
+                break
+        if not bPrefix:
+            continue
+        
+        # Upper bound of the columns of any pattern in this branch (cMnc pruning)
+        bound = 0
+        for q in range(twice.shape[0]):
+            bound += popcount64(twice[q])
+        if bound < cMnc:
+            continue
+        
+        childCores[numChildren] = e
+        childTids[numChildren] = newTids
+        childItems[numChildren] = closure
+        numChildren += 1
+    
+    return numChildren
+
+@njit
+def __rowsClosure(data, tids):
+    # Columns present in all the rows of a packed set of rows (AND of the horizontal rows) and columns present in at least two of them
+    rows, colWords = data.shape
+    rowPad = tids.shape[0] * 64 - rows
+    closure = np.full(colWords, ~np.uint64(0), dtype=np.uint64)
+    once = np.zeros(colWords, dtype=np.uint64)
+    twice = np.zeros(colWords, dtype=np.uint64)
+    for q in range(tids.shape[0]):
+        word = tids[q]
+        if word == 0:
+            continue
+        for t in range(64):
+            if (word >> np.uint64(63 - t)) & np.uint64(1):
+                r = q * 64 + t - rowPad
+                for k in range(colWords):
+                    twice[k] |= once[k] & data[r, k]
+                    once[k] |= data[r, k]
+                    closure[k] &= data[r, k]
+    return closure, twice
+
 #############################
 # BiBit NUMBA GPU algorithm #
 #############################
 @cuda.jit
-def __getPatterns(maxPatterns, aResultCols, id, bicsPerGpuPrevious, mInputData, totalPatterns, patternsPerRun, iter, totalFor, mnc, maxThreadsPerBlock):
+def __getPatterns(maxPatterns, aResultCols, id, bicsPerGpuPrevious, mInputData, totalPatterns, patternsPerRun, iter, totalFor, mnc, maxThreadsPerBlock, rowsDataset, colsDataset):
     idTh = cuda.blockIdx.x * cuda.blockDim.x + cuda.threadIdx.x
     pattern = np.longlong(idTh + (totalFor * (iter - 1)) + (id * bicsPerGpuPrevious) + totalPatterns)
     patternCols = np.longlong(idTh + (totalFor * maxThreadsPerBlock * (iter - 1)))
     
     if patternCols < patternsPerRun and pattern < maxPatterns:
-        r1 = 0
-        r2 = -1
-        auxPat = pattern - rowsDataset + 1
-        if auxPat < 0:
-            r2 = auxPat + rowsDataset
-        j = rowsDataset - 2
-        while(r2 == -1):
-            auxPat = auxPat - j
-            r1 += 1
-            if auxPat < 0:
-                r2 = (j + auxPat) + (r1 + 1)
-            j -= 1
+        r1, r2 = pairToRowsGpu(pattern, rowsDataset)
 
         if r1 < rowsDataset and r2 < rowsDataset:
             totalOnes = 0
             for j in range(colsDataset):
                 rAnd = mInputData[r1][j] & mInputData[r2][j]
                 aResultCols[patternCols][j] = rAnd
-            
-                while rAnd:
-                    if(rAnd & 1 == 1):
-                        totalOnes += 1
-                    rAnd >>= 1
+                totalOnes += popcount64Gpu(rAnd)
 
             if totalOnes < mnc:
                 for j in range(colsDataset):
@@ -320,7 +1192,7 @@ def __getPatterns(maxPatterns, aResultCols, id, bicsPerGpuPrevious, mInputData,
     pass
 
 @cuda.jit
-def __generateBiclusters(aResultCols, mInputData, aResult, iter, totalFor, numPatFiltered, maxThreadsPerBlock):
+def __generateBiclusters(aResultCols, mInputData, aResult, iter, totalFor, numPatFiltered, maxThreadsPerBlock, rowsDataset, colsDataset):
     idTh = np.longlong(cuda.blockIdx.x * cuda.blockDim.x + cuda.threadIdx.x + (totalFor * maxThreadsPerBlock * (iter - 1)))
     patternArray = idTh // rowsDataset
     row = idTh % rowsDataset
@@ -339,7 +1211,7 @@ def __generateBiclusters(aResultCols, mInputData, aResult, iter, totalFor, numPa
     pass
 
 @cuda.jit
-def __generateBiclusters_no_out(aResultCols, mInputData, iter, totalFor, numPatFiltered, maxThreadsPerBlock, totalBiclusters, mnr):
+def __generateBiclusters_no_out(aResultCols, mInputData, iter, totalFor, numPatFiltered, maxThreadsPerBlock, totalBiclusters, mnr, rowsDataset, colsDataset):
     idTh = np.longlong(cuda.blockIdx.x * cuda.blockDim.x + cuda.threadIdx.x + (totalFor * maxThreadsPerBlock * (iter - 1)))
     if idTh < numPatFiltered:
         numRows = 0
@@ -366,8 +1238,7 @@ def __prepareGpu1D(i, lNumber):
     maxThreadsCurrentGpu = gpuDevice.MAX_THREADS_PER_BLOCK
     maxGridSize = gpuDevice.MAX_GRID_DIM_Y
     
-    global lastBlocksGrid, maxIteratorGPU, maxThreadsPerBlock, maxBlocksPerGrid
-    
+    # Launch configuration of the calling thread (each device thread has its own)
     lastBlocksGrid = 1
     maxIteratorGPU = 0
     maxThreadsPerBlock = lNumber  # Case 1: 0 < lNumber <= maxThreadsCurrentGpu
@@ -387,25 +1258,20 @@ def __prepareGpu1D(i, lNumber):
             lastBlocksGrid = maxBlocksPerGrid - (maxIteratorGPU * maxGridSize)
             maxBlocksPerGrid = maxGridSize
     
-    lastBlocksGrid = int(lastBlocksGrid)
-    maxIteratorGPU = int(maxIteratorGPU)
-    maxThreadsPerBlock = int(maxThreadsPerBlock)
-    maxBlocksPerGrid = int(maxBlocksPerGrid)
+    return int(lastBlocksGrid), int(maxIteratorGPU), int(maxThreadsPerBlock), int(maxBlocksPerGrid)
     
-def __bibitNumbaGpu(dataset, cMnr, cMnc, deviceCount, debug):
+def __bibitNumbaGpu(oContext, cMnr, cMnc, deviceCount, debug):
     
     # 1) Prepare large-scale data (chunks) for GPUs
     warnings.filterwarnings("ignore", category=NumbaWarning)
-    global rowsDataset, colsDataset, colsOriginalDataset, s, setPatterns64
-    setPatterns64 = set()
     s = [cuda.stream() for _ in range(deviceCount)]
     chunks = np.empty(deviceCount, dtype=np.uint64)
     patternsPerRun = np.empty(deviceCount, dtype=np.uint64)
+    maxPatterns = oContext.maxPatterns
     bicsPerGpu = maxPatterns // deviceCount
     restBiclustersLastGpu = maxPatterns % deviceCount
-    rowsDataset = dataset.data.shape[0]
-    colsDataset = dataset.data.shape[1]
-    colsOriginalDataset = dataset.original.shape[1]
+    rowsDataset = oContext.data.shape[0]
+    colsDataset = oContext.data.shape[1]
     
     for i in range(deviceCount):            
         gpuDevice = cuda.select_device(i)
@@ -432,11 +1298,11 @@ def __bibitNumbaGpu(dataset, cMnr, cMnc, deviceCount, debug):
        
     for i in range(deviceCount):
         gpuDevice = cuda.select_device(i)
-        mInputData = cuda.to_device(np.ascontiguousarray(dataset.data))
+        mInputData = cuda.to_device(np.ascontiguousarray(oContext.data))
         if i > 0:
             bicsPerGpuPrevious += np.longlong(chunks[i - 1] * patternsPerRun[i - 1])
         
-        t = threading.Thread(target=threadsPerDevice_64, args=(resultsQueue, i, s[i], chunks[i], bicsPerGpuPrevious, patternsPerRun[i], mInputData, m, cMnr, cMnc, debug))
+        t = threading.Thread(target=threadsPerDevice_64, args=(oContext, resultsQueue, i, s[i], chunks[i], bicsPerGpuPrevious, patternsPerRun[i], mInputData, m, cMnr, cMnc, debug))
         t.start()
         threads.append(t)
     
@@ -450,11 +1316,13 @@ def __bibitNumbaGpu(dataset, cMnr, cMnc, deviceCount, debug):
     
     return oBiBit
 
-def threadsPerDevice_64(resultsQueue, i, s, chunks, bicsPerGpuPrevious, patternsPerRun, mInputData, m, cMnr, cMnc, debug):
+def threadsPerDevice_64(oContext, resultsQueue, i, s, chunks, bicsPerGpuPrevious, patternsPerRun, mInputData, m, cMnr, cMnc, debug):
     """
     Function used for the creation of a multi-GPU architecture.
     """
     gpuDevice = cuda.select_device(i)
+    maxPatterns = oContext.maxPatterns
+    rowsDataset, colsDataset = oContext.data.shape
     totalPatterns = np.uint64(0)
     totalBiclusters = cuda.to_device(np.array([0], dtype=np.uint64))
     sumBiclusters = 0
@@ -463,17 +1331,18 @@ def threadsPerDevice_64(resultsQueue, i, s, chunks, bicsPerGpuPrevious, patterns
         aResultCols = cuda.to_device(np.zeros((patternsPerRun,colsDataset), dtype=np.uint64))            
         
         # 1) Generate total patterns
-        __prepareGpu1D(i, patternsPerRun)
+        lastBlocksGrid, maxIteratorGPU, maxThreadsPerBlock, maxBlocksPerGrid = __prepareGpu1D(i, patternsPerRun)
         if(patternsPerRun != 0):
             with s.auto_synchronize():
                 for it in range(1, maxIteratorGPU + 1):
-                    __getPatterns[maxBlocksPerGrid, maxThreadsPerBlock, s](maxPatterns, aResultCols, i, bicsPerGpuPrevious, mInputData, totalPatterns, patternsPerRun, it, maxThreadsPerBlock*maxBlocksPerGrid, cMnc, maxThreadsPerBlock)
-                __getPatterns[lastBlocksGrid, maxThreadsPerBlock, s](maxPatterns, aResultCols, i, bicsPerGpuPrevious, mInputData, totalPatterns, patternsPerRun, maxIteratorGPU+1, maxThreadsPerBlock*maxBlocksPerGrid, cMnc, maxThreadsPerBlock)
+                    __getPatterns[maxBlocksPerGrid, maxThreadsPerBlock, s](maxPatterns, aResultCols, i, bicsPerGpuPrevious, mInputData, totalPatterns, patternsPerRun, it, maxThreadsPerBlock*maxBlocksPerGrid, cMnc, maxThreadsPerBlock, rowsDataset, colsDataset)
+                __getPatterns[lastBlocksGrid, maxThreadsPerBlock, s](maxPatterns, aResultCols, i, bicsPerGpuPrevious, mInputData, totalPatterns, patternsPerRun, maxIteratorGPU+1, maxThreadsPerBlock*maxBlocksPerGrid, cMnc, maxThreadsPerBlock, rowsDataset, colsDataset)
     
-        # 2) Remove duplicate patterns
+        # 2) Remove duplicate patterns (also those found by previous chunks or other devices)
         aResultColsCpu = aResultCols.copy_to_host()        
         aResultColsCpu = aResultColsCpu[~np.all(aResultColsCpu == 0, axis=1)]
-        aResultColsCpu = np.unique(aResultColsCpu, axis = 0)
+        with m:
+            aResultColsCpu = oContext.setPatterns64.add(aResultColsCpu)
         cpuNumPatFiltered = len(aResultColsCpu)
                 
         del aResultCols
@@ -484,17 +1353,17 @@ def threadsPerDevice_64(resultsQueue, i, s, chunks, bicsPerGpuPrevious, patterns
         if(cpuNumPatFiltered != 0):
             if(debug == False):
                 aResult = cuda.to_device(np.full((patternsPerRun,rowsDataset), 0, dtype=np.uint8))
-                __prepareGpu1D(i, cpuNumPatFiltered * rowsDataset)  
+                lastBlocksGrid, maxIteratorGPU, maxThreadsPerBlock, maxBlocksPerGrid = __prepareGpu1D(i, cpuNumPatFiltered * rowsDataset)  
                 with s.auto_synchronize():
                     for it in range(1, maxIteratorGPU + 1):
-                        __generateBiclusters[maxBlocksPerGrid, maxThreadsPerBlock,s](aResultCols, mInputData, aResult, it, maxBlocksPerGrid, cpuNumPatFiltered, maxThreadsPerBlock)
-                    __generateBiclusters[lastBlocksGrid, maxThreadsPerBlock,s](aResultCols, mInputData, aResult, maxIteratorGPU+1, maxBlocksPerGrid, cpuNumPatFiltered, maxThreadsPerBlock)
+                        __generateBiclusters[maxBlocksPerGrid, maxThreadsPerBlock,s](aResultCols, mInputData, aResult, it, maxBlocksPerGrid, cpuNumPatFiltered, maxThreadsPerBlock, rowsDataset, colsDataset)
+                    __generateBiclusters[lastBlocksGrid, maxThreadsPerBlock,s](aResultCols, mInputData, aResult, maxIteratorGPU+1, maxBlocksPerGrid, cpuNumPatFiltered, maxThreadsPerBlock, rowsDataset, colsDataset)
             else:
-                __prepareGpu1D(i, cpuNumPatFiltered)
+                lastBlocksGrid, maxIteratorGPU, maxThreadsPerBlock, maxBlocksPerGrid = __prepareGpu1D(i, cpuNumPatFiltered)
                 with s.auto_synchronize():
                     for it in range(1, maxIteratorGPU + 1):
-                        __generateBiclusters_no_out[maxBlocksPerGrid, maxThreadsPerBlock,s](aResultCols, mInputData, it, maxBlocksPerGrid, cpuNumPatFiltered, maxThreadsPerBlock, totalBiclusters, cMnr)
-                    __generateBiclusters_no_out[lastBlocksGrid, maxThreadsPerBlock,s](aResultCols, mInputData, maxIteratorGPU+1, maxBlocksPerGrid, cpuNumPatFiltered, maxThreadsPerBlock, totalBiclusters, cMnr)
+                        __generateBiclusters_no_out[maxBlocksPerGrid, maxThreadsPerBlock,s](aResultCols, mInputData, it, maxBlocksPerGrid, cpuNumPatFiltered, maxThreadsPerBlock, totalBiclusters, cMnr, rowsDataset, colsDataset)
+                    __generateBiclusters_no_out[lastBlocksGrid, maxThreadsPerBlock,s](aResultCols, mInputData, maxIteratorGPU+1, maxBlocksPerGrid, cpuNumPatFiltered, maxThreadsPerBlock, totalBiclusters, cMnr, rowsDataset, colsDataset)
         
         # 4) Save biclusters
         aResultColsCpu = aResultCols.copy_to_host()
@@ -502,37 +1371,14 @@ def threadsPerDevice_64(resultsQueue, i, s, chunks, bicsPerGpuPrevious, patterns
         cpuNumPatFiltered = len(aResultColsCpu)
         
         oBiBit = BiclusteringModel()
-        if(debug == False):
+        if(debug == False and cpuNumPatFiltered != 0):
             aResultCpu = aResult.copy_to_host()
+            colsPtr, colsIndices = patternsToCols(aResultColsCpu, oContext.original.shape[1])
             for iIndex in range(cpuNumPatFiltered):  
                 aRows = np.where(aResultCpu[iIndex] == 1)[0] # Rows of bicluster
-                if(aRows.size >= cMnr):                    
-                        aCols = np.array([], dtype=np.int64) # Cols of bicluster                    
-                        j = colsDataset - 1
-                        while j >= 0:
-                            binaryReprArray = bin(aResultColsCpu[iIndex][j])[2:]
-                                                
-                            if colsDataset == 1:
-                                if(len(binaryReprArray) < colsOriginalDataset):
-                                    binaryReprArray = binaryReprArray.zfill((colsOriginalDataset - len(binaryReprArray))+len(binaryReprArray))
-                            else:
-                                colsSaveBicluster = colsOriginalDataset - (64*(colsDataset-1))              
-                                if j > 0:
-                                    colsSaveBicluster = colsSaveBicluster + (64*j)                                                                                    
-                                
-                                colsSaveBicluster -= len(binaryReprArray)
-                                binaryReprArray = binaryReprArray.zfill(colsSaveBicluster+len(binaryReprArray))
-                            
-                            positionsCols = [iCont for iCont, caracter in enumerate(binaryReprArray) if caracter == "1"]
-
-                            
-                            if len(positionsCols) > 0:
-                                aCols = np.concatenate((aCols, positionsCols))                            
-                                
-                            j -= 1
-                    
-                        # Add bicluster to model
-                        oBiBit.results.add(Bicluster(aRows, cols=aCols))
+                if(aRows.size >= cMnr):
+                    # Add bicluster to model
+                    oBiBit.results.add(Bicluster(aRows, cols=colsIndices[colsPtr[iIndex]:colsPtr[iIndex + 1]]))
         else:
             cpuTotalBiclusters = totalBiclusters.copy_to_host()[0] 
             sumBiclusters += cpuTotalBiclusters
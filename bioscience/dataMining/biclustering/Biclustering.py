@@ -3,7 +3,7 @@ from .Bcca import *
 from bioscience.base import *
 
 # BiBit algorithm
-def bibit(dataset, cMnr = 2, cMnc = 2, deviceCount = 1, mode = 1, debug = False):
+def bibit(dataset, cMnr = 2, cMnc = 2, deviceCount = 1, mode = 1, debug = False, memoryLimit = None, extension = "auto", engine = "pairs", multiLevel = False, processes = None, checkpoint = None, prune = False, collapse = False, levelProcesses = None, sparse = False):
     """
     Main function processing the BiBit Biclustering algorithm.
     
@@ -19,37 +19,73 @@ def bibit(dataset, cMnr = 2, cMnc = 2, deviceCount = 1, mode = 1, debug = False)
     :param deviceCount: Number of GPU devices to execute, defaults to 1.
     :type deviceCount: int, optional
     
-    :param mode: Type of execution of the algorithm: `mode=1` for sequential execution, `mode=2` for parallel execution on CPUs and `mode=3` for execution on a multi-GPU architecture. Defaults to 1.
+    :param mode: Type of execution of the algorithm: `mode=1` for sequential execution, `mode=2` for parallel execution on CPUs, `mode=3` for execution on a multi-GPU architecture, `mode=4` for parallel execution on a pool of processes that share the packed dataset (no global NUMBA thread pool) and `mode=5` for batched execution with NumPy only (no NUMBA compilation). Defaults to 1.
     :type mode: int, optional
     
     :param mode: Attribute used to run the algorithm in debug mode, defaults to False
     :type mode: boolean, optional
     
-    :return: A set of BiclusteringModel objects that stores all biclusters generated by the BiBit algorithm.
-    :rtype: set(:class:`bioscience.base.models.BiclusteringModel`)
+    :param memoryLimit: Memory budget (in bytes) for `mode=1`, `mode=2` and `mode=5`. The row pairs are processed in tiles so that the peak memory does not grow with the square of the number of rows. A ValueError is raised if the budget cannot hold the packed matrix and a tile of MIN_TILE_PAIRS row pairs, defaults to None (all row pairs at once, or blocks of 1 GB with `mode=5`).
+    :type memoryLimit: int, optional
+    
+    :param extension: Row extension strategy of `mode=1` and `mode=2`: `"horizontal"` tests every row against each pattern, `"vertical"` uses a transposed index with one row-bitset per column and `"auto"` picks the cheaper one per pattern, defaults to "auto".
+    :type extension: str, optional
+    
+    :param engine: Pattern generation engine: `"pairs"` enumerates every pair of rows (classic BiBit, run with `mode`) and `"closed"` mines the closed column patterns directly (LCM-style), which scales with the number of maximal biclusters instead of the square of the rows. The closed engine also returns the maximal biclusters that are not the AND of exactly two rows, defaults to "pairs".
+    :type engine: str, optional
+    
+    :param multiLevel: If `dataset` is the set of levels generated by `bs.binarizeLevels`, mine all levels together on CPU, reusing the row pairs discarded in denser levels to prune the sparser ones (see :func:`processBiBitLevels`). It returns one model per level, in the order of :func:`bioscience.base.parallel.sortLevels`, defaults to False.
+    :type multiLevel: boolean, optional
+    
+    :param processes: Number of worker processes of `mode=4`, defaults to None (number of CPUs).
+    :type processes: int, optional
+    
+    :param checkpoint: Directory used to save the progress of `mode=1`, `mode=2` (always tiled when a checkpoint is used) and `mode=4`. A run interrupted before finishing continues from the last checkpoint when it is executed again with the same dataset and parameters, even if the memory available (and so the size of the tiles) has changed. It is ignored, with a warning, by the other modes and the `"closed"` engine, defaults to None (no checkpoint).
+    :type checkpoint: str, optional
+    
+    :param prune: Remove the rows with fewer than `cMnc` ones and the columns with fewer than 2 ones (repeated until nothing else can be removed) before the pairs of rows are enumerated. The biclusters are the same as without pruning and keep the indices of the original dataset, defaults to False.
+    :type prune: boolean, optional
+    
+    :param collapse: Group the identical rows before the pairs of rows are enumerated (`mode=1`, `mode=2`, `mode=4` and `mode=5`): only the pairs of distinct rows are evaluated and each bicluster is expanded back to all the identical rows. The biclusters found are the same. It is ignored, with a warning, by the other modes and the `"closed"` engine, defaults to False.
+    :type collapse: boolean, optional
+    
+    :param sparse: For very sparse binary datasets (`mode=1` and `mode=2`), count the shared columns only for the row pairs that share a column, using the inverted lists of the columns, and extract the patterns only for the pairs that share at least `cMnc` columns. `dataset.data` can also be a `scipy.sparse` matrix (for example, `bs.Dataset(csr)`). If the density is above SPARSE_DENSITY (or another option needs it), the dense path is used with a warning, defaults to False.
+    :type sparse: boolean, optional
+    
+    :param levelProcesses: If `dataset` is a set of datasets (for example, the levels generated by `bs.binarizeLevels`), number of worker processes that run the levels in parallel (see :func:`bioscience.base.parallel.processLevels`). It is not used with `multiLevel` or `mode=4`, defaults to None (the levels are run one after another).
+    :type levelProcesses: int, optional
+    
+    :return: A list of BiclusteringModel objects that stores all biclusters generated by the BiBit algorithm, one per dataset (in the order of :func:`bioscience.base.parallel.sortLevels` when `dataset` is a set).
+    :rtype: list(:class:`bioscience.base.models.BiclusteringModel`)
     """
-    listModels = set()
+    listModels = []
     if dataset is not None:
-        if dataset.data.dtype != "uint64":
+        if isinstance(dataset, Dataset) and dataset.data.dtype != "uint64":
             dataset.data = dataset.data.astype(np.uint64)
         if isinstance(dataset, Dataset):
-            oModel = processBiBit(dataset, cMnr, cMnc, deviceCount, mode, debug)
-            listModels.add(oModel)
+            oModel = processBiBit(dataset, cMnr, cMnc, deviceCount, mode, debug, memoryLimit, extension, engine, processes, checkpoint, prune, collapse, sparse)
+            listModels.append(oModel)
             
-        if isinstance(dataset, set):
+        if isinstance(dataset, set) and multiLevel == True:
+            listModels.extend(processBiBitLevels(dataset, cMnr, cMnc, debug, extension))
+        elif isinstance(dataset, set) and levelProcesses is not None and mode != 4:
+            listModels = processLevels(processBiBit, dataset, (cMnr, cMnc, deviceCount, mode, debug, memoryLimit, extension, engine, processes, checkpoint, prune, collapse, sparse), levelProcesses)
+        elif isinstance(dataset, set):
+            if levelProcesses is not None:
+                warnings.warn("BiBit: mode=4 already runs on a pool of processes, the levels are processed one after another.")
             iLevel = 1
-            for oDataset in dataset:
+            for oDataset in sortLevels(dataset):
                 print("\nLEVEL: ",str(iLevel))
-                oModel = processBiBit(oDataset, cMnr, cMnc, deviceCount, mode, debug)
-                listModels.add(oModel)
+                oModel = processBiBit(oDataset, cMnr, cMnc, deviceCount, mode, debug, memoryLimit, extension, engine, processes, checkpoint, prune, collapse, sparse)
+                listModels.append(oModel)
                 iLevel += 1
     
     return listModels
 
-# BCCA algorithm
-def bcca(dataset, correlationThreshold = 0.7, minCols = 3, deviceCount = 1, mode = 1, debug = False):
+# BiBit streaming
+def bibitIter(dataset, cMnr = 2, cMnc = 2, memoryLimit = None, extension = "auto"):
     """
-    Main function processing the BiBit Biclustering algorithm.
+    Main function processing the BiBit Biclustering algorithm as a generator: the biclusters are yielded while the row pairs are processed (tile by tile, in parallel on CPU), so they can be saved with a streaming writer such as :func:`bioscience.base.files.saveResultsIndexStream` without keeping all of them in memory.
     
     :param dataset: The dataset object store the data of input file.
     :type dataset: :class:`bioscience.base.models.Dataset`
@@ -60,31 +96,108 @@ def bcca(dataset, correlationThreshold = 0.7, minCols = 3, deviceCount = 1, mode
     :param cMnc: Minimum number of columns to build a valid bicluster, defaults to 2.
     :type cMnc: int, optional
     
+    :param memoryLimit: Memory budget (in bytes) of the tiles of row pairs and patterns, defaults to None (1 GB).
+    :type memoryLimit: int, optional
+    
+    :param extension: Row extension strategy: `"horizontal"`, `"vertical"` or `"auto"` (see :func:`bibit`), defaults to "auto".
+    :type extension: str, optional
+    
+    :return: The biclusters generated by the BiBit algorithm, one by one.
+    :rtype: Iterator[:class:`bioscience.base.models.Bicluster`]
+    """
+    if dataset is not None:
+        if dataset.data.dtype != "uint64":
+            dataset.data = dataset.data.astype(np.uint64)
+        yield from processBiBitIter(dataset, cMnr, cMnc, memoryLimit, extension)
+
+# BiBit statistics
+def bibitStats(dataset, cMnr = 2, cMnc = 2, memoryLimit = None, extension = "auto"):
+    """
+    Main function computing the number of biclusters of the BiBit Biclustering algorithm and the joint histogram of their sizes (rows, columns) without building the biclusters. It runs in parallel on CPU over tiles of row pairs with bounded memory, so it can be used to explore `cMnr` and `cMnc` before running :func:`bibit`.
+    
+    :param dataset: The dataset object store the data of input file.
+    :type dataset: :class:`bioscience.base.models.Dataset`
+    
+    :param cMnr: Minimum number of rows to build a valid bicluster, defaults to 2.
+    :type cMnr: int, optional
+    
+    :param cMnc: Minimum number of columns to build a valid bicluster, defaults to 2.
+    :type cMnc: int, optional
+    
+    :param memoryLimit: Memory budget (in bytes) of the tiles of row pairs and patterns, defaults to None (1 GB).
+    :type memoryLimit: int, optional
+    
+    :param extension: Row counting strategy: `"horizontal"`, `"vertical"` or `"auto"` (see :func:`bibit`), defaults to "auto".
+    :type extension: str, optional
+    
+    :return: A list of BiclusteringStatsModel objects with the statistics of the biclusters of each dataset (in the order of :func:`bioscience.base.parallel.sortLevels` when `dataset` is a set).
+    :rtype: list(:class:`bioscience.base.models.BiclusteringStatsModel`)
+    """
+    listModels = []
+    if dataset is not None:
+        if isinstance(dataset, Dataset) and dataset.data.dtype != "uint64":
+            dataset.data = dataset.data.astype(np.uint64)
+        if isinstance(dataset, Dataset):
+            oModel = processBiBitStats(dataset, cMnr, cMnc, memoryLimit, extension)
+            listModels.append(oModel)
+            
+        if isinstance(dataset, set):
+            iLevel = 1
+            for oDataset in sortLevels(dataset):
+                print("\nLEVEL: ",str(iLevel))
+                oModel = processBiBitStats(oDataset, cMnr, cMnc, memoryLimit, extension)
+                listModels.append(oModel)
+                iLevel += 1
+    
+    return listModels
+
+# BCCA algorithm
+def bcca(dataset, correlationThreshold = 0.7, minCols = 3, deviceCount = 1, mode = 1, debug = False, levelProcesses = None, skipSeeds = False):
+    """
+    Main function processing the BCCA Biclustering algorithm.
+    
+    :param dataset: The dataset object store the data of input file.
+    :type dataset: :class:`bioscience.base.models.Dataset`
+    
+    :param correlationThreshold: Minimum absolute Pearson correlation between the rows of a bicluster, defaults to 0.7.
+    :type correlationThreshold: float, optional
+    
+    :param minCols: Minimum number of columns to build a valid bicluster, defaults to 3.
+    :type minCols: int, optional
+    
     :param deviceCount: Number of GPU devices to execute, defaults to 1.
     :type deviceCount: int, optional
     
-    :param mode: Type of execution of the algorithm: `mode=1` for sequential execution, `mode=2` for parallel execution on CPUs and `mode=3` for execution on a multi-GPU architecture. Defaults to 1.
+    :param mode: Type of execution of the algorithm: `mode=1` for sequential execution, `mode=2` for parallel execution on CPUs (one seed pair per NUMBA thread, the duplicate biclusters are merged at the end of each block of seed pairs) and `mode=3` for execution on a multi-GPU architecture (to be developed). Defaults to 1.
     :type mode: int, optional
     
-    :param mode: Attribute used to run the algorithm in debug mode, defaults to False
-    :type mode: boolean, optional
+    :param debug: Attribute used to run the algorithm in debug mode, defaults to False
+    :type debug: boolean, optional
     
-    :return: A set of BiclusteringModel objects that stores all biclusters generated by the BiBit algorithm.
-    :rtype: set(:class:`bioscience.base.models.BiclusteringModel`)
+    :param levelProcesses: If `dataset` is a set of datasets, number of worker processes that run the levels in parallel (see :func:`bioscience.base.parallel.processLevels`), defaults to None (the levels are run one after another).
+    :type levelProcesses: int, optional
+    
+    :param skipSeeds: Fast mode: a seed pair is not processed when both rows are members of a bicluster already accepted whose columns keep them correlated (with `mode=2`, the biclusters accepted in the previous blocks of seed pairs). Fewer biclusters are returned, defaults to False (every seed pair is processed).
+    :type skipSeeds: boolean, optional
+    
+    :return: A list of BiclusteringModel objects that stores all biclusters generated by the BCCA algorithm, one per dataset (in the order of :func:`bioscience.base.parallel.sortLevels` when `dataset` is a set).
+    :rtype: list(:class:`bioscience.base.models.BiclusteringModel`)
     """
-    listModels = set()
+    listModels = []
     if dataset is not None:
 
         if isinstance(dataset, Dataset):
-            oModel = processBcca(dataset, correlationThreshold, minCols, deviceCount, mode, debug)
-            listModels.add(oModel)
+            oModel = processBcca(dataset, correlationThreshold, minCols, deviceCount, mode, debug, skipSeeds)
+            listModels.append(oModel)
             
-        if isinstance(dataset, set):
+        if isinstance(dataset, set) and levelProcesses is not None:
+            listModels = processLevels(processBcca, dataset, (correlationThreshold, minCols, deviceCount, mode, debug, skipSeeds), levelProcesses)
+        elif isinstance(dataset, set):
             iLevel = 1
-            for oDataset in dataset:
+            for oDataset in sortLevels(dataset):
                 print("\nLEVEL: ",str(iLevel))
-                oModel = processBcca(oDataset, correlationThreshold, minCols, deviceCount, mode, debug)
-                listModels.add(oModel)
+                oModel = processBcca(oDataset, correlationThreshold, minCols, deviceCount, mode, debug, skipSeeds)
+                listModels.append(oModel)
                 iLevel += 1
     
     return listModels
\ No newline at end of file
@@ -0,0 +1,490 @@
+import numpy as np
+from numba import cuda, njit, prange
+
+PATTERN_SIZE = 64 # 64 bits per word
+
+# Lookup table with the number of ones of every 16-bit value (NumPy popcount)
+POPCOUNT_TABLE = np.unpackbits(np.arange(1 << 16, dtype=">u2").view(np.uint8).reshape(-1, 2), axis=1).sum(axis=1).astype(np.uint8)
+
+# SWAR masks (NUMBA popcount)
+__M1 = np.uint64(0x5555555555555555)
+__M2 = np.uint64(0x3333333333333333)
+__M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+__H01 = np.uint64(0x0101010101010101)
+
+def wordsPerRow(cols):
+    """
+    Number of 64-bit words needed to pack a row with `cols` binary columns.
+
+    :param cols: Number of binary columns of the row.
+    :type cols: int
+
+    :return: Number of 64-bit words.
+    :rtype: int
+    """
+    return (int(cols) + PATTERN_SIZE - 1) // PATTERN_SIZE
+
+def packRows(data, parallel = False):
+    """
+    Pack a binary matrix into 64-bit words. Each row is read as a big-endian bit string zero-filled on the left up to a multiple of 64 bits, so column 0 is the most significant bit of the row (the layout used by BiBit). Any non-zero value is considered a one.
+
+    :param data: Binary matrix with shape (rows, cols).
+    :type data: np.array
+
+    :param parallel: Use the NUMBA CPU kernel instead of the NumPy (`np.packbits`) implementation, defaults to False.
+    :type parallel: boolean, optional
+
+    :return: Packed matrix with shape (rows, words) and dtype uint64.
+    :rtype: np.array
+    """
+    data = np.asarray(data)
+    rows, cols = data.shape
+    words = wordsPerRow(cols)
+    pad = words * PATTERN_SIZE - cols
+
+    if parallel:
+        packed = np.zeros((rows, words), dtype=np.uint64)
+        __packRowsNumba(np.ascontiguousarray(data), pad, packed)
+        return packed
+
+    bits = np.zeros((rows, words * PATTERN_SIZE), dtype=np.uint8)
+    bits[:, pad:] = data != 0
+    return np.packbits(bits, axis=1).view(">u8").astype(np.uint64)
+
+@njit(parallel=True)
+def __packRowsNumba(data, pad, packed):
+    rows, cols = data.shape
+    for r in prange(rows):
+        for c in range(cols):
+            if data[r, c] != 0:
+                pos = pad + c
+                packed[r, pos // 64] |= np.uint64(1) << np.uint64(63 - (pos % 64))
+
+def packSparseRows(indptr, indices, cols):
+    """
+    Pack a binary matrix in CSR format into 64-bit words, with the same layout as :func:`packRows` and without building the dense matrix.
+
+    :param indptr: Row pointers (CSR) with length rows + 1.
+    :type indptr: np.array
+
+    :param indices: Columns of the ones of every row (CSR).
+    :type indices: np.array
+
+    :param cols: Number of columns of the binary matrix.
+    :type cols: int
+
+    :return: Packed matrix with shape (rows, words) and dtype uint64.
+    :rtype: np.array
+    """
+    words = wordsPerRow(cols)
+    packed = np.zeros((len(indptr) - 1, words), dtype=np.uint64)
+    __packSparseRowsNumba(np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64), words * PATTERN_SIZE - cols, packed)
+    return packed
+
+@njit(parallel=True)
+def __packSparseRowsNumba(indptr, indices, pad, packed):
+    for r in prange(packed.shape[0]):
+        for k in range(indptr[r], indptr[r + 1]):
+            pos = pad + indices[k]
+            packed[r, pos // 64] |= np.uint64(1) << np.uint64(63 - (pos % 64))
+
+def unpackRows(packed, cols):
+    """
+    Inverse of :func:`packRows`: expand a packed matrix into a binary matrix.
+
+    :param packed: Packed matrix with shape (rows, words) and dtype uint64.
+    :type packed: np.array
+
+    :param cols: Number of columns of the original binary matrix.
+    :type cols: int
+
+    :return: Binary matrix with shape (rows, cols) and dtype uint8.
+    :rtype: np.array
+    """
+    packed = np.atleast_2d(np.asarray(packed, dtype=np.uint64))
+    pad = packed.shape[1] * PATTERN_SIZE - cols
+    bits = np.unpackbits(packed.astype(">u8").view(np.uint8), axis=1)
+    return bits[:, pad:]
+
+def patternToCols(pattern, cols):
+    """
+    Column indices of the ones stored in a packed pattern.
+
+    :param pattern: Packed pattern (one row of words) with dtype uint64.
+    :type pattern: np.array
+
+    :param cols: Number of columns of the original binary matrix.
+    :type cols: int
+
+    :return: Sorted column indices whose bit is set.
+    :rtype: np.array
+    """
+    return np.flatnonzero(unpackRows(pattern, cols)[0])
+
+def patternsToCols(patterns, cols, parallel = True):
+    """
+    Batched version of :func:`patternToCols`: column indices of the ones of many packed patterns in CSR format (`indices[indptr[i]:indptr[i+1]]` are the columns of pattern `i`). A NUMBA kernel walks the set bits of each word, so the cost depends on the number of ones and not on the width of the patterns.
+
+    :param patterns: Packed patterns with shape (k, words) and dtype uint64.
+    :type patterns: np.array
+
+    :param cols: Number of columns of the original binary matrix.
+    :type cols: int
+
+    :param parallel: Use the NUMBA CPU kernel instead of the NumPy (`np.unpackbits`) implementation, defaults to True.
+    :type parallel: boolean, optional
+
+    :return: CSR row pointers (k + 1 values) and sorted column indices of every pattern.
+    :rtype: tuple(np.array, np.array)
+    """
+    patterns = np.ascontiguousarray(np.atleast_2d(np.asarray(patterns, dtype=np.uint64)))
+    indptr = np.zeros(patterns.shape[0] + 1, dtype=np.int64)
+    np.cumsum(popcountRows(patterns), out=indptr[1:])
+    if not parallel:
+        return indptr, np.nonzero(unpackRows(patterns, cols))[1].astype(np.int64)
+
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    __patternsToColsKernel(patterns, patterns.shape[1] * PATTERN_SIZE - cols, indptr, indices)
+    return indptr, indices
+
+@njit(parallel=True)
+def __patternsToColsKernel(patterns, pad, indptr, indices):
+    for i in prange(patterns.shape[0]):
+        # Lowest set bit first is the highest column first: fill each pattern from the end
+        pos = indptr[i + 1]
+        for k in range(patterns.shape[1] - 1, -1, -1):
+            w = patterns[i, k]
+            while w != 0:
+                lowBit = w & (~w + np.uint64(1))
+                pos -= 1
+                indices[pos] = k * 64 + 63 - popcount64(lowBit - np.uint64(1)) - pad
+                w ^= lowBit
+
+def popcountRows(packed):
+    """
+    Number of ones of each packed row using a 16-bit lookup table (NumPy only).
+
+    :param packed: Packed pattern(s) with shape (words,) or (rows, words) and dtype uint64.
+    :type packed: np.array
+
+    :return: Number of ones per row (a scalar for a single pattern).
+    :rtype: np.array
+    """
+    packed = np.ascontiguousarray(packed, dtype=np.uint64)
+    return POPCOUNT_TABLE[packed.view(np.uint16)].sum(axis=-1, dtype=np.int64)
+
+@njit(inline="always")
+def popcount64(x):
+    """
+    Number of ones of a 64-bit word (SWAR algorithm, compiled to a hardware popcount by LLVM where available). It can only be called from NUMBA CPU code.
+    """
+    x = np.uint64(x)
+    x = x - ((x >> np.uint64(1)) & __M1)
+    x = (x & __M2) + ((x >> np.uint64(2)) & __M2)
+    x = (x + (x >> np.uint64(4))) & __M4
+    return np.int64((x * __H01) >> np.uint64(56))
+
+@njit(inline="always")
+def popcountAnd(a, b):
+    """
+    Number of ones of the AND of two packed rows without building the intermediate row. It can only be called from NUMBA CPU code.
+    """
+    total = 0
+    for k in range(a.shape[0]):
+        total += popcount64(a[k] & b[k])
+    return total
+
+@cuda.jit(device=True)
+def popcount64Gpu(x):
+    """
+    Number of ones of a 64-bit word using the hardware popcount of CUDA devices. It can only be called from NUMBA CUDA kernels.
+    """
+    return cuda.popc(x)
+
+def hashRows(packed, index = None):
+    """
+    64-bit hash of each packed row (NUMBA CPU parallel). Equal rows always have equal hashes.
+
+    :param packed: Packed matrix with shape (rows, words) and dtype uint64.
+    :type packed: np.array
+
+    :param index: Rows of `packed` to hash, defaults to None (all rows).
+    :type index: np.array, optional
+
+    :return: Hash of each selected row with dtype uint64.
+    :rtype: np.array
+    """
+    if index is None:
+        index = np.arange(packed.shape[0], dtype=np.int64)
+    hashes = np.empty(len(index), dtype=np.uint64)
+    __hashRowsKernel(packed, np.asarray(index, dtype=np.int64), hashes)
+    return hashes
+
+@njit(parallel=True)
+def __hashRowsKernel(packed, index, hashes):
+    for i in prange(index.shape[0]):
+        hashes[i] = __hashRow(packed[index[i]])
+
+@njit(inline="always")
+def __hashRow(row):
+    # splitmix64 finalizer applied word by word
+    h = np.uint64(0x9E3779B97F4A7C15)
+    for k in range(row.shape[0]):
+        h ^= row[k]
+        h ^= h >> np.uint64(30)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(27)
+        h *= np.uint64(0x94D049BB133111EB)
+        h ^= h >> np.uint64(31)
+    return h
+
+@njit(inline="always")
+def __equalRows(a, b):
+    for k in range(a.shape[0]):
+        if a[k] != b[k]:
+            return False
+    return True
+
+def uniqueRows(packed, index = None):
+    """
+    Positions of the first occurrence of every distinct packed row. The rows are hashed in parallel and sorted by hash (O(P log P)); rows sharing a hash are compared word by word, so hash collisions never merge different rows.
+
+    :param packed: Packed matrix with shape (rows, words) and dtype uint64.
+    :type packed: np.array
+
+    :param index: Rows of `packed` to deduplicate, defaults to None (all rows).
+    :type index: np.array, optional
+
+    :return: Sorted positions (into `index`, or into `packed` if `index` is None) of the distinct rows.
+    :rtype: np.array
+    """
+    if index is None:
+        index = np.arange(packed.shape[0], dtype=np.int64)
+    index = np.asarray(index, dtype=np.int64)
+    hashes = hashRows(packed, index)
+    order = np.argsort(hashes, kind="stable")
+    keep = np.zeros(len(index), dtype=np.bool_)
+    __firstOccurrences(packed, index, hashes, order, keep)
+    return np.flatnonzero(keep)
+
+@njit
+def __firstOccurrences(packed, index, hashes, order, keep):
+    n = order.shape[0]
+    start = 0
+    while start < n:
+        end = start + 1
+        while end < n and hashes[order[end]] == hashes[order[start]]:
+            end += 1
+        
+        # Runs of equal hashes keep their original order (stable sort), so the first occurrence wins
+        for a in range(start, end):
+            bDuplicate = False
+            for b in range(start, a):
+                if keep[order[b]] and __equalRows(packed[index[order[a]]], packed[index[order[b]]]):
+                    bDuplicate = True
+                    break
+            keep[order[a]] = not bDuplicate
+        start = end
+
+class PatternSet:
+    """
+    Streaming set of distinct packed patterns. Patterns can be added in blocks (for example, one block per tile of row pairs) and only those not seen before are kept.
+
+    :param words: Number of 64-bit words of each pattern.
+    :type words: int
+    """
+
+    def __init__(self, words):
+        """
+        Constructor method
+        """
+        self._patterns = np.empty((0, words), dtype=np.uint64)
+        self._size = 0
+        self._hashes = np.empty(0, dtype=np.uint64) # Sorted hashes
+        self._order = np.empty(0, dtype=np.int64) # Pattern of each sorted hash
+
+    @property
+    def patterns(self):
+        """
+        Distinct patterns in insertion order.
+        """
+        return self._patterns[:self._size]
+
+    def __len__(self):
+        return self._size
+
+    def add(self, patterns):
+        """
+        Add a block of patterns to the set.
+
+        :param patterns: Packed patterns with shape (P, words) and dtype uint64.
+        :type patterns: np.array
+
+        :return: The patterns of the block that were not in the set yet (without duplicates).
+        :rtype: np.array
+        """
+        patterns = np.ascontiguousarray(patterns, dtype=np.uint64)
+        patterns = patterns[uniqueRows(patterns)]
+        hashes = hashRows(patterns)
+        present = np.zeros(len(patterns), dtype=np.bool_)
+        _findPatterns(self._patterns, self._hashes, self._order, patterns, hashes, present)
+        newPatterns = patterns[~present]
+        
+        if len(newPatterns) > 0:
+            # Append (amortized doubling) and merge the sorted hashes (linear time with a stable sort)
+            newSize = self._size + len(newPatterns)
+            if newSize > self._patterns.shape[0]:
+                buffer = np.empty((max(newSize, 2 * self._patterns.shape[0]), patterns.shape[1]), dtype=np.uint64)
+                buffer[:self._size] = self._patterns[:self._size]
+                self._patterns = buffer
+            self._patterns[self._size:newSize] = newPatterns
+            
+            allHashes = np.concatenate((self._hashes, hashes[~present]))
+            allOrder = np.concatenate((self._order, np.arange(self._size, newSize, dtype=np.int64)))
+            order = np.argsort(allHashes, kind="stable")
+            self._hashes = allHashes[order]
+            self._order = allOrder[order]
+            self._size = newSize
+        
+        return newPatterns
+
+@njit(parallel=True)
+def _findPatterns(setPatterns, setHashes, setOrder, patterns, hashes, present):
+    for i in prange(patterns.shape[0]):
+        lo = np.searchsorted(setHashes, hashes[i], side="left")
+        hi = np.searchsorted(setHashes, hashes[i], side="right")
+        for j in range(lo, hi):
+            if __equalRows(setPatterns[setOrder[j]], patterns[i]):
+                present[i] = True
+                break
+
+def transposeRows(packed, cols):
+    """
+    Vertical (column-bitset) index of a packed matrix: one packed row-bitset per column, with the same layout as :func:`packRows` (row 0 is the most significant bit).
+
+    :param packed: Packed matrix with shape (rows, words) and dtype uint64.
+    :type packed: np.array
+
+    :param cols: Number of columns of the original binary matrix.
+    :type cols: int
+
+    :return: Packed matrix with shape (cols, rowWords) and dtype uint64.
+    :rtype: np.array
+    """
+    packed = np.ascontiguousarray(packed, dtype=np.uint64)
+    vertical = np.zeros((cols, wordsPerRow(packed.shape[0])), dtype=np.uint64)
+    __transposeRowsKernel(packed, packed.shape[1] * PATTERN_SIZE - cols, vertical)
+    return vertical
+
+@njit(parallel=True)
+def __transposeRowsKernel(packed, padCols, vertical):
+    rows, words = packed.shape
+    padRows = vertical.shape[1] * 64 - rows
+    # Each thread fills one word (64 rows) of every column, walking only the set bits of those rows
+    for q in prange(vertical.shape[1]):
+        for j in range(max(0, q * 64 - padRows), min(rows, (q + 1) * 64 - padRows)):
+            bit = np.uint64(1) << np.uint64(63 - ((padRows + j) % 64))
+            for k in range(words):
+                w = packed[j, k]
+                while w != 0:
+                    lowBit = w & (~w + np.uint64(1))
+                    vertical[k * 64 + 63 - popcount64(lowBit - np.uint64(1)) - padCols, q] |= bit
+                    w ^= lowBit
+
+class VerticalIndex:
+    """
+    Vertical index of a packed matrix (see :func:`transposeRows`) that is only built the first time it is needed, so the runs where every pattern is evaluated horizontally never allocate it.
+
+    :param packed: Packed matrix with shape (rows, words) and dtype uint64.
+    :type packed: np.array
+
+    :param cols: Number of columns of the original binary matrix.
+    :type cols: int
+    """
+
+    def __init__(self, packed, cols):
+        """
+        Constructor method
+        """
+        self._packed = packed
+        self._cols = cols
+        self._matrix = None
+
+    @property
+    def matrix(self):
+        """
+        Packed matrix with shape (cols, rowWords) built by :func:`transposeRows`.
+        """
+        if self._matrix is None:
+            self._matrix = transposeRows(self._packed, self._cols)
+        return self._matrix
+
+def supportRows(data, patterns, index, vertical = None, useVertical = None):
+    """
+    Rows of a packed matrix that contain each pattern (`(row & pattern) == pattern`), computed in parallel with NUMBA. Each pattern is evaluated either horizontally (testing every row) or vertically (AND of the row-bitsets of the pattern columns in the vertical index).
+
+    :param data: Packed matrix with shape (rows, words) and dtype uint64.
+    :type data: np.array
+
+    :param patterns: Packed patterns with shape (P, words) and dtype uint64.
+    :type patterns: np.array
+
+    :param index: Positions in `patterns` of the patterns to evaluate.
+    :type index: np.array
+
+    :param vertical: Vertical index built with :func:`transposeRows` (or :attr:`VerticalIndex.matrix`), defaults to None (horizontal evaluation only).
+    :type vertical: np.array, optional
+
+    :param useVertical: Flag per evaluated pattern to use the vertical index, defaults to None (horizontal evaluation only).
+    :type useVertical: np.array, optional
+
+    :return: Row-bitsets with shape (len(index), rowWords) and dtype uint64 (see :func:`packRows` for the layout).
+    :rtype: np.array
+    """
+    index = np.asarray(index, dtype=np.int64)
+    if vertical is None or useVertical is None:
+        vertical = np.zeros((0, wordsPerRow(data.shape[0])), dtype=np.uint64)
+        useVertical = np.zeros(len(index), dtype=np.bool_)
+    support = np.zeros((len(index), wordsPerRow(data.shape[0])), dtype=np.uint64)
+    __supportRowsKernel(data, patterns, index, vertical, useVertical, support)
+    return support
+
+@njit(parallel=True)
+def __supportRowsKernel(data, patterns, index, vertical, useVertical, support):
+    rows, words = data.shape
+    rowWords = support.shape[1]
+    padRows = rowWords * 64 - rows
+    padCols = words * 64 - vertical.shape[0]
+    for i in prange(index.shape[0]):
+        pattern = patterns[index[i]]
+        bEmpty = True
+        for k in range(words):
+            if pattern[k] != 0:
+                bEmpty = False
+        
+        if useVertical[i] and not bEmpty:
+            # AND of the row-bitsets of every column of the pattern
+            bFirst = True
+            for k in range(words):
+                w = pattern[k]
+                while w != 0:
+                    lowBit = w & (~w + np.uint64(1))
+                    c = k * 64 + 63 - popcount64(lowBit - np.uint64(1)) - padCols
+                    for q in range(rowWords):
+                        if bFirst:
+                            support[i, q] = vertical[c, q]
+                        else:
+                            support[i, q] &= vertical[c, q]
+                    bFirst = False
+                    w ^= lowBit
+        else:
+            # Test every row
+            for j in range(rows):
+                bContains = True
+                for k in range(words):
+                    if (data[j, k] & pattern[k]) != pattern[k]:
+                        bContains = False
+                        break
+                if bContains:
+                    pos = padRows + j
+                    support[i, pos // 64] |= np.uint64(1) << np.uint64(63 - (pos % 64))
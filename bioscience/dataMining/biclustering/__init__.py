@@ -1,10 +1,15 @@
 from .Biclustering import (
     bibit,
+    bibitStats,
+    bibitIter,
     bcca
 )
 
 from .BiBit import (
     processBiBit,
+    processBiBitLevels,
+    processBiBitStats,
+    processBiBitIter,
 )
 
 from .Bcca import (
@@ -14,9 +19,14 @@ from .Bcca import (
 __all__ = [
     # Biclustering.py
     "bibit",
+    "bibitStats",
+    "bibitIter",
     "bcca",
     # BiBit.py
     "processBiBit",
+    "processBiBitLevels",
+    "processBiBitStats",
+    "processBiBitIter",
     # Bcca.py
     "processBcca",
 ]
\ No newline at end of file
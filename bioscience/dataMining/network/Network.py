@@ -1,21 +1,23 @@
 from .Cobinet import *
 from bioscience.base import *
 
-def cobinet(dataset, deviceCount = 1, mode = 1, debug = False):
-    listModels = set()
+def cobinet(dataset, deviceCount = 1, mode = 1, debug = False, levelProcesses = None):
+    listModels = []
 
     if dataset is not None:
         
         if isinstance(dataset, Dataset):
             oModel = processCobinet(dataset, deviceCount, mode, debug)
-            listModels.add(oModel)
+            listModels.append(oModel)
         
-        if isinstance(dataset, set):
+        if isinstance(dataset, set) and levelProcesses is not None:
+            listModels = processLevels(processCobinet, dataset, (deviceCount, mode, debug), levelProcesses)
+        elif isinstance(dataset, set):
             iLevel = 1
-            for oDataset in dataset:
+            for oDataset in sortLevels(dataset):
                 print("\nLevel: ", str(iLevel))
                 oModel = processCobinet(oDataset, deviceCount, mode, debug)
-                listModels.add(oModel)
+                listModels.append(oModel)
                 iLevel += 1
             
     return listModels
\ No newline at end of file
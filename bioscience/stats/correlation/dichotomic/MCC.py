@@ -46,34 +46,18 @@ def __mccSequential(dataset, debug):
     iCols = dataset.data.shape[1]
     fExecutionTime = None
     
-    maxPairs = 0        
-    for i in range(iRows):
-        for j in range(i + 1, iRows):
-            maxPairs += 1
+    maxPairs = pairCount(iRows)
     
     resultsCorrelation = np.zeros(maxPairs)    
     
     if debug == True:
         start_time = time.time()
         
+    # Rows of the first pair (the next ones are walked in O(1))
+    r1, r2 = 0, 1
+    
     for pattern, value in enumerate(resultsCorrelation):
         
-        # Get R1 and R2 from index results vector
-        r1 = 0
-        r2 = -1
-        auxPat = pattern - iRows + 1
-        
-        if auxPat < 0:
-            r2 = auxPat + iRows
-
-        j = iRows - 2
-        while r2 == -1:
-            auxPat -= j
-            r1 += 1
-            if auxPat < 0:
-                r2 = (j + auxPat) + (r1 + 1)
-            j -= 1
-        
         if r1 < iRows and r2 < iRows:
             
             # Confusion matrix
@@ -91,6 +75,12 @@ def __mccSequential(dataset, debug):
                 mccValue = num / den
         
             resultsCorrelation[pattern] = mccValue
+
+        # Next pair (r2 walks the row, then the next r1 starts)
+        r2 += 1
+        if r2 == iRows:
+            r1 += 1
+            r2 = r1 + 1
     
     if debug == True:
         end_time = time.time()
@@ -46,10 +46,7 @@ def __spearmanSequential(dataset, debug):
     iCols = dataset.data.shape[1]
     fExecutionTime = None    
     
-    maxPairs = 0
-    for i in range(iRows):
-        for j in range(i + 1, iRows):
-            maxPairs += 1
+    maxPairs = pairCount(iRows)
     
     fSpearmanRankG1 = np.zeros((maxPairs,iCols))
     fSpearmanRankG2 = np.zeros((maxPairs,iCols))
@@ -60,24 +57,11 @@ def __spearmanSequential(dataset, debug):
         start_time = time.time()
     
     pattern = 0
+    # Rows of the first pair (the next ones are walked in O(1))
+    r1, r2 = 0, 1
+    
     while pattern < maxPairs:
         
-        # Get R1 and R2 from index results vector
-        r1 = 0
-        r2 = -1
-        auxPat = pattern - iRows + 1
-        
-        if auxPat < 0:
-            r2 = auxPat + iRows
-
-        j = iRows - 2
-        while r2 == -1:
-            auxPat -= j
-            r1 += 1
-            if auxPat < 0:
-                r2 = (j + auxPat) + (r1 + 1)
-            j -= 1
-        
         if r1 < iRows and r2 < iRows:
             
             # Calculation G1 and G2 ranks
@@ -124,6 +108,12 @@ def __spearmanSequential(dataset, debug):
             
             resultsCorrelation[pattern] = dSpearman
         
+        # Next pair (r2 walks the row, then the next r1 starts)
+        r2 += 1
+        if r2 == iRows:
+            r1 += 1
+            r2 = r1 + 1
+
         pattern += 1
     
     if debug == True:
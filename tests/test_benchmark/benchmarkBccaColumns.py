@@ -0,0 +1,46 @@
+import time
+import warnings
+import numpy as np
+import bioscience.dataMining.biclustering.Bcca as Bcca
+
+reduceCols = Bcca.__dict__["__reduceCols"]
+
+def corr(v, w):
+    vc, wc = v - np.mean(v), w - np.mean(w)
+    return np.abs(np.sum(vc * wc) / np.sqrt(np.sum(vc * vc) * np.sum(wc * wc)))
+
+def reduceColsDelete(x, y, correlationThreshold, minCols):
+    # Previous greedy procedure: np.delete and a full correlation for every candidate column (O(cols³) per seed pair)
+    cols = np.arange(len(x))
+    value = corr(x, y)
+    while value < correlationThreshold and len(cols) >= minCols:
+        cols = np.delete(cols, max(range(len(cols)), key=lambda k: corr(np.delete(x[cols], k), np.delete(y[cols], k))))
+        value = corr(x[cols], y[cols])
+    return cols
+
+def benchmark(cols, seeds = 20, correlationThreshold = 0.9, minCols = 3):
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(2 * seeds, cols))
+    
+    start = time.perf_counter()
+    previous = [reduceColsDelete(data[2 * s], data[2 * s + 1], correlationThreshold, minCols) for s in range(seeds)]
+    tPrevious = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    current = [np.flatnonzero(reduceCols(data[2 * s], data[2 * s + 1], correlationThreshold, minCols)) for s in range(seeds)]
+    tCurrent = time.perf_counter() - start
+    
+    assert all(np.array_equal(a, b) for a, b in zip(previous, current))
+    print(f"{cols} columns, {seeds} seed pairs: np.delete {tPrevious:.3f}s - running sums {tCurrent:.4f}s ({tPrevious / tCurrent:.0f}x)")
+
+###################
+# 1) Warm-up (JIT)
+###################
+warnings.simplefilter("ignore")
+benchmark(10, seeds = 2)
+
+###################
+# 2) Benchmark 
+###################
+for cols in [20, 50, 100, 200]:
+    benchmark(cols)
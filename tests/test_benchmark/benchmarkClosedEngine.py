@@ -0,0 +1,57 @@
+import os
+import io
+import time
+import contextlib
+import numpy as np
+import bioscience as bs
+from bioscience.dataMining.biclustering.BiBit import processBiBit
+
+DATASETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "datasets")
+
+def runBiBit(data, cMnr, cMnc, **kwargs):
+    # Debug mode: only the mining is timed (no bicluster data)
+    dataset = bs.Dataset(np.array(data, dtype=np.uint64))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        oModel = processBiBit(dataset, cMnr, cMnc, 1, 2, True, **kwargs)
+    elapsed = time.perf_counter() - start
+    return {tuple(np.sort(b.rows)) for b in oModel.results}, elapsed
+
+def benchmark(name, data, cMnr = 2, cMnc = 2, memoryLimit = None):
+    pairs, tPairs = runBiBit(data, cMnr, cMnc, memoryLimit=memoryLimit)
+    closed, tClosed = runBiBit(data, cMnr, cMnc, engine="closed")
+    
+    # Every pair-generated bicluster is a closed pattern (a closed pattern is identified by its rows)
+    assert pairs <= closed
+    print(f"{name} {data.shape}: pairs {tPairs:.3f}s ({len(pairs)} biclusters) - closed {tClosed:.3f}s ({len(closed)} biclusters)")
+
+###################
+# 1) Warm-up (JIT)
+###################
+runBiBit(np.eye(4, dtype=np.uint64), 2, 1)
+runBiBit(np.eye(4, dtype=np.uint64), 2, 1, engine="closed")
+
+###################
+# 2) Datasets
+###################
+for fileName in ["binaryTest3.txt", "binaryTest4.txt"]:
+    dataset = bs.load(db=os.path.join(DATASETS, fileName), index_gene=0, naFilter=False, head=0)
+    benchmark(fileName, dataset.data)
+
+dataset = bs.load(db=os.path.join(DATASETS, "bibit", "GSE26910.csv"), index_gene=0, naFilter=False, head=0)
+bs.scale(dataset)
+bs.binarize(dataset, threshold=0.2)
+benchmark("GSE26910.csv", dataset.data, cMnr=2, cMnc=4)
+
+#####################################
+# 3) Large synthetic sparse matrices
+#####################################
+rng = np.random.default_rng(0)
+for rows, cols, density in [(5000, 64, 0.05), (20000, 64, 0.03)]:
+    data = (rng.random((rows, cols)) < density).astype(np.uint64)
+    benchmark("synthetic", data, cMnr=2, cMnc=2, memoryLimit=512 * 1024**2)
+
+# Wide sparse matrices (closure over thousands of columns)
+for rows, cols, density in [(800, 1500, 0.01), (2000, 4000, 0.01)]:
+    data = (rng.random((rows, cols)) < density).astype(np.uint64)
+    benchmark("synthetic wide", data, cMnr=2, cMnc=2)
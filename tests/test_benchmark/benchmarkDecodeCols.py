@@ -0,0 +1,53 @@
+import time
+import numpy as np
+from bioscience.dataMining.biclustering.Bitset import packRows, patternsToCols
+
+##################################################
+# Legacy string-based column decoding (v0.1.4)   #
+##################################################
+def legacyDecodeCols(patterns, cols):
+    aCols = []
+    for pattern in patterns:
+        vectorized_bin = np.vectorize(bin)
+        binaryReprArray = vectorized_bin(pattern)
+        binaryReprArray = np.array(list(map(lambda s: s[2:], binaryReprArray)))
+        totalBits = sum(len(s) for s in binaryReprArray)
+        zerosDifference = cols - totalBits
+        binaryReprArray = np.array([list(binary_string) for binary_string in binaryReprArray])
+        positionsCols = np.where(binaryReprArray == '1')[1]
+        positionsCols += zerosDifference
+        aCols.append(positionsCols)
+    return aCols
+
+def timeIt(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+###################
+# 1) Benchmark 
+###################
+rng = np.random.default_rng(0)
+patternsToCols(np.zeros((1, 1), dtype=np.uint64), 1) # JIT warm-up
+
+for numPatterns, cols in [(10000, 40), (100000, 64), (500000, 60)]:
+    data = (rng.random((numPatterns, cols)) < 0.3).astype(np.uint8)
+    data[:, 0] = 1 # The legacy decoder only handles single-word patterns whose first bit is set
+    patterns = packRows(data)
+    
+    legacy, tLegacy = timeIt(legacyDecodeCols, patterns[:10000], cols)
+    (indptr, indices), tBatched = timeIt(patternsToCols, patterns, cols)
+    
+    for i in range(0, numPatterns, 997):
+        assert np.array_equal(indices[indptr[i]:indptr[i + 1]], np.flatnonzero(data[i]))
+        if i < 10000:
+            assert np.array_equal(indices[indptr[i]:indptr[i + 1]], legacy[i])
+    
+    tLegacy *= numPatterns / min(numPatterns, 10000) # Extrapolated from the first 10000 patterns
+    print(f"{numPatterns} patterns x {cols} cols: legacy {tLegacy:.2f}s - batched {tBatched:.4f}s ({tLegacy / tBatched:.0f}x)")
+
+# Multi-word patterns (the legacy sequential decoder only read the first word)
+data = (rng.random((100000, 700)) < 0.1).astype(np.uint8)
+(indptr, indices), tBatched = timeIt(patternsToCols, packRows(data), 700)
+assert np.array_equal(indices, np.nonzero(data)[1])
+print(f"100000 patterns x 700 cols: batched {tBatched:.4f}s")
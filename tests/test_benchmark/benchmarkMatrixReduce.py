@@ -0,0 +1,51 @@
+import time
+import numpy as np
+from bioscience.dataMining.biclustering.Bitset import packRows, unpackRows, patternToCols
+
+##############################################
+# Legacy string-based BiBit packing (v0.1.4) #
+##############################################
+def legacyMatrixReduce(data):
+    patternSize = 64 # 64 bits
+    rows, cols = data.shape
+    
+    if(cols % patternSize == 0):
+        cols = int(cols / patternSize)
+    else:
+        cols = int(cols / patternSize) + 1
+    
+    for j in range(rows):
+        cstr_rows_str_padded = ''.join(map(lambda x: str(int(x)), data[j])).zfill(cols * patternSize)       
+        iPos = 0
+        data[j] = 0
+        for cWord in np.array(list(cstr_rows_str_padded), dtype=np.uint64).reshape(cols, patternSize):  
+            data[j][iPos] = int(''.join(map(str, np.unpackbits(np.packbits(cWord)))), 2)
+            iPos += 1
+            
+    return data[:, :cols]
+
+def timeIt(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+###################
+# 1) Benchmark 
+###################
+rng = np.random.default_rng(0)
+packRows(np.zeros((2, 2), dtype=np.uint64), parallel=True) # JIT warm-up
+
+for rows, cols in [(1000, 50), (2000, 200), (4000, 700)]:
+    data = (rng.random((rows, cols)) < 0.3).astype(np.uint64)
+    
+    legacy, tLegacy = timeIt(legacyMatrixReduce, data.copy())
+    packed, tNumpy = timeIt(packRows, data)
+    packedNumba, tNumba = timeIt(packRows, data, parallel=True)
+    
+    # The packed layout must be identical to the legacy one and reversible
+    assert np.array_equal(legacy, packed)
+    assert np.array_equal(legacy, packedNumba)
+    assert np.array_equal(unpackRows(packed, cols), data)
+    assert np.array_equal(patternToCols(packed[0], cols), np.flatnonzero(data[0]))
+    
+    print(f"{rows}x{cols}: legacy {tLegacy:.3f}s - numpy {tNumpy:.4f}s ({tLegacy / tNumpy:.0f}x) - numba {tNumba:.4f}s ({tLegacy / tNumba:.0f}x)")
@@ -0,0 +1,52 @@
+import io
+import time
+import warnings
+import contextlib
+import numpy as np
+import bioscience as bs
+from bioscience.dataMining.biclustering.BiBit import processBiBit, processBiBitLevels
+
+CUTS = [1.0, 0.9, 0.8, 0.7, 0.6, 0.5]
+
+def buildLevels(fuzzy):
+    # Nested binary levels of the same fuzzy matrix (as bs.binarizeLevels)
+    listDatasets = set()
+    for cut in CUTS:
+        oDataset = bs.Dataset(fuzzy, cut=cut)
+        oDataset.data = (fuzzy >= cut).astype(np.uint64)
+        listDatasets.add(oDataset)
+    return listDatasets
+
+def toSet(oModel):
+    return {(tuple(np.sort(b.rows)), tuple(np.sort(b.cols))) for b in oModel.results}
+
+def benchmark(fuzzy, cMnr = 2, cMnc = 3):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        independent = {oDataset.cut: toSet(processBiBit(oDataset, cMnr, cMnc, 1, 2, False)) for oDataset in buildLevels(fuzzy)}
+        tIndependent = time.perf_counter() - start
+        
+        listDatasets = buildLevels(fuzzy)
+        start = time.perf_counter()
+        aModels = processBiBitLevels(listDatasets, cMnr, cMnc, False)
+        tLevels = time.perf_counter() - start
+    
+    # Same biclusters per level (models are returned from the densest level to the sparsest one)
+    for cut, oModel in zip(sorted(CUTS), aModels):
+        assert toSet(oModel) == independent[cut]
+    
+    print(f"{fuzzy.shape} x {len(CUTS)} levels: independent {tIndependent:.3f}s - multi-level {tLevels:.3f}s ({tIndependent / tLevels:.1f}x) - biclusters {[len(oModel.results) for oModel in aModels]}")
+
+###################
+# 1) Warm-up (JIT)
+###################
+warnings.simplefilter("ignore")
+rng = np.random.default_rng(0)
+benchmark(rng.random((50, 20)))
+
+###################
+# 2) Benchmark 
+###################
+for rows, cols in [(1000, 40), (3000, 60)]:
+    fuzzy = rng.random((rows, cols)) ** 3 # Sparse levels
+    benchmark(fuzzy)
@@ -0,0 +1,37 @@
+import io
+import time
+import warnings
+import contextlib
+import numpy as np
+import bioscience as bs
+from bioscience.dataMining.biclustering.BiBit import processBiBit
+
+def toSet(oModel):
+    return {(tuple(np.sort(b.rows)), tuple(np.sort(b.cols))) for b in oModel.results}
+
+def benchmark(rows, cols, density, cMnr = 2, cMnc = 3):
+    rng = np.random.default_rng(0)
+    oDataset = bs.Dataset((rng.random((rows, cols)) < density).astype(np.uint64))
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        sequential = toSet(processBiBit(oDataset, cMnr, cMnc, 1, 1, False))
+        tSequential = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        batched = toSet(processBiBit(oDataset, cMnr, cMnc, 1, 5, False))
+        tBatched = time.perf_counter() - start
+    
+    assert sequential == batched
+    print(f"({rows}, {cols}) density {density} cMnc {cMnc}: sequential {tSequential:.3f}s - NumPy batched {tBatched:.3f}s ({tSequential / tBatched:.1f}x) - biclusters {len(sequential)}")
+
+###################
+# 1) Warm-up (JIT of mode=1, mode=5 is not compiled)
+###################
+warnings.simplefilter("ignore")
+benchmark(50, 50, 0.3)
+
+###################
+# 2) Benchmark 
+###################
+for rows, cols, density, cMnc in [(300, 100, 0.3, 10), (600, 200, 0.2, 20), (1000, 500, 0.1, 20)]:
+    benchmark(rows, cols, density, cMnc=cMnc)
@@ -0,0 +1,87 @@
+import time
+import numpy as np
+import bioscience as bs
+from bioscience.base.pairs import pairCount, pairToRows, pairsToRows
+
+def whileDecode(pattern, rows):
+    # Previous decoding of the correlation methods (O(rows) per pair)
+    r1 = 0
+    r2 = -1
+    auxPat = pattern - rows + 1
+    if auxPat < 0:
+        r2 = auxPat + rows
+    j = rows - 2
+    while r2 == -1:
+        auxPat -= j
+        r1 += 1
+        if auxPat < 0:
+            r2 = (j + auxPat) + (r1 + 1)
+        j -= 1
+    return r1, r2
+
+def loopCount(rows):
+    # Previous number of pairs of the correlation methods (O(rows²))
+    maxPairs = 0
+    for i in range(rows):
+        for j in range(i + 1, rows):
+            maxPairs += 1
+    return maxPairs
+
+def benchmarkDecode(rows, samples = 20000):
+    rng = np.random.default_rng(0)
+    patterns = [int(p) for p in rng.integers(0, pairCount(rows), samples)]
+    
+    start = time.perf_counter()
+    previous = [whileDecode(p, rows) for p in patterns]
+    tPrevious = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    current = [pairToRows(p, rows) for p in patterns]
+    tCurrent = time.perf_counter() - start
+    
+    assert previous == current
+    print(f"Decode {rows} rows ({samples} random pairs): while loop {tPrevious:.3f}s - closed form {tCurrent:.3f}s ({tPrevious / tCurrent:.0f}x), all {pairCount(rows)} pairs: ~{tPrevious * pairCount(rows) / samples:.0f}s vs ~{tCurrent * pairCount(rows) / samples:.0f}s")
+
+def benchmarkCount(rows):
+    start = time.perf_counter()
+    previous = loopCount(rows)
+    tPrevious = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    current = pairCount(rows)
+    tCurrent = time.perf_counter() - start
+    
+    assert previous == current
+    print(f"Number of pairs of {rows} rows: double loop {tPrevious:.3f}s - pairCount {tCurrent * 1e6:.1f}us")
+
+def benchmarkModel(rows):
+    results = np.zeros(pairCount(rows))
+    
+    start = time.perf_counter()
+    index = np.zeros((pairCount(rows), 2))
+    for pattern in range(pairCount(rows)):
+        index[pattern] = whileDecode(pattern, rows)
+    tPrevious = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    oModel = bs.CorrelationModel("PEARSON", results, rows)
+    tCurrent = time.perf_counter() - start
+    
+    assert np.array_equal(index, oModel.geneInteractionsIndex)
+    print(f"CorrelationModel of {rows} rows: while loop {tPrevious:.3f}s - pairsToRows {tCurrent:.3f}s ({tPrevious / tCurrent:.0f}x)")
+
+###################
+# 1) Warm-up (JIT)
+###################
+pairToRows(0, 10)
+pairsToRows(0, 10, 10)
+
+###################
+# 2) Benchmark 
+###################
+for rows in [1000, 10000, 30000]:
+    benchmarkDecode(rows)
+for rows in [1000, 5000]:
+    benchmarkCount(rows)
+for rows in [500, 1000]:
+    benchmarkModel(rows)
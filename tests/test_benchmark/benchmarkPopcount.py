@@ -0,0 +1,117 @@
+import time
+import numpy as np
+from numba import cuda, njit, prange
+from bioscience.dataMining.biclustering.Bitset import packRows, popcountRows, popcount64, popcount64Gpu
+
+def timeIt(function, *args, repeat = 3):
+    bestTime = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        bestTime = elapsed if bestTime is None else min(bestTime, elapsed)
+    return result, bestTime
+
+###########################################
+# mode=1: bin().count vs NumPy lookup table
+###########################################
+def legacySequential(data, r1):
+    counts = np.zeros(data.shape[0] - r1 - 1, dtype=np.int64)
+    for r2 in range(r1 + 1, data.shape[0]):
+        for iDigit in data[r1] & data[r2]:
+            counts[r2 - r1 - 1] += bin(iDigit)[2:].count('1')
+    return counts
+
+def tableSequential(data, r1):
+    return popcountRows(data[r1] & data[r1 + 1:])
+
+##########################################
+# mode=2: bit loop vs SWAR popcount (NUMBA)
+##########################################
+@njit(parallel=True)
+def legacyNumbaCpu(data, counts):
+    rows = data.shape[0]
+    for r1 in prange(rows):
+        for r2 in range(rows):
+            total = 0
+            for n in data[r1] & data[r2]:
+                while n:
+                    total += n & 1
+                    n >>= 1
+            counts[r1, r2] = total
+
+@njit(parallel=True)
+def swarNumbaCpu(data, counts):
+    rows = data.shape[0]
+    for r1 in prange(rows):
+        for r2 in range(rows):
+            total = 0
+            for k in range(data.shape[1]):
+                total += popcount64(data[r1, k] & data[r2, k])
+            counts[r1, r2] = total
+
+##########################################
+# mode=3: bit loop vs cuda.popc (NUMBA GPU)
+##########################################
+@cuda.jit
+def legacyGpu(data, counts):
+    r1, r2 = cuda.grid(2)
+    if r1 < data.shape[0] and r2 < data.shape[0]:
+        total = 0
+        for k in range(data.shape[1]):
+            n = data[r1, k] & data[r2, k]
+            while n:
+                if n & 1 == 1:
+                    total += 1
+                n >>= 1
+        counts[r1, r2] = total
+
+@cuda.jit
+def popcGpu(data, counts):
+    r1, r2 = cuda.grid(2)
+    if r1 < data.shape[0] and r2 < data.shape[0]:
+        total = 0
+        for k in range(data.shape[1]):
+            total += popcount64Gpu(data[r1, k] & data[r2, k])
+        counts[r1, r2] = total
+
+###################
+# 1) Benchmark 
+###################
+rng = np.random.default_rng(0)
+data = packRows(rng.random((2000, 500)) < 0.5)
+rows = data.shape[0]
+
+# mode=1 (one row against every following row)
+legacy, tLegacy = timeIt(legacySequential, data, 0)
+table, tTable = timeIt(tableSequential, data, 0)
+assert np.array_equal(legacy, table)
+print(f"mode=1: bin().count {tLegacy:.4f}s - lookup table {tTable:.5f}s ({tLegacy / tTable:.0f}x)")
+
+# mode=2 (all row pairs)
+countsLegacy = np.zeros((rows, rows), dtype=np.int64)
+countsSwar = np.zeros((rows, rows), dtype=np.int64)
+legacyNumbaCpu(data[:2], countsLegacy[:2, :2]) # JIT warm-up
+swarNumbaCpu(data[:2], countsSwar[:2, :2])
+_, tLegacy = timeIt(legacyNumbaCpu, data, countsLegacy)
+_, tSwar = timeIt(swarNumbaCpu, data, countsSwar)
+assert np.array_equal(countsLegacy, countsSwar)
+print(f"mode=2: bit loop {tLegacy:.4f}s - SWAR {tSwar:.4f}s ({tLegacy / tSwar:.1f}x)")
+
+# mode=3 (all row pairs)
+if cuda.is_available():
+    dData = cuda.to_device(data)
+    dCounts = cuda.device_array((rows, rows), dtype=np.int64)
+    blocks = ((rows + 15) // 16, (rows + 15) // 16)
+    for kernel in (legacyGpu, popcGpu):
+        kernel[blocks, (16, 16)](dData, dCounts) # JIT warm-up
+    cuda.synchronize()
+    def runGpu(kernel):
+        kernel[blocks, (16, 16)](dData, dCounts)
+        cuda.synchronize()
+    _, tLegacy = timeIt(runGpu, legacyGpu)
+    _, tPopc = timeIt(runGpu, popcGpu)
+    assert np.array_equal(dCounts.copy_to_host(), countsSwar)
+    print(f"mode=3: bit loop {tLegacy:.4f}s - cuda.popc {tPopc:.4f}s ({tLegacy / tPopc:.1f}x)")
+else:
+    print("mode=3: no CUDA device available")
@@ -0,0 +1,37 @@
+import io
+import time
+import warnings
+import contextlib
+import numpy as np
+import bioscience as bs
+from bioscience.dataMining.biclustering.BiBit import processBiBit
+
+def toSet(oModel):
+    return {(tuple(np.sort(b.rows)), tuple(np.sort(b.cols))) for b in oModel.results}
+
+def benchmark(rows, cols, density, cMnr = 2, cMnc = 3):
+    rng = np.random.default_rng(0)
+    oDataset = bs.Dataset((rng.random((rows, cols)) < density).astype(np.uint64))
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        dense = toSet(processBiBit(oDataset, cMnr, cMnc, 1, 2, False))
+        tDense = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        sparse = toSet(processBiBit(oDataset, cMnr, cMnc, 1, 2, False, sparse=True))
+        tSparse = time.perf_counter() - start
+    
+    assert dense == sparse
+    print(f"({rows}, {cols}) density {density} cMnc {cMnc}: dense {tDense:.3f}s - sparse {tSparse:.3f}s ({tDense / tSparse:.1f}x) - biclusters {len(dense)}")
+
+###################
+# 1) Warm-up (JIT)
+###################
+warnings.simplefilter("ignore")
+benchmark(2000, 500, 0.01)
+
+###################
+# 2) Benchmark 
+###################
+for rows, cols, density, cMnc in [(8000, 2000, 0.005, 3), (8000, 2000, 0.01, 3), (8000, 2000, 0.02, 3), (3000, 2000, 0.05, 10)]:
+    benchmark(rows, cols, density, cMnc=cMnc)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+import bioscience as bs
+import bioscience.dataMining.biclustering.Bcca as Bcca
+
+###########################################
+# BCCA row expansion against every member #
+###########################################
+def _dataset(seed, rows, cols):
+    # Noise with two groups of correlated (and anti-correlated) rows
+    rng = np.random.default_rng(seed)
+    data = rng.normal(size=(rows, cols))
+    data[:6] += np.linspace(0.0, 5.0, cols) * rng.uniform(0.5, 2.0, (6, 1))
+    data[6:10] -= np.sin(np.arange(cols)) * rng.uniform(1.0, 3.0, (4, 1))
+    return data
+
+def _biclusters(oModel):
+    return {(tuple(int(r) for r in oBicluster.rows), tuple(int(c) for c in oBicluster.cols)) for oBicluster in oModel.results}
+
+def _bcca(data, correlationThreshold, minCols, **kwargs):
+    listModels = bs.bcca(bs.Dataset(np.copy(data)), correlationThreshold=correlationThreshold, minCols=minCols, **kwargs)
+    assert isinstance(listModels, list) and len(listModels) == 1
+    return _biclusters(listModels[0])
+
+def _corr(x, y):
+    xc, yc = x - np.mean(x), y - np.mean(y)
+    return abs(np.sum(xc * yc) / np.sqrt(np.sum(xc * xc) * np.sum(yc * yc)))
+
+def _reduceCols(x, y, correlationThreshold, minCols):
+    # Greedy column removal: while the correlation is below the threshold, remove the column whose removal gives the highest correlation
+    aCols = np.arange(len(x))
+    while _corr(x[aCols], y[aCols]) < correlationThreshold and len(aCols) >= minCols:
+        aCols = np.delete(aCols, max(range(len(aCols)), key=lambda k: _corr(np.delete(x[aCols], k), np.delete(y[aCols], k))))
+    return aCols
+
+def _reference(data, correlationThreshold, minCols):
+    # Greedy column removal of every seed pair, then the rows correlated with every member added so far, in index order
+    rows = data.shape[0]
+    biclusters = set()
+    for i in range(rows):
+        for j in range(i + 1, rows):
+            aCols = _reduceCols(data[i], data[j], correlationThreshold, minCols)
+            if len(aCols) >= minCols:
+                members = [i, j]
+                for k in range(rows):
+                    if k not in (i, j) and np.std(data[k, aCols]) > 0 and all(_corr(data[k, aCols], data[m, aCols]) >= correlationThreshold for m in members):
+                        members.append(k)
+                biclusters.add((tuple(sorted(members)), tuple(int(c) for c in aCols)))
+    return biclusters
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_bcca_rows(seed):
+    data = _dataset(seed, 20, 10)
+    for correlationThreshold, minCols in ((0.8, 3), (0.95, 4)):
+        expected = _reference(data, correlationThreshold, minCols)
+        assert len(expected) > 0
+        for mode in (1, 2):
+            assert _bcca(data, correlationThreshold, minCols, mode=mode) == expected
+
+        # Every pair of rows of a bicluster is correlated on its columns
+        for aRows, aCols in expected:
+            assert np.all(np.abs(np.corrcoef(data[np.ix_(aRows, aCols)])) >= correlationThreshold - 1e-9)
+
+def test_bcca_reduce_cols():
+    # The running sums remove the same columns as recomputing every correlation
+    reduceCols = Bcca.__dict__["__reduceCols"]
+    rng = np.random.default_rng(5)
+    for _ in range(200):
+        cols = int(rng.integers(3, 25))
+        x, y = rng.normal(size=cols), rng.normal(size=cols)
+        y[:cols // 2] += x[:cols // 2] * rng.uniform(0.5, 3.0)
+        correlationThreshold, minCols = float(rng.uniform(0.5, 0.99)), int(rng.integers(2, 5))
+        aCols, expected = np.flatnonzero(reduceCols(x, y, correlationThreshold, minCols)), _reduceCols(x, y, correlationThreshold, minCols)
+        if len(expected) > 2:
+            assert np.array_equal(aCols, expected)
+        else: # Every pair of columns is a tie (correlation 1)
+            assert len(aCols) == len(expected)
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_bcca_modes(seed, monkeypatch):
+    # One seed pair per thread, in several blocks of seed pairs, gives the same biclusters as the sequential mode
+    data = _dataset(seed, 30, 12)
+    monkeypatch.setattr(Bcca, "SEED_BLOCK_MEMORY", 40 * 50)
+    for correlationThreshold, minCols in ((0.8, 3), (0.95, 4)):
+        expected = _bcca(data, correlationThreshold, minCols, mode=1)
+        assert len(expected) > 0
+        assert _bcca(data, correlationThreshold, minCols, mode=2) == expected
+
+@pytest.mark.parametrize("mode", [1, 2])
+def test_bcca_skip_seeds(mode):
+    # The fast mode only skips seeds: it returns a subset of the exhaustive run
+    data = _dataset(4, 30, 12)
+    expected = _bcca(data, 0.8, 3, mode=mode)
+    biclusters = _bcca(data, 0.8, 3, mode=mode, skipSeeds=True)
+    assert 0 < len(biclusters) < len(expected)
+    assert biclusters <= expected
@@ -0,0 +1,204 @@
+import os
+import sys
+import subprocess
+import numpy as np
+import pytest
+import bioscience as bs
+import bioscience.dataMining.biclustering.BiBit as BiBit
+
+###############################################
+# BiBit modes and options against brute force #
+###############################################
+def _data(seed, rows, cols, density):
+    rng = np.random.default_rng(seed)
+    data = (rng.random((rows, cols)) < density).astype(np.uint64)
+    data[rows - 4:] = data[:4] # Identical rows (collapse)
+    data[1] = 0 # Row and column pruned
+    data[:, 2] = 0
+    return data
+
+def _reference(data, cMnr, cMnc):
+    # Every pair of rows, its AND pattern and all the rows that contain it
+    bData = np.asarray(data) != 0
+    rows = bData.shape[0]
+    biclusters = set()
+    for r1 in range(rows):
+        for r2 in range(r1 + 1, rows):
+            pattern = bData[r1] & bData[r2]
+            if np.count_nonzero(pattern) >= cMnc:
+                aRows = np.flatnonzero(bData[:, pattern].all(axis=1))
+                if len(aRows) >= cMnr:
+                    biclusters.add((tuple(int(r) for r in aRows), tuple(int(c) for c in np.flatnonzero(pattern))))
+    return biclusters
+
+def _biclusters(oModel):
+    return {(tuple(int(r) for r in oBicluster.rows), tuple(int(c) for c in oBicluster.cols)) for oBicluster in oModel.results}
+
+def _bibit(data, cMnr, cMnc, **kwargs):
+    listModels = bs.bibit(bs.Dataset(np.copy(data)), cMnr=cMnr, cMnc=cMnc, **kwargs)
+    assert isinstance(listModels, list) and len(listModels) == 1
+    return _biclusters(listModels[0])
+
+@pytest.mark.parametrize("mode", [1, 2, 4, 5])
+@pytest.mark.parametrize("options", [
+    {},
+    {"memoryLimit": 1 << 15},
+    {"extension": "horizontal"},
+    {"extension": "vertical"},
+    {"prune": True},
+    {"collapse": True},
+    {"collapse": True, "memoryLimit": 1 << 15},
+])
+def test_bibit_modes(mode, options):
+    if mode == 4:
+        options = dict(options, processes=2)
+    data = _data(1, 40, 30, 0.45)
+    for cMnr, cMnc in ((2, 4), (3, 6)):
+        assert _bibit(data, cMnr, cMnc, mode=mode, **options) == _reference(data, cMnr, cMnc)
+
+def test_bibit_memory_limit_too_small():
+    # A budget that cannot hold the packed matrix and a minimum tile fails instead of running one row pair at a time
+    data = _data(1, 40, 30, 0.45)
+    bytesPerPair = 1 * 12 + 16
+    for memoryLimit in (100, 40 * 8, 40 * 8 + 2 * BiBit.MIN_TILE_PAIRS * bytesPerPair - 1):
+        for mode in (1, 2):
+            with pytest.raises(ValueError):
+                bs.bibit(bs.Dataset(np.copy(data)), cMnr=2, cMnc=4, mode=mode, memoryLimit=memoryLimit)
+        with pytest.raises(ValueError):
+            list(bs.bibitIter(bs.Dataset(np.copy(data)), cMnr=2, cMnc=4, memoryLimit=memoryLimit))
+    assert _bibit(data, 2, 4, mode=1, memoryLimit=40 * 8 + 2 * BiBit.MIN_TILE_PAIRS * bytesPerPair) == _reference(data, 2, 4)
+
+def test_bibit_prune_mnr():
+    # Columns with fewer than cMnr ones can still be in the pattern of a pair
+    rng = np.random.default_rng(2)
+    for _ in range(40):
+        rows, cols = int(rng.integers(3, 12)), int(rng.integers(2, 70))
+        data = (rng.random((rows, cols)) < rng.uniform(0.2, 0.7)).astype(np.uint64)
+        cMnr, cMnc = int(rng.integers(2, 5)), int(rng.integers(1, 4))
+        assert _bibit(data, cMnr, cMnc, mode=1, prune=True) == _reference(data, cMnr, cMnc)
+
+def test_bibit_closed():
+    # The closed engine finds every pairs bicluster plus the closed patterns of three or more rows
+    data = _data(3, 40, 30, 0.45)
+    bData = data != 0
+    for mode in (1, 2):
+        biclusters = _bibit(data, 2, 4, mode=mode, engine="closed")
+        assert _reference(data, 2, 4) <= biclusters
+        for aRows, aCols in biclusters:
+            assert len(aRows) >= 2 and len(aCols) >= 4
+            assert tuple(np.flatnonzero(bData[:, list(aCols)].all(axis=1))) == aRows
+            assert tuple(np.flatnonzero(bData[list(aRows)].all(axis=0))) == aCols
+
+def test_bibit_lazy_data():
+    data = _data(7, 40, 30, 0.45)
+    dataset = bs.Dataset(np.copy(data))
+    oModel = bs.bibit(dataset, cMnr=2, cMnc=4)[0]
+    assert len(oModel.results) > 0
+    
+    # The values are gathered on demand from the original dataset (not copied)
+    dataset.original *= 3
+    for oBicluster in oModel.results:
+        assert oBicluster.source is dataset.original
+        assert np.array_equal(oBicluster.data, 3 * data[np.ix_(oBicluster.rows, oBicluster.cols)])
+    
+    # materialize stores them (a single gather over the source)
+    oModel.materialize()
+    dataset.original[:] = 0
+    for oBicluster in oModel.results:
+        assert np.array_equal(oBicluster.data, 3 * data[np.ix_(oBicluster.rows, oBicluster.cols)])
+
+@pytest.mark.parametrize("mode", [1, 2, 4])
+def test_bibit_checkpoint(mode, tmp_path, monkeypatch):
+    data = _data(5, 60, 40, 0.4)
+    saveCheckpoint = BiBit.__dict__["__saveCheckpoint"]
+
+    def interrupt(*args):
+        saveCheckpoint(*args)
+        raise KeyboardInterrupt
+
+    # Run interrupted after its first checkpoint
+    monkeypatch.setattr(BiBit, "CHECKPOINT_INTERVAL", 0)
+    monkeypatch.setattr(BiBit, "__saveCheckpoint", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        bs.bibit(bs.Dataset(np.copy(data)), cMnr=2, cMnc=4, mode=mode, memoryLimit=40000, checkpoint=str(tmp_path), processes=1)
+    monkeypatch.setattr(BiBit, "__saveCheckpoint", saveCheckpoint)
+    with np.load(os.path.join(tmp_path, BiBit.CHECKPOINT_FILE)) as oCheckpoint:
+        assert 0 < int(oCheckpoint["pairsDone"]) < bs.pairCount(data.shape[0])
+
+    # Resumed with another memory budget (another tile size)
+    assert _bibit(data, 2, 4, mode=mode, memoryLimit=90000, checkpoint=str(tmp_path), processes=1) == _reference(data, 2, 4)
+
+def test_bibit_stats():
+    # Joint histogram of the bicluster sizes (rows, columns), with several tiles of row pairs
+    data = _data(8, 40, 30, 0.45)
+    histogram = {}
+    for aRows, aCols in _reference(data, 2, 4):
+        histogram[(len(aRows), len(aCols))] = histogram.get((len(aRows), len(aCols)), 0) + 1
+    listStats = bs.bibitStats(bs.Dataset(np.copy(data)), cMnr=2, cMnc=4, memoryLimit=1 << 15)
+    assert isinstance(listStats, list) and len(listStats) == 1
+    oStats = listStats[0]
+    assert oStats.histogram == histogram
+    assert oStats.totalBiclusters == sum(histogram.values())
+    aHistogram = oStats.toArray()
+    assert aHistogram.sum() == oStats.totalBiclusters
+    assert all(aHistogram[iRows, iCols] == count for (iRows, iCols), count in histogram.items())
+
+def test_bibit_stream():
+    # Biclusters yielded tile by tile, without duplicates, with their values gathered on demand
+    data = _data(4, 40, 30, 0.45)
+    listBiclusters = list(bs.bibitIter(bs.Dataset(np.copy(data)), cMnr=2, cMnc=4, memoryLimit=1 << 15))
+    assert len(listBiclusters) == len(_biclusters(bs.BiclusteringModel(listBiclusters)))
+    assert _biclusters(bs.BiclusteringModel(listBiclusters)) == _reference(data, 2, 4)
+    for oBicluster in listBiclusters:
+        assert np.array_equal(oBicluster.data, data[np.ix_(oBicluster.rows, oBicluster.cols)])
+
+def test_bibit_numpy_no_compilation():
+    # mode=5 runs without compiling any NUMBA function (fresh interpreter)
+    script = (
+        "import gc, numba, numpy as np, bioscience as bs\n"
+        "data = (np.random.default_rng(0).random((60, 40)) < 0.4).astype(np.uint64)\n"
+        "bs.bibit(bs.Dataset(data), cMnr=2, cMnc=4, mode=5, collapse=True)\n"
+        "bs.bibit(bs.Dataset(data), cMnr=2, cMnc=4, mode=5, debug=True)\n"
+        "print([o.py_func.__name__ for o in gc.get_objects() if isinstance(o, numba.core.dispatcher.Dispatcher) and o.signatures])\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == "[]"
+
+################
+# Sparse input #
+################
+def _sparseData():
+    data = _data(6, 50, 80, 0.03)
+    data[:5, 10:16] = 1
+    return data
+
+@pytest.mark.parametrize("options", [{"mode": 1}, {"mode": 2}, {"mode": 2, "prune": True}, {"mode": 5}])
+def test_bibit_csr(options):
+    sparse = pytest.importorskip("scipy.sparse")
+    data = _sparseData()
+    oModel = bs.bibit(bs.Dataset(sparse.csr_matrix(data)), cMnr=2, cMnc=2, **options)[0]
+    assert _biclusters(oModel) == _reference(data, 2, 2)
+    for oBicluster in oModel.results:
+        assert np.array_equal(oBicluster.data, data[np.ix_(oBicluster.rows, oBicluster.cols)])
+    
+    # Single gather over the sparse source
+    oModel.materialize()
+    for oBicluster in oModel.results:
+        assert np.array_equal(oBicluster.data, data[np.ix_(oBicluster.rows, oBicluster.cols)])
+
+def test_bibit_csr_stream():
+    sparse = pytest.importorskip("scipy.sparse")
+    data = _sparseData()
+    expected = _reference(data, 2, 2)
+    assert _biclusters(bs.BiclusteringModel(list(bs.bibitIter(bs.Dataset(sparse.csr_matrix(data)), cMnr=2, cMnc=2)))) == expected
+    assert bs.bibitStats(bs.Dataset(sparse.csr_matrix(data)), cMnr=2, cMnc=2)[0].totalBiclusters == len(expected)
+
+def test_bibit_csr_sequential(monkeypatch):
+    # mode=1 neither changes the number of threads nor runs the parallel kernels
+    sparse = pytest.importorskip("scipy.sparse")
+    data = _sparseData()
+    def parallel(*args):
+        raise AssertionError("parallel code in mode=1")
+    for name in ("set_num_threads", "__countPairsSparseKernel", "__fillPairsSparseKernel"):
+        monkeypatch.setattr(BiBit, name, parallel)
+    assert _biclusters(bs.bibit(bs.Dataset(sparse.csr_matrix(data)), cMnr=2, cMnc=2, mode=1)[0]) == _reference(data, 2, 2)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+import bioscience.dataMining.biclustering.Bitset as Bitset
+
+##############################################
+# Packed rows of BiBit against NumPy bit ops #
+##############################################
+def _binary(seed, rows, cols, density = 0.4):
+    rng = np.random.default_rng(seed)
+    return (rng.random((rows, cols)) < density).astype(np.uint64)
+
+@pytest.mark.parametrize("cols", [1, 63, 64, 65, 130])
+def test_pack_rows(cols):
+    data = _binary(1, 17, cols)
+    data[3] = 7 # Any non-zero value is a one
+    bData = (data != 0).astype(np.uint8)
+
+    # Big-endian bit string zero-filled on the left up to a multiple of 64 bits
+    words = Bitset.wordsPerRow(cols)
+    bits = np.zeros((data.shape[0], words * 64), dtype=np.uint8)
+    bits[:, words * 64 - cols:] = bData
+    expected = np.packbits(bits, axis=1).view(">u8").astype(np.uint64)
+
+    assert np.array_equal(Bitset.packRows(data), expected)
+    assert np.array_equal(Bitset.packRows(data, parallel=True), expected)
+    assert np.array_equal(Bitset.unpackRows(expected, cols), bData)
+
+def test_popcount():
+    data = _binary(2, 25, 150, 0.5)
+    packed = Bitset.packRows(data)
+    ones = np.count_nonzero(data, axis=1)
+    assert np.array_equal(Bitset.popcountRows(packed), ones)
+    assert Bitset.popcountRows(packed[4]) == ones[4]
+    for word in (0, 1, 0x8000000000000000, 0xFFFFFFFFFFFFFFFF, 0x0123456789ABCDEF):
+        assert Bitset.popcount64(np.uint64(word)) == bin(word).count("1")
+    for a in range(0, 25, 4):
+        for b in range(25):
+            assert Bitset.popcountAnd(packed[a], packed[b]) == np.count_nonzero(data[a] & data[b])
+
+def test_unique_rows():
+    # Many repeated patterns, added to the set in blocks
+    rng = np.random.default_rng(3)
+    packed = Bitset.packRows(_binary(3, 40, 70, 0.5))[rng.integers(0, 40, 500)]
+    _, first = np.unique(packed, axis=0, return_index=True)
+    assert np.array_equal(Bitset.uniqueRows(packed), np.sort(first))
+    index = np.arange(100, 400, dtype=np.int64)
+    assert np.array_equal(index[Bitset.uniqueRows(packed, index)], 100 + np.sort(np.unique(packed[100:400], axis=0, return_index=True)[1]))
+
+    oPatterns = Bitset.PatternSet(packed.shape[1])
+    lNew = [oPatterns.add(packed[start:start + 70]) for start in range(0, len(packed), 70)]
+    assert np.array_equal(oPatterns.patterns, packed[np.sort(first)])
+    assert np.array_equal(np.concatenate(lNew), oPatterns.patterns)
+    assert len(oPatterns.add(packed)) == 0 and len(oPatterns) == len(first)
+
+def test_vertical_index():
+    data = _binary(4, 90, 70, 0.6)
+    packed = Bitset.packRows(data)
+    assert np.array_equal(Bitset.unpackRows(Bitset.transposeRows(packed, 70), 90), (data != 0).T)
+
+    # Rows of every pattern, evaluated horizontally and with the vertical index
+    patterns = packed[:30] & packed[30:60]
+    index = np.arange(30, dtype=np.int64)
+    bPatterns = data[:30] & data[30:60]
+    expected = Bitset.packRows(np.array([((data & pattern) == pattern).all(axis=1) for pattern in bPatterns]))
+    oVertical = Bitset.VerticalIndex(packed, 70)
+    assert np.array_equal(Bitset.supportRows(packed, patterns, index), expected)
+    assert np.array_equal(Bitset.supportRows(packed, patterns, index, oVertical.matrix, np.ones(30, dtype=np.bool_)), expected)
+    assert np.array_equal(Bitset.supportRows(packed, patterns, index, oVertical.matrix, index % 2 == 0), expected)
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_patterns_to_cols(parallel):
+    data = _binary(5, 40, 150, 0.3)
+    data[7] = 0 # Empty pattern
+    indptr, indices = Bitset.patternsToCols(Bitset.packRows(data), 150, parallel=parallel)
+    assert np.array_equal(indptr, np.concatenate(([0], np.cumsum(np.count_nonzero(data, axis=1)))))
+    for r in range(40):
+        assert np.array_equal(indices[indptr[r]:indptr[r + 1]], np.flatnonzero(data[r]))
+        assert np.array_equal(Bitset.patternToCols(Bitset.packRows(data[r:r + 1])[0], 150), np.flatnonzero(data[r]))
@@ -0,0 +1,64 @@
+import numpy as np
+import bioscience as bs
+
+##################################
+# Results of the levels of a run #
+##################################
+def _levels(seed, rows, cols, soc = None):
+    # Levels of a continuous dataset (with soc, each level keeps its own rows)
+    rng = np.random.default_rng(seed)
+    data = rng.normal(size=(rows, cols))
+    geneNames = np.array([f"G{i}" for i in range(rows)])
+    return bs.binarizeLevels(bs.Dataset(data, geneNames=geneNames), cut=0.6, step=0.1, soc=soc)
+
+def _genes(path, iLevel):
+    with open(f"{path}genes{iLevel}.csv") as oFile:
+        return [line.strip().strip("\"") for line in oFile if line.strip()]
+
+def test_save_levels(tmp_path):
+    levels = _levels(1, 40, 12, soc=4)
+    listLevels = bs.sortLevels(levels)
+    assert len({oLevel.data.shape[0] for oLevel in listLevels}) > 1
+
+    listModels = bs.bibit(levels, cMnr=2, cMnc=3)
+    assert len(listModels) == len(listLevels)
+    path = str(tmp_path) + "/"
+    bs.saveResults(path, listModels, levels)
+    bs.saveGenes(path, listModels, levels)
+    bs.saveBinaryDatasets(path, levels)
+
+    # File i holds the results of the i-th level in level order
+    for iLevel, (oModel, oLevel) in enumerate(zip(listModels, listLevels), start=1):
+        assert _genes(path, iLevel) == [",".join(str(oLevel.geneNames[int(row)]) for row in oBicluster.rows) for oBicluster in oModel.results]
+        assert np.array_equal(np.loadtxt(f"{path}dataset{iLevel}.csv", delimiter=",", ndmin=2), oLevel.data)
+        with open(f"{path}results{iLevel}.csv") as oFile:
+            assert oFile.read().count("RESULT #") == len(oModel.results)
+
+def _biclusters(oModel):
+    return {(tuple(int(r) for r in oBicluster.rows), tuple(int(c) for c in oBicluster.cols)) for oBicluster in oModel.results}
+
+def test_level_processes():
+    # The levels run by a pool of processes come back in the same order as the serial run
+    levels = _levels(2, 40, 12, soc=3)
+    expected = [_biclusters(oModel) for oModel in bs.bibit(levels, cMnr=2, cMnc=3)]
+    assert [_biclusters(oModel) for oModel in bs.bibit(levels, cMnr=2, cMnc=3, levelProcesses=2)] == expected
+    assert len(set(map(frozenset, expected))) == len(expected)
+
+    levels = _levels(3, 20, 10)
+    expected = [_biclusters(oModel) for oModel in bs.bcca(levels, correlationThreshold=0.8, minCols=3)]
+    assert [_biclusters(oModel) for oModel in bs.bcca(levels, correlationThreshold=0.8, minCols=3, levelProcesses=2)] == expected
+
+def test_multi_level():
+    # The levels mined together give the same biclusters as each level on its own, in the same order
+    for soc in (None, 3):
+        levels = _levels(4, 40, 12, soc=soc)
+        expected = [_biclusters(oModel) for oModel in bs.bibit(levels, cMnr=2, cMnc=3, mode=2)]
+        assert sum(map(len, expected)) > 0
+        assert [_biclusters(oModel) for oModel in bs.bibit(levels, cMnr=2, cMnc=3, multiLevel=True)] == expected
+
+def test_stats_levels():
+    # The statistics of the levels come back in level order
+    levels = _levels(5, 40, 12, soc=3)
+    listStats = bs.bibitStats(levels, cMnr=2, cMnc=3)
+    assert [oStats.totalBiclusters for oStats in listStats] == [len(oModel.results) for oModel in bs.bibit(levels, cMnr=2, cMnc=3)]
+    assert [oStats.totalBiclusters for oStats in listStats] == [bs.bibitStats(oLevel, cMnr=2, cMnc=3)[0].totalBiclusters for oLevel in bs.sortLevels(levels)]
@@ -0,0 +1,32 @@
+import numpy as np
+import bioscience as bs
+
+####################################
+# Pair index of the upper triangle #
+####################################
+def test_pair_index():
+    for rows in (2, 3, 7, 64, 301):
+        aPairs = [(r1, r2) for r1 in range(rows) for r2 in range(r1 + 1, rows)]
+        assert bs.pairCount(rows) == len(aPairs)
+        for pattern, (r1, r2) in enumerate(aPairs):
+            assert bs.rowsToPair(r1, r2, rows) == pattern
+            assert bs.pairToRows(pattern, rows) == (r1, r2)
+        for r1 in range(rows - 1):
+            assert bs.rowPairRange(r1, rows) == (bs.rowsToPair(r1, r1 + 1, rows), bs.rowsToPair(r1, rows - 1, rows) + 1)
+
+        # Blocks that start in the middle of a row
+        aR1, aR2 = (np.array(r) for r in zip(*aPairs))
+        for pairStart, pairEnd in ((0, len(aPairs)), (len(aPairs) // 3, len(aPairs) // 2 + 1), (len(aPairs) - 1, len(aPairs)), (5, 5)):
+            aBlockR1, aBlockR2 = bs.pairsToRows(pairStart, pairEnd, rows)
+            assert np.array_equal(aBlockR1, aR1[pairStart:pairEnd]) and np.array_equal(aBlockR2, aR2[pairStart:pairEnd])
+            index = np.zeros((max(0, pairEnd - pairStart), 2))
+            bs.pairsToRowsIndex(pairStart, rows, index)
+            assert np.array_equal(index, np.column_stack((aR1[pairStart:pairEnd], aR2[pairStart:pairEnd])))
+
+def test_pair_index_large():
+    # Closed form near the end of the triangle of many rows (floating point rounding)
+    rows = 100000
+    for pattern in (0, 1, rows - 2, rows - 1, bs.pairCount(rows) // 2, bs.pairCount(rows) - 2, bs.pairCount(rows) - 1):
+        r1, r2 = bs.pairToRows(pattern, rows)
+        assert 0 <= r1 < r2 < rows
+        assert bs.rowsToPair(r1, r2, rows) == pattern
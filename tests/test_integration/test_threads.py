@@ -0,0 +1,42 @@
+import numpy as np
+import bioscience as bs
+from concurrent.futures import ThreadPoolExecutor
+
+###################################################
+# Concurrent BiBit runs in threads of one process #
+###################################################
+def _dataset(seed, rows, cols, density):
+    rng = np.random.default_rng(seed)
+    return bs.Dataset((rng.random((rows, cols)) < density).astype(np.uint64))
+
+def _biclusters(oModel):
+    return {(tuple(int(r) for r in oBicluster.rows), tuple(int(c) for c in oBicluster.cols)) for oBicluster in oModel.results}
+
+def _run(job):
+    dataset, cMnr, cMnc, mode, memoryLimit, collapse = job
+    listModels = bs.bibit(dataset, cMnr=cMnr, cMnc=cMnc, mode=mode, memoryLimit=memoryLimit, collapse=collapse)
+    return _biclusters(next(iter(listModels)))
+
+def test_bibit_threads():
+    # Datasets of different shapes (and the same dataset shared by several jobs)
+    datasets = [_dataset(1, 60, 40, 0.5), _dataset(2, 90, 130, 0.3), _dataset(3, 45, 70, 0.6)]
+    original = [np.copy(oDataset.data) for oDataset in datasets]
+    jobs = [
+        (datasets[0], 2, 8, 1, None, False),
+        (datasets[0], 3, 6, 2, None, False),
+        (datasets[1], 2, 10, 2, None, True),
+        (datasets[1], 2, 10, 1, 1 << 16, False),
+        (datasets[2], 2, 18, 2, 1 << 16, False),
+        (datasets[2], 2, 20, 1, None, True),
+    ]
+
+    expected = [_run(job) for job in jobs]
+    for _ in range(3):
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            assert list(executor.map(_run, jobs)) == expected
+
+    assert all(len(results) > 0 for results in expected)
+
+    # The datasets of the caller are not modified
+    for oDataset, data in zip(datasets, original):
+        assert np.array_equal(oDataset.data, data)